@@ -0,0 +1,62 @@
+"""
+벤치마크 결과 비교 스크립트
+
+사용법:
+    python bench/compare.py bench/results/<이전>.json bench/results/<이후>.json
+
+두 결과에 모두 있는 시나리오의 p50/p95/p99 지연 시간, 처리량, 요청당 DB 호출 수, RSS 증가량과 변화율을 출력합니다.
+설정(동시성, 요청 수, 가상 지연 등)이 다르면 경고를 먼저 출력합니다.
+"""
+import argparse
+import json
+
+def change(before, after) -> str:
+    if before in (None, 0) or after is None:
+        return ''
+    return f"{(after - before) / before * 100:+.1f}%"
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument('before')
+    parser.add_argument('after')
+    args = parser.parse_args()
+
+    with open(args.before, 'r', encoding='utf-8') as f:
+        before = json.load(f)
+    with open(args.after, 'r', encoding='utf-8') as f:
+        after = json.load(f)
+
+    for result in (before, after):
+        git = result.get('git') or {}
+        print(f"{(git.get('commit') or 'nogit')[:8]}{' (dirty)' if git.get('dirty') else ''} "
+              f"{result.get('label') or ''} - {git.get('subject') or ''}")
+
+    # 서버 환경 변수 외의 설정이 다르면 비교 결과를 신뢰할 수 없음
+    before_config = {key: value for key, value in before['config'].items() if key != 'server_env'}
+    after_config = {key: value for key, value in after['config'].items() if key != 'server_env'}
+    if before_config != after_config:
+        print(f"\n⚠ 벤치마크 설정이 다릅니다:\n  이전: {before_config}\n  이후: {after_config}")
+
+    print(f"\n{'시나리오':<18}{'지표':<14}{'이전':>10}{'이후':>10}{'변화':>10}")
+    for name in before['scenarios']:
+        if name not in after['scenarios']:
+            continue
+        old, new = before['scenarios'][name], after['scenarios'][name]
+        rows = [
+            ('p50 ms', old['latency_ms']['p50'], new['latency_ms']['p50']),
+            ('p95 ms', old['latency_ms']['p95'], new['latency_ms']['p95']),
+            ('p99 ms', old['latency_ms']['p99'], new['latency_ms']['p99']),
+            ('req/s', old['throughput_rps'], new['throughput_rps']),
+            ('DB/req', old['db_calls_per_request'], new['db_calls_per_request']),
+            ('RSS +MB', old['rss_mb']['growth'], new['rss_mb']['growth']),
+            ('errors', old['errors'], new['errors'])
+        ]
+        for i, (metric, old_value, new_value) in enumerate(rows):
+            print(f"{name if i == 0 else '':<20}{metric:<14}{old_value!s:>10}{new_value!s:>10}{change(old_value, new_value):>10}")
+
+    print(f"\n서버 RSS 종료 시점: {before['rss_mb'].get('end')}MB → {after['rss_mb'].get('end')}MB")
+    if 'pss_mb' in before or 'pss_mb' in after:
+        print(f"서버 PSS 종료 시점: {before.get('pss_mb', {}).get('end')}MB → {after.get('pss_mb', {}).get('end')}MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+벤치마크용 Supabase(PostgREST) 대체 서버
+
+server.py가 사용하는 RPC/테이블 엔드포인트를 같은 경로(/rest/v1/...)와 응답 형식으로 흉내 냅니다.
+- get_region_boundary_wgs84: 지역마다 고정된 MultiPolygon (시도 수백 KB, 시군구 수십~백 KB, 읍면동 수 KB)
+- search_hospitals_spatial / hospital_*: 주요 도시 주변에 분포한 가상 병원 (기본 20,000개)
+- census_region: static/korea_admin_codes.json의 모든 지역 (연령별 인구/가구)
+- analyze_hospital_service_area: 도형 면적에 비례한 가상 인구
+
+모든 호출은 FAKE_LATENCY_MS(± FAKE_JITTER_MS)만큼 지연하며, 공간 RPC는 FAKE_SPATIAL_LATENCY_MS를 추가로 지연합니다.
+FAKE_MAX_ROWS를 주면 PostgREST db-max-rows처럼 응답 행 수를 제한합니다.
+데이터는 FAKE_SEED로 고정되어 같은 설정이면 실행마다 같은 응답을 반환합니다.
+
+실행 (보통은 bench/run_bench.py가 직접 실행):
+    FAKE_LATENCY_MS=20 python -m uvicorn fake_supabase:app --app-dir bench --port 54321
+"""
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+from functools import lru_cache
+
+import numpy as np
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+FAKE_LATENCY_MS = float(os.getenv("FAKE_LATENCY_MS", "20"))  # 모든 호출의 기본 지연 (DB 왕복)
+FAKE_JITTER_MS = float(os.getenv("FAKE_JITTER_MS", "5"))  # 지연 편차 (균등 분포)
+FAKE_SPATIAL_LATENCY_MS = float(os.getenv("FAKE_SPATIAL_LATENCY_MS", "60"))  # 경계/분석/공간 검색 RPC 추가 지연 (PostGIS 계산)
+FAKE_HOSPITAL_COUNT = int(os.getenv("FAKE_HOSPITAL_COUNT", "20000"))
+FAKE_SEED = int(os.getenv("FAKE_SEED", "42"))
+FAKE_MAX_ROWS = int(os.getenv("FAKE_MAX_ROWS", "0"))  # PostgREST db-max-rows (응답 최대 행 수, 0이면 제한 없음)
+FAKE_CODES_PATH = os.getenv(
+    "FAKE_CODES_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "korea_admin_codes.json")
+)
+
+AGE_GROUPS = ['10세 미만', '10대', '20대', '30대', '40대', '50대', '60대', '70대', '80대', '90대', '100세 이상']
+DEPARTMENTS = ['내과', '외과', '소아청소년과', '정형외과', '산부인과', '안과', '이비인후과', '피부과', '치과', '한방내과',
+               '가정의학과', '신경과', '정신건강의학과', '비뇨의학과', '재활의학과', '영상의학과']
+HOSPITAL_TYPES = ['의원', '의원', '의원', '치과의원', '한의원', '병원', '종합병원', '요양병원']
+EQUIPMENT = ['CT', 'MRI', '초음파 영상진단기', '골밀도검사기', '유방촬영장치', '혈액투석을위한인공신장기']
+
+# 병원 분포 중심 (경도, 위도, 표준편차(도), 비중)
+CITY_CENTERS = [
+    (126.98, 37.55, 0.12, 0.45),  # 서울
+    (127.05, 37.35, 0.15, 0.20),  # 경기 남부
+    (129.07, 35.17, 0.08, 0.12),  # 부산
+    (128.60, 35.87, 0.07, 0.08),  # 대구
+    (127.38, 36.35, 0.06, 0.07),  # 대전
+    (126.85, 35.16, 0.06, 0.08)   # 광주
+]
+
+# 행정구역 단계별 경계 크기 (꼭짓점 수, 반지름(도), 폴리곤 수)
+BOUNDARY_SHAPES = {
+    'sido': (12000, 0.35, 4),
+    'sigungu': (4000, 0.08, 2),
+    'dong': (300, 0.012, 1)
+}
+
+app = FastAPI(title="Fake Supabase")
+call_counts = {}
+
+def build_hospitals(count: int, seed: int):
+    """가상 병원 목록과 검색용 배열 (좌표, 진료과목별/전문의 여부 마스크)"""
+    rnd = random.Random(seed)
+    weights = [center[3] for center in CITY_CENTERS]
+    hospitals = []
+    for i in range(count):
+        lng0, lat0, spread, _ = rnd.choices(CITY_CENTERS, weights)[0]
+        departments = rnd.sample(DEPARTMENTS, rnd.randint(1, 4))
+        hospitals.append({
+            'ykiho': f"H{i:07d}",
+            'yadmnm': f"벤치마크{rnd.choice(['연세', '서울', '365', '바른', '튼튼', '우리'])}{rnd.choice(HOSPITAL_TYPES)} {i}",
+            'clcdnm': rnd.choice(HOSPITAL_TYPES),
+            'addr': f"가상시 가상구 벤치로 {rnd.randint(1, 999)}",
+            'telno': f"02-{rnd.randint(100, 9999)}-{rnd.randint(1000, 9999)}",
+            'hospurl': '',
+            'estbdd': f"{rnd.randint(1980, 2024)}0101",
+            'xpos': round(rnd.gauss(lng0, spread), 7),
+            'ypos': round(rnd.gauss(lat0, spread), 7),
+            'departments': [(name, rnd.randint(0, 3)) for name in departments]
+        })
+
+    lng = np.array([h['xpos'] for h in hospitals])
+    lat = np.array([h['ypos'] for h in hospitals])
+    has_specialist = np.array([any(count > 0 for _, count in h['departments']) for h in hospitals])
+    department_masks = {
+        name: np.array([any(d == name for d, _ in h['departments']) for h in hospitals])
+        for name in DEPARTMENTS
+    }
+    return hospitals, lng, lat, has_specialist, department_masks
+
+def build_census(codes_path: str):
+    """korea_admin_codes.json의 모든 지역에 대한 census_region 행"""
+    with open(codes_path, 'r', encoding='utf-8') as f:
+        codes = json.load(f)
+
+    rows = []
+    for level in ('sido', 'sigungu', 'dong'):
+        for item in codes.get(level, []):
+            rnd = random.Random(f"census:{item['cd']}")
+            scale = {'sido': 200, 'sigungu': 20, 'dong': 1}[level]
+            row = {'region_cd': item['cd'], 'region_nm': item['name']}
+            for age_group in AGE_GROUPS:
+                row[age_group] = rnd.randint(50, 3000) * scale
+            row['pop'] = sum(row[age_group] for age_group in AGE_GROUPS)
+            row['households'] = row['pop'] * 10 // 23
+            rows.append(row)
+    return rows
+
+HOSPITALS, HOSPITAL_LNG, HOSPITAL_LAT, HOSPITAL_HAS_SPECIALIST, DEPARTMENT_MASKS = build_hospitals(FAKE_HOSPITAL_COUNT, FAKE_SEED)
+HOSPITAL_INDEX = {h['ykiho']: i for i, h in enumerate(HOSPITALS)}
+CENSUS_ROWS = build_census(FAKE_CODES_PATH)
+
+@lru_cache(maxsize=None)
+def boundary_json(region_code: str, level: str) -> bytes:
+    """지역 코드로 고정된 MultiPolygon 경계 (WGS84, 중심점 포함) JSON 바이트"""
+    digest = int(hashlib.md5(f"{level}:{region_code}".encode('utf-8')).hexdigest()[:12], 16)
+    vertex_count, radius, polygon_count = BOUNDARY_SHAPES.get(level, BOUNDARY_SHAPES['dong'])
+    center_lng = 126.3 + (digest % 10000) / 10000 * 3.0
+    center_lat = 34.6 + (digest // 10000 % 10000) / 10000 * 3.2
+
+    polygons = []
+    for p in range(polygon_count):
+        # 첫 폴리곤이 본토, 나머지는 작은 섬
+        scale = 1.0 if p == 0 else 0.15
+        count = vertex_count if p == 0 else max(vertex_count // 10, 16)
+        offset_lng = 0 if p == 0 else radius * 1.3 * math.cos(p)
+        offset_lat = 0 if p == 0 else radius * 1.3 * math.sin(p)
+        ring = []
+        for k in range(count):
+            angle = 2 * math.pi * k / count
+            wobble = 1 + 0.08 * math.sin(angle * 7 + digest % 13) + 0.03 * math.sin(angle * 31)
+            ring.append([
+                round(center_lng + offset_lng + radius * scale * wobble * math.cos(angle), 7),
+                round(center_lat + offset_lat + radius * scale * wobble * math.sin(angle), 7)
+            ])
+        ring.append(ring[0])
+        polygons.append([ring])
+
+    return json.dumps({
+        'type': 'MultiPolygon',
+        'coordinates': polygons,
+        'centroid': {'lng': center_lng, 'lat': center_lat}
+    }, separators=(',', ':')).encode('utf-8')
+
+async def simulate_latency(extra_ms: float = 0):
+    jitter = random.uniform(-FAKE_JITTER_MS, FAKE_JITTER_MS)
+    await asyncio.sleep(max(0.0, FAKE_LATENCY_MS + jitter + extra_ms) / 1000)
+
+def apply_range(request: Request, rows: list) -> list:
+    """PostgREST offset/limit 파라미터 적용 (FAKE_MAX_ROWS가 있으면 그 이상은 잘라서 반환)"""
+    offset = int(request.query_params.get('offset', 0))
+    limit = request.query_params.get('limit')
+    rows = rows[offset:offset + int(limit)] if limit is not None else rows[offset:]
+    return rows[:FAKE_MAX_ROWS] if FAKE_MAX_ROWS else rows
+
+def apply_filters(request: Request, rows: list) -> list:
+    """eq. / in.() 필터 적용"""
+    for column, condition in request.query_params.multi_items():
+        if column in ('select', 'offset', 'limit', 'order'):
+            continue
+        if condition.startswith('eq.'):
+            value = condition[3:]
+            rows = [row for row in rows if str(row.get(column)) == value]
+        elif condition.startswith('in.('):
+            values = {value.strip('"') for value in condition[4:-1].split(',')}
+            rows = [row for row in rows if str(row.get(column)) in values]
+    return rows
+
+def apply_order_and_select(request: Request, rows: list) -> list:
+    order = request.query_params.get('order')
+    if order:
+        # 여러 열 정렬 (order=ykiho.asc,dgsbjtcdnm.asc)
+        columns = [item.split('.')[0] for item in order.split(',')]
+        rows = sorted(rows, key=lambda row: tuple(row[column] for column in columns))
+
+    select = request.query_params.get('select', '*')
+    if select != '*':
+        columns = [column.strip() for column in select.split(',')]
+        rows = [{column: row.get(column) for column in columns} for row in rows]
+    return rows
+
+def json_response(content) -> Response:
+    return Response(content=json.dumps(content, ensure_ascii=False), media_type='application/json')
+
+def search_hospitals(params: dict) -> list:
+    mask = (
+        (HOSPITAL_LNG >= params['p_sw_lng']) & (HOSPITAL_LNG <= params['p_ne_lng']) &
+        (HOSPITAL_LAT >= params['p_sw_lat']) & (HOSPITAL_LAT <= params['p_ne_lat'])
+    )
+    if params.get('p_department'):
+        mask &= DEPARTMENT_MASKS.get(params['p_department'], np.zeros_like(mask))
+    if params.get('p_has_specialist'):
+        mask &= HOSPITAL_HAS_SPECIALIST
+
+    return [
+        {
+            'ykiho': HOSPITALS[i]['ykiho'],
+            'yadmnm': HOSPITALS[i]['yadmnm'],
+            'clcdnm': HOSPITALS[i]['clcdnm'],
+            'addr': HOSPITALS[i]['addr'],
+            'telno': HOSPITALS[i]['telno'],
+            'xpos': HOSPITALS[i]['xpos'],
+            'ypos': HOSPITALS[i]['ypos'],
+            'has_specialist': bool(HOSPITAL_HAS_SPECIALIST[i])
+        }
+        for i in np.flatnonzero(mask)
+    ]
+
+def analyze_shape(params: dict) -> dict:
+    """도형 면적에 비례한 가상 인구 분석 결과"""
+    shape_data = params['shape_data']
+    if params['shape_type'] == 'circle':
+        area = math.pi * shape_data['radius'] ** 2
+        seed = f"{shape_data['center_lng']:.5f},{shape_data['center_lat']:.5f}"
+    else:
+        coordinates = shape_data['coordinates']
+        lat0 = math.radians(coordinates[0][1])
+        points = [(lng * 111320 * math.cos(lat0), lat * 110540) for lng, lat in coordinates]
+        area = abs(sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]))) / 2
+        seed = json.dumps(coordinates[:3])
+
+    rnd = random.Random(seed)
+    density = rnd.uniform(0.002, 0.02)  # 명/㎡
+    weights = [rnd.random() for _ in AGE_GROUPS]
+    total = int(area * density)
+    distribution = {age_group: int(total * w / sum(weights)) for age_group, w in zip(AGE_GROUPS, weights)}
+    return {
+        'total_population': sum(distribution.values()),
+        'total_households': total * 10 // 23,
+        'age_distribution': distribution,
+        'analysis_area_sqm': area,
+        'shape_type': params['shape_type']
+    }
+
+@app.post("/rest/v1/rpc/{function_name}")
+async def rpc(function_name: str, request: Request):
+    call_counts[function_name] = call_counts.get(function_name, 0) + 1
+    params = await request.json()
+
+    if function_name == 'test_coordinate_conversion':
+        await simulate_latency()
+        return {'x': 953899.0, 'y': 1952034.0}
+
+    await simulate_latency(FAKE_SPATIAL_LATENCY_MS)
+
+    if function_name == 'get_region_boundary_wgs84':
+        return Response(content=boundary_json(params['p_region_code'], params['p_level']), media_type='application/json')
+    if function_name == 'analyze_hospital_service_area':
+        return analyze_shape(params)
+    if function_name == 'search_hospitals_spatial':
+        rows = search_hospitals(params)
+        if request.query_params.get('order'):
+            rows.sort(key=lambda row: row['ykiho'])
+        return json_response(apply_range(request, rows))
+
+    return Response(status_code=404)
+
+def table_rows(table_name: str, request: Request) -> list:
+    """테이블 전체 행 (ykiho 조건이 있으면 해당 병원만 생성)"""
+    if table_name == 'census_region':
+        return CENSUS_ROWS
+
+    # 병원 테이블은 ykiho 조건으로만 조회하거나 전체를 페이지 단위로 조회
+    ykiho_filter = request.query_params.get('ykiho')
+    if ykiho_filter and ykiho_filter.startswith('eq.'):
+        indexes = [HOSPITAL_INDEX[ykiho_filter[3:]]] if ykiho_filter[3:] in HOSPITAL_INDEX else []
+    elif ykiho_filter and ykiho_filter.startswith('in.('):
+        indexes = [HOSPITAL_INDEX[y.strip('"')] for y in ykiho_filter[4:-1].split(',') if y.strip('"') in HOSPITAL_INDEX]
+    else:
+        indexes = range(len(HOSPITALS))
+
+    rows = []
+    for i in indexes:
+        hospital = HOSPITALS[i]
+        if table_name == 'hospital_basic':
+            rows.append({key: value for key, value in hospital.items() if key != 'departments'})
+        elif table_name == 'hospital_departments':
+            rows.extend({'ykiho': hospital['ykiho'], 'dgsbjtcdnm': name, 'dgsbjtprsdrcnt': count}
+                        for name, count in hospital['departments'])
+        elif table_name == 'hospital_medical_equipment':
+            rnd = random.Random(hospital['ykiho'])
+            rows.extend({'ykiho': hospital['ykiho'], 'oftcdnm': name, 'oftcnt': rnd.randint(1, 3)}
+                        for name in rnd.sample(EQUIPMENT, rnd.randint(0, 3)))
+        elif table_name == 'hospital_detail':
+            rows.append({
+                'ykiho': hospital['ykiho'],
+                **{f"trmt{day}start": '0900' for day in ('mon', 'tue', 'wed', 'thu', 'fri', 'sat')},
+                **{f"trmt{day}end": '1800' for day in ('mon', 'tue', 'wed', 'thu', 'fri')},
+                'trmtsatend': '1300',
+                'lunchweek': '12:30~13:30',
+                'parkxpnsyn': 'N',
+                'parkqty': '5'
+            })
+        else:
+            return None
+    return rows
+
+@app.get("/rest/v1/{table_name}")
+async def table(table_name: str, request: Request):
+    call_counts[table_name] = call_counts.get(table_name, 0) + 1
+    await simulate_latency()
+
+    rows = table_rows(table_name, request)
+    if rows is None:
+        return Response(status_code=404)
+
+    rows = apply_order_and_select(request, apply_filters(request, rows))
+    return json_response(apply_range(request, rows))
+
+@app.get("/calls")
+async def calls():
+    """엔드포인트별 호출 수 (벤치마크 중 DB 호출 수 확인용)"""
+    return call_counts
@@ -0,0 +1,441 @@
+"""
+벤치마크 실행 스크립트
+
+bench/fake_supabase.py(지연 시간을 설정할 수 있는 Supabase 대체 서버)와 server.py를 각각 별도 프로세스로 띄운 뒤,
+시나리오별 요청을 지정한 동시성으로 보내 지연 시간(p50/p95/p99), 처리량, 서버 RSS 증가량, DB 호출 수를 측정합니다.
+결과는 커밋 간 비교할 수 있도록 JSON으로 저장합니다.
+
+사용법:
+    python bench/run_bench.py                                   # 전체 시나리오
+    python bench/run_bench.py --scenarios region,analyze --concurrency 32 --requests 1000
+    python bench/run_bench.py --server-env BOUNDARY_PRECOMPRESS=true --label precompress
+    python bench/compare.py bench/results/<이전>.json bench/results/<이후>.json
+
+같은 --seed면 요청 순서와 가상 데이터가 같으므로 커밋/설정만 바꿔 가며 비교할 수 있습니다.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+# 요청 좌표를 뽑는 도시 중심 (fake_supabase.CITY_CENTERS와 같은 지역)
+CITY_CENTERS = [(126.98, 37.55), (127.05, 37.35), (129.07, 35.17), (128.60, 35.87), (127.38, 36.35), (126.85, 35.16)]
+
+# ---------------------------------------------------------------------------
+# 시나리오: rnd → (method, path, JSON 본문)
+# ---------------------------------------------------------------------------
+
+def load_region_pool():
+    """korea_admin_codes.json으로 /getRegionPop 요청 본문 목록 생성 (시도/시군구/읍면동)"""
+    with open(os.path.join(REPO_DIR, 'static', 'korea_admin_codes.json'), 'r', encoding='utf-8') as f:
+        codes = json.load(f)
+
+    sido_by_cd = {item['cd']: item for item in codes['sido']}
+    sigungu_by_cd = {item['cd']: item for item in codes['sigungu']}
+
+    pool = {'sido': [], 'sigungu': [], 'dong': []}
+    for item in codes['sido']:
+        pool['sido'].append({'sido': item['name'], 'level': 'sido'})
+    for item in codes['sigungu']:
+        sido = sido_by_cd.get(item['parent_cd'])
+        if sido:
+            pool['sigungu'].append({'sido': sido['name'], 'sigungu': item['name'], 'level': 'sigungu'})
+    for item in codes['dong']:
+        sigungu = sigungu_by_cd.get(item['parent_cd'])
+        sido = sido_by_cd.get(sigungu['parent_cd']) if sigungu else None
+        if sido:
+            pool['dong'].append({'sido': sido['name'], 'sigungu': sigungu['name'], 'dong': item['name'], 'level': 'dong'})
+    return pool
+
+def make_scenarios(args):
+    """시나리오 이름 → 요청 생성 함수"""
+    region_pool = load_region_pool()
+
+    # 같은 도형/지역이 반복되어야 캐시 효과가 보이므로 각 시나리오는 고정된 후보 집합에서 뽑음
+    shape_rnd = random.Random(args.seed)
+    shapes = []
+    for i in range(args.pool_size):
+        lng, lat = shape_rnd.choice(CITY_CENTERS)
+        lng += shape_rnd.uniform(-0.15, 0.15)
+        lat += shape_rnd.uniform(-0.15, 0.15)
+        if i % 5 == 4:
+            # 다각형 (오각형 ~ 12각형)
+            sides = shape_rnd.randint(5, 12)
+            radius = shape_rnd.uniform(0.005, 0.03)
+            coordinates = [
+                [lng + radius * math.cos(2 * math.pi * k / sides), lat + radius * math.sin(2 * math.pi * k / sides)]
+                for k in range(sides)
+            ]
+            shapes.append({'type': 'polygon', 'data': {'coordinates': coordinates}})
+        else:
+            shapes.append({'type': 'circle', 'data': {
+                'center_lng': lng, 'center_lat': lat, 'radius': shape_rnd.choice([500, 1000, 2000, 3000, 5000])
+            }})
+
+    region_rnd = random.Random(args.seed + 1)
+    regions = (
+        region_rnd.sample(region_pool['sido'], min(5, len(region_pool['sido']))) +
+        region_rnd.sample(region_pool['sigungu'], min(args.pool_size * 35 // 100, len(region_pool['sigungu']))) +
+        region_rnd.sample(region_pool['dong'], min(args.pool_size * 60 // 100, len(region_pool['dong'])))
+    )
+
+    def analyze(rnd):
+        return 'POST', '/analyze', rnd.choice(shapes)
+
+    def region(rnd):
+        body = dict(rnd.choice(regions))
+        zoom = rnd.choice([None, 7, 9, 11, 13])
+        if zoom is not None:
+            body['zoom'] = zoom
+        return 'POST', '/getRegionPop', body
+
+    def viewport(rnd, span_min, span_max):
+        lng, lat = rnd.choice(CITY_CENTERS)
+        lng += rnd.uniform(-0.1, 0.1)
+        lat += rnd.uniform(-0.1, 0.1)
+        span = rnd.uniform(span_min, span_max)
+        return {'sw_lat': lat - span / 2, 'sw_lng': lng - span * 0.6, 'ne_lat': lat + span / 2, 'ne_lng': lng + span * 0.6}
+
+    def hospitals(rnd):
+        # 지도 레벨 3~5 수준 화면 (개별 병원 표시)
+        body = viewport(rnd, 0.01, 0.05)
+        body['department'] = rnd.choice(['', '', '', '내과', '소아청소년과', '치과'])
+        body['zoom'] = rnd.choice([14, 15, 16])
+        return 'POST', '/getHospitals', body
+
+    def hospital_clusters(rnd):
+        # 축소된 화면 (서버 클러스터링)
+        body = viewport(rnd, 0.2, 0.8)
+        body['zoom'] = rnd.choice([9, 10, 11])
+        return 'POST', '/getHospitals', body
+
+    def hospital_detail(rnd):
+        # 인기 병원에 요청이 몰리도록 앞쪽 ID에 가중치
+        index = min(int(rnd.paretovariate(1.2)) - 1, args.fake_hospitals - 1)
+        index = index if rnd.random() < 0.7 else rnd.randrange(args.fake_hospitals)
+        return 'GET', f"/getHospitalDetail/H{index:07d}", None
+
+    return {
+        'analyze': analyze,
+        'region': region,
+        'hospitals': hospitals,
+        'hospital_clusters': hospital_clusters,
+        'hospital_detail': hospital_detail
+    }
+
+# ---------------------------------------------------------------------------
+# 프로세스 관리 / 측정
+# ---------------------------------------------------------------------------
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def process_tree_memory_mb(pid: int, kind: str = 'rss'):
+    """
+    프로세스와 모든 하위 프로세스(워커)의 메모리 합계 (MB, /proc이 없으면 None)
+
+    rss는 워커들이 공유하는 페이지를 워커마다 중복으로 더하고,
+    pss는 공유 페이지를 공유하는 프로세스 수로 나누어 더하므로 fork 전 공유 효과를 확인할 때 사용합니다.
+    """
+    if not os.path.isdir('/proc'):
+        return None
+    filename, prefix = ('status', 'VmRSS:') if kind == 'rss' else ('smaps_rollup', 'Pss:')
+
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    total_kb = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            with open(f'/proc/{current}/{filename}', 'r') as f:
+                for line in f:
+                    if line.startswith(prefix):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return round(total_kb / 1024, 1)
+
+def wait_until_ready(url: str, process: subprocess.Popen, log_path: str, timeout: float = 120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"프로세스가 종료되었습니다 (로그: {log_path})")
+        try:
+            if httpx.get(url, timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.3)
+    raise RuntimeError(f"{url} 응답 대기 시간 초과 (로그: {log_path})")
+
+def start_process(command, env, log_path: str) -> subprocess.Popen:
+    log_file = open(log_path, 'w')
+    return subprocess.Popen(command, cwd=REPO_DIR, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+
+def stop_process(process: subprocess.Popen):
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def percentile(sorted_values, p: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def git_info():
+    def run(*command):
+        try:
+            return subprocess.run(command, cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        'commit': run('git', 'rev-parse', 'HEAD'),
+        'subject': run('git', 'log', '-1', '--format=%s'),
+        'dirty': bool(run('git', 'status', '--porcelain', '--untracked-files=no'))
+    }
+
+async def send_requests(client: httpx.AsyncClient, requests, concurrency: int):
+    """요청 목록을 동시성 concurrency로 전송 (요청별 지연 시간/상태/응답 크기)"""
+    results = []
+    iterator = iter(requests)
+
+    async def worker():
+        for method, path, body in iterator:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                status, size = response.status_code, len(response.content)
+            except httpx.HTTPError as e:
+                status, size = type(e).__name__, 0
+            results.append((time.perf_counter() - started, status, size))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
+
+async def run_scenario(name, make_request, args, server_url, fake_url, server_pid):
+    rnd = random.Random(f"{args.seed}:{name}")
+    warmup = [make_request(rnd) for _ in range(args.warmup)]
+    measured = [make_request(rnd) for _ in range(args.requests)]
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=server_url, timeout=args.timeout, limits=limits) as client:
+        if warmup:
+            await send_requests(client, warmup, args.concurrency)
+
+        calls_before = httpx.get(f"{fake_url}/calls").json()
+        rss_before = process_tree_memory_mb(server_pid)
+        started = time.perf_counter()
+        results = await send_requests(client, measured, args.concurrency)
+        elapsed = time.perf_counter() - started
+        rss_after = process_tree_memory_mb(server_pid)
+        calls_after = httpx.get(f"{fake_url}/calls").json()
+
+    latencies = sorted(latency * 1000 for latency, _, _ in results)
+    statuses = Counter(str(status) for _, status, _ in results)
+    db_calls = {key: calls_after[key] - calls_before.get(key, 0)
+                for key in calls_after if calls_after[key] != calls_before.get(key, 0)}
+
+    return {
+        'requests': len(results),
+        'errors': sum(count for status, count in statuses.items() if status != '200'),
+        'statuses': dict(statuses),
+        'elapsed_seconds': round(elapsed, 3),
+        'throughput_rps': round(len(results) / elapsed, 1) if elapsed > 0 else None,
+        'latency_ms': {
+            'min': round(latencies[0], 2),
+            'p50': round(percentile(latencies, 50), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'max': round(latencies[-1], 2),
+            'mean': round(sum(latencies) / len(latencies), 2)
+        },
+        'response_kb_mean': round(sum(size for _, _, size in results) / len(results) / 1024, 1),
+        'db_calls': db_calls,
+        'db_calls_per_request': round(sum(db_calls.values()) / len(results), 3),
+        'rss_mb': {
+            'before': rss_before,
+            'after': rss_after,
+            'growth': round(rss_after - rss_before, 1) if rss_before is not None else None
+        }
+    }
+
+def print_summary(result):
+    print(f"\n{'시나리오':<18}{'요청':>7}{'오류':>6}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'DB/req':>8}{'RSS+MB':>8}")
+    for name, scenario in result['scenarios'].items():
+        latency = scenario['latency_ms']
+        print(f"{name:<20}{scenario['requests']:>7}{scenario['errors']:>6}{scenario['throughput_rps']:>9}"
+              f"{latency['p50']:>9}{latency['p95']:>9}{latency['p99']:>9}"
+              f"{scenario['db_calls_per_request']:>8}{scenario['rss_mb']['growth']:>8}")
+    print(f"\n서버 RSS: 시작 {result['rss_mb']['start']}MB → 종료 {result['rss_mb']['end']}MB "
+          f"(PSS: 시작 {result['pss_mb']['start']}MB → 종료 {result['pss_mb']['end']}MB)")
+
+def parse_env_pairs(pairs):
+    env = {}
+    for pair in pairs:
+        key, sep, value = pair.partition('=')
+        if not sep:
+            raise SystemExit(f"KEY=VALUE 형식이 아닙니다: {pair}")
+        env[key] = value
+    return env
+
+def main():
+    parser = argparse.ArgumentParser(description="server.py 벤치마크 (Supabase 대체 서버 사용)")
+    parser.add_argument('--scenarios', default='analyze,region,hospitals,hospital_clusters,hospital_detail',
+                        help='실행할 시나리오 (쉼표 구분)')
+    parser.add_argument('--requests', type=int, default=500, help='시나리오별 측정 요청 수')
+    parser.add_argument('--warmup', type=int, default=0, help='시나리오별 측정 전 요청 수 (0이면 빈 캐시에서 측정)')
+    parser.add_argument('--concurrency', type=int, default=16, help='동시 요청 수')
+    parser.add_argument('--pool-size', type=int, default=200, help='반복 요청되는 도형/지역 후보 수 (작을수록 캐시 적중 증가)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--timeout', type=float, default=60, help='요청 타임아웃 (초)')
+    parser.add_argument('--workers', type=int, default=1, help='워커 수')
+    parser.add_argument('--launcher', choices=['uvicorn', 'gunicorn'], default='uvicorn',
+                        help='서버 실행 방식 (gunicorn: gunicorn.conf.py 운영 설정)')
+    parser.add_argument('--server-env', action='append', default=[], metavar='KEY=VALUE', help='서버 환경 변수 (반복 가능)')
+    parser.add_argument('--fake-latency-ms', type=float, default=20, help='Supabase 호출 기본 지연')
+    parser.add_argument('--fake-jitter-ms', type=float, default=5)
+    parser.add_argument('--fake-spatial-latency-ms', type=float, default=60, help='공간 RPC 추가 지연')
+    parser.add_argument('--fake-hospitals', type=int, default=20000, help='가상 병원 수')
+    parser.add_argument('--label', default='', help='결과 파일 이름에 붙일 설명')
+    parser.add_argument('--output', default=None, help='결과 JSON 경로 (기본값: bench/results/{시각}-{커밋}.json)')
+    args = parser.parse_args()
+
+    scenarios = make_scenarios(args)
+    selected = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in selected if name not in scenarios]
+    if unknown:
+        raise SystemExit(f"알 수 없는 시나리오: {', '.join(unknown)} (가능: {', '.join(scenarios)})")
+
+    fake_port, server_port = free_port(), free_port()
+    fake_url, server_url = f"http://127.0.0.1:{fake_port}", f"http://127.0.0.1:{server_port}"
+    log_dir = tempfile.mkdtemp(prefix='hrp-bench-')
+
+    fake_env = {
+        **os.environ,
+        'FAKE_LATENCY_MS': str(args.fake_latency_ms),
+        'FAKE_JITTER_MS': str(args.fake_jitter_ms),
+        'FAKE_SPATIAL_LATENCY_MS': str(args.fake_spatial_latency_ms),
+        'FAKE_HOSPITAL_COUNT': str(args.fake_hospitals),
+        'FAKE_SEED': str(args.seed)
+    }
+    server_env_overrides = parse_env_pairs(args.server_env)
+    server_env = {
+        **os.environ,
+        'SUPABASE_URL': fake_url,
+        'SUPABASE_KEY': 'bench-' + 'k' * 40,
+        **server_env_overrides
+    }
+
+    fake = start_process(
+        [sys.executable, '-m', 'uvicorn', 'fake_supabase:app', '--app-dir', BENCH_DIR,
+         '--port', str(fake_port), '--log-level', 'warning'],
+        fake_env, os.path.join(log_dir, 'fake_supabase.log')
+    )
+    server = None
+    try:
+        wait_until_ready(f"{fake_url}/calls", fake, os.path.join(log_dir, 'fake_supabase.log'))
+
+        if args.launcher == 'gunicorn':
+            # 운영 설정 (gunicorn.conf.py: preload_app + uvicorn 워커)
+            command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'server:app']
+            server_env.update({'HOST': '127.0.0.1', 'PORT': str(server_port), 'WEB_CONCURRENCY': str(args.workers)})
+        else:
+            command = [sys.executable, '-m', 'uvicorn', 'server:app', '--port', str(server_port),
+                       '--workers', str(args.workers), '--log-level', 'warning']
+        server = start_process(command, server_env, os.path.join(log_dir, 'server.log'))
+        wait_until_ready(f"{server_url}/health", server, os.path.join(log_dir, 'server.log'))
+        print(f"서버 준비 완료 (워커 {args.workers}개, 로그: {log_dir})")
+
+        result = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'label': args.label,
+            'git': git_info(),
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count()
+            },
+            'config': {
+                'requests': args.requests,
+                'warmup': args.warmup,
+                'concurrency': args.concurrency,
+                'pool_size': args.pool_size,
+                'seed': args.seed,
+                'workers': args.workers,
+                'launcher': args.launcher,
+                'server_env': server_env_overrides,
+                'fake': {
+                    'latency_ms': args.fake_latency_ms,
+                    'jitter_ms': args.fake_jitter_ms,
+                    'spatial_latency_ms': args.fake_spatial_latency_ms,
+                    'hospitals': args.fake_hospitals
+                }
+            },
+            'rss_mb': {'start': process_tree_memory_mb(server.pid)},
+            'pss_mb': {'start': process_tree_memory_mb(server.pid, 'pss')},
+            'scenarios': {}
+        }
+
+        for name in selected:
+            print(f"- {name}: {args.requests}개 요청 (동시 {args.concurrency})")
+            result['scenarios'][name] = asyncio.run(
+                run_scenario(name, scenarios[name], args, server_url, fake_url, server.pid)
+            )
+
+        result['rss_mb']['end'] = process_tree_memory_mb(server.pid)
+        result['pss_mb']['end'] = process_tree_memory_mb(server.pid, 'pss')
+    finally:
+        if server is not None:
+            stop_process(server)
+        stop_process(fake)
+
+    output = args.output
+    if output is None:
+        commit = (result['git']['commit'] or 'nogit')[:8] + ('-dirty' if result['git']['dirty'] else '')
+        name = datetime.now().strftime('%Y%m%d-%H%M%S') + f"-{commit}" + (f"-{args.label}" if args.label else '')
+        output = os.path.join(RESULTS_DIR, f"{name}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    print_summary(result)
+    print(f"\n결과 저장: {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+운영 환경 gunicorn 설정 (Dockerfile CMD: gunicorn -c gunicorn.conf.py server:app)
+
+- 워커: uvicorn 워커(uvloop 이벤트 루프 + httptools HTTP 파서, uvicorn[standard]에 포함) WEB_CONCURRENCY개
+- preload_app: 마스터가 server.py를 한 번 import하고 정적 데이터(행정구역 코드 인덱스, 격자 스냅샷, 병원 인덱스)를 로드한 뒤 워커를 fork하므로
+  워커들이 해당 메모리를 copy-on-write로 공유합니다 (워커마다 korea_admin_codes.json을 다시 파싱하지 않음)
+- 무중단 워커 재시작: kill -HUP <마스터 PID> (docker compose kill -s HUP web)
+  새 워커를 띄운 뒤 기존 워커는 처리 중인 요청을 마치고 종료합니다 (graceful_timeout).
+  preload_app이므로 코드 변경은 반영되지 않으며, 코드 배포는 컨테이너를 다시 시작하세요.
+
+개발 환경에서는 기존처럼 python server.py (단일 프로세스)로 실행합니다.
+"""
+import gc
+import importlib
+import multiprocessing
+import os
+import tempfile
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}"
+
+# 워커 수 (기본값: CPU 코어 수, 컨테이너 CPU 제한이 있으면 WEB_CONCURRENCY로 맞추세요)
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+
+# 워커 응답 없음 판정 시간 / 종료 신호 후 처리 중인 요청을 기다리는 시간 (초)
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+# nginx upstream 연결 재사용 시간 (초)
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "75"))
+
+# 요청 수가 이 값에 도달한 워커를 새로 fork하여 교체 (0이면 사용 안 함, 메모리 증가 대비)
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+
+# 워커 상태 확인 파일을 메모리 파일시스템에 두어 디스크 I/O 지연으로 워커가 종료되는 것을 방지 (Docker)
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# 워커 지표 파일 디렉터리: /metrics가 캐시 백엔드와 관계없이 모든 워커(종료된 워커의 누적 카운터 포함)의 지표를 합산
+# server.py import 전에 설정해야 하므로 여기서 기본값 지정, 시작 시(when_ready) 이전 실행의 파일 삭제
+os.environ.setdefault("METRICS_DIR", os.path.join(worker_tmp_dir or tempfile.gettempdir(), "hrp_metrics"))
+
+# nginx 컨테이너가 보낸 X-Forwarded-For/X-Forwarded-Proto 신뢰 (컨테이너 네트워크 외부에는 포트를 노출하지 않음)
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "*")
+
+# 요청 로그는 nginx가 기록 (애플리케이션 로그는 server.py 로깅 설정 사용)
+accesslog = None
+
+def when_ready(server):
+    """워커를 fork하기 전에 마스터에서 정적 데이터를 로드하고, 이후 GC가 해당 객체를 건드리지 않도록 고정"""
+    app_module = importlib.import_module("server")
+    app_module.load_static_data()
+    app_module.reset_metrics_dir(os.environ["METRICS_DIR"])
+
+    # 참조 카운트/GC 헤더 갱신으로 공유 페이지가 워커마다 복사되는 것을 줄임
+    gc.collect()
+    gc.freeze()
+    server.log.info("정적 데이터 로드 완료 (fork 전 공유 객체 %s개), 워커 %s개 시작", gc.get_freeze_count(), workers)
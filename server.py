@@ -1,80 +1,1618 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, validator
-from typing import List, Union, Any, Optional, Dict
+from typing import List, Union, Any, Optional, Dict, Tuple, NamedTuple, Callable, Awaitable, Hashable
 import uvicorn
 import logging
+import logging.handlers
 import os
 import json
-import sys
-from supabase import create_client, Client
+import asyncio
+import math
+import time
+import zlib
+import mmap
+import fcntl
+import struct
+import socket
+import sqlite3
+import threading
+import bisect
+import contextvars
+import atexit
+import queue
+import random
+import uuid
+import abc
+from supabase import acreate_client, AsyncClient
+try:
+    import numpy as np
+except ImportError:  # 로컬 격자 분석 엔진(ANALYSIS_ENGINE=local/shadow)에만 필요
+    np = None
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # 공유 캐시 계층 CACHE_BACKEND=redis에만 필요
+    redis_asyncio = None
 from functools import lru_cache
+from contextlib import contextmanager
 from datetime import datetime
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # 환경 변수 로드
 load_dotenv()
 
+# 모듈 로거 (핸들러/포맷은 아래 setup_logging()에서 루트 로거에 설정하므로 위쪽 클래스에서도 사용 가능)
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="Hospital Area Analysis API", version="1.0.0")
 
 # 전역 변수: 행정구역 코드 데이터 (앱 시작 시 로드)
 korea_admin_codes = None
+region_index = None  # RegionIndex (앱 시작 시 korea_admin_codes로부터 생성)
+region_lookup_service = None  # 요청 간 공유되는 RegionLookupService
+
+class LRUByteCache:
+    """
+    바이트 예산 기반 LRU 캐시
+
+    항목 크기는 저장 시점에 한 번만 계산하여 누적 합계로 관리합니다 (조회/삭제 O(1)).
+    항목 수(max_items) 또는 총 바이트(max_bytes)를 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+    ttl_seconds를 지정하면 저장 후 해당 시간이 지난 항목은 조회 시 만료 처리합니다.
+    """
+
+    # 항목당 부가 비용 추정치 (OrderedDict 노드 + 튜플 + 키 객체)
+    ENTRY_OVERHEAD_BYTES = 200
+
+    def __init__(self, name: str, max_items: int, max_bytes: int, ttl_seconds: Optional[float] = None):
+        self.name = name
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, Tuple[Any, int, Optional[float]]] = OrderedDict()  # key → (값, 크기, 만료 시각)
+        self.total_bytes = 0
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
 
-# 캐시 설정
-MAX_CACHE_SIZE = 100  # 최대 100개 항목 (약 20MB)
-MAX_CACHE_MEMORY_MB = 50  # 최대 50MB
-
-# 전역 변수: 경계 데이터 캐시 (LRU를 위해 OrderedDict 사용)
-boundary_cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
-cache_stats = {
-    'hits': 0,
-    'misses': 0,
-    'total_requests': 0,
-    'evictions': 0  # LRU 삭제 횟수
-}
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def keys(self) -> List[str]:
+        return list(self._entries.keys())
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (히트 시 최근 사용으로 표시)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+
+        if entry[2] is not None and entry[2] <= time.monotonic():
+            self.delete(key)
+            self.stats['misses'] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats['hits'] += 1
+        return entry[0]
+
+    def set(self, key: str, value: Any, size: int):
+        """
+        캐시 저장
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값
+            size: 값의 크기 (바이트, 직렬화 크기 기준)
+        """
+        charged = size + len(key) + self.ENTRY_OVERHEAD_BYTES
+        if charged > self.max_bytes:
+            logger.warning("[%s] 캐시 예산보다 큰 항목은 저장하지 않습니다: %s (%s bytes)", self.name, key, charged)
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else None
+
+        self.delete(key)
+        self._entries[key] = (value, charged, expires_at)
+        self.total_bytes += charged
+
+        while len(self._entries) > self.max_items or self.total_bytes > self.max_bytes:
+            self._evict_oldest()
+
+    def delete(self, key: str) -> bool:
+        """항목 삭제"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.total_bytes -= entry[1]
+        return True
+
+    def _evict_oldest(self):
+        """가장 오래 사용하지 않은 항목 삭제"""
+        oldest_key, (_, charged, _) = self._entries.popitem(last=False)
+        self.total_bytes -= charged
+        self.stats['evictions'] += 1
+        logger.debug("✓ [%s] LRU 캐시 삭제: %s (총 %d개 남음)", self.name, oldest_key, len(self._entries))
+
+    def clear(self) -> int:
+        """캐시 전체 삭제 (삭제된 항목 수 반환)"""
+        cleared_count = len(self._entries)
+        self._entries.clear()
+        self.total_bytes = 0
+        return cleared_count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 (메모리 사용량 포함)"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] / lookups * 100) if lookups > 0 else 0
+        memory_mb = self.total_bytes / (1024 * 1024)
+        max_memory_mb = self.max_bytes / (1024 * 1024)
+
+        return {
+            "total_requests": lookups,
+            "cache_hits": self.stats['hits'],
+            "cache_misses": self.stats['misses'],
+            "evictions": self.stats['evictions'],
+            "hit_rate": f"{hit_rate:.2f}%",
+            "cached_items": len(self._entries),
+            "max_cache_size": self.max_items,
+            "memory_usage_mb": f"{memory_mb:.2f}",
+            "max_memory_mb": round(max_memory_mb, 2),
+            "memory_utilization": f"{memory_mb / max_memory_mb * 100:.1f}%",
+            "ttl_seconds": self.ttl_seconds
+        }
+
+    def reset_stats(self):
+        """통계 초기화"""
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+class SingleFlight:
+    """
+    같은 키의 동시 조회를 하나로 합치는 도구 (single-flight)
+
+    캐시 미스가 동시에 여러 번 나도 키마다 조회는 한 번만 실행하고, 나머지 호출은 같은 결과(또는 예외)를 기다립니다.
+    조회가 끝나면 키를 지우므로 결과 보관은 캐시가 담당합니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}  # 조회 중인 키 → 조회 작업
+        self.reset_stats()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """key 조회가 진행 중이면 그 결과를 기다리고, 없으면 fetch()를 실행"""
+        self.stats['calls'] += 1
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats['executions'] += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.stats['coalesced'] += 1
+
+        # 요청 하나가 취소되어도 다른 호출이 기다리는 조회는 계속 진행
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        """완료된 조회 정리 (기다리던 호출이 모두 취소된 경우에도 예외를 확인 처리)"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.stats['errors'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """합쳐진 호출 통계"""
+        calls = self.stats['calls']
+        coalesce_rate = (self.stats['coalesced'] / calls * 100) if calls > 0 else 0
+
+        return {
+            "calls": calls,
+            "executions": self.stats['executions'],
+            "coalesced": self.stats['coalesced'],
+            "errors": self.stats['errors'],
+            "coalesce_rate": f"{coalesce_rate:.2f}%",
+            "in_flight": len(self._inflight)
+        }
+
+    def reset_stats(self):
+        """통계 초기화"""
+        self.stats = {
+            'calls': 0,
+            'executions': 0,
+            'coalesced': 0,
+            'errors': 0
+        }
+
+# 공유 캐시 계층 설정 (워커/컨테이너 간 공유, 각 워커의 메모리 캐시 뒤의 L2)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "local").lower()  # local(공유 안 함) | sqlite | redis
+CACHE_SHARED_PATH = os.getenv("CACHE_SHARED_PATH", "data/shared_cache.sqlite3")  # CACHE_BACKEND=sqlite 파일 경로
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")  # CACHE_BACKEND=redis 주소
+CACHE_SHARED_TTL_SECONDS = int(os.getenv("CACHE_SHARED_TTL_SECONDS", "86400"))  # TTL 없는 캐시(경계/분석)의 공유 계층 보관 시간
+CACHE_SHARED_MAX_MB = float(os.getenv("CACHE_SHARED_MAX_MB", "512"))  # sqlite 공유 캐시 최대 크기
+CACHE_SHARED_SYNC_SECONDS = 10  # 워커 통계 공유 + 다른 워커의 캐시 삭제 반영 주기
+
+def get_worker_id() -> str:
+    """워커 식별자 (호스트:PID, fork 이후에도 워커마다 다름)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def pack_blobs(blobs: List[bytes]) -> bytes:
+    """바이트 조각 목록을 길이 접두사(4바이트) 형식 하나로 묶기"""
+    return b''.join(len(blob).to_bytes(4, 'big') + blob for blob in blobs)
+
+def unpack_blobs(data: bytes) -> List[bytes]:
+    """pack_blobs로 묶은 바이트를 조각 목록으로 복원"""
+    blobs = []
+    offset = 0
+    while offset < len(data):
+        length = int.from_bytes(data[offset:offset + 4], 'big')
+        blobs.append(data[offset + 4:offset + 4 + length])
+        offset += 4 + length
+    return blobs
+
+class SharedCacheBackend(abc.ABC):
+    """
+    워커/컨테이너가 함께 쓰는 공유 캐시 계층 (L2)
+
+    각 워커의 메모리 캐시(L1)에서 미스가 나면 DB 조회 전에 이 계층을 확인하고, DB에서 가져온 값은
+    두 계층에 모두 저장합니다. 값은 바이트로만 다루며, 공유 계층 오류는 캐시 미스로 처리합니다.
+    워커별 캐시 통계와 캐시 삭제 세대(generation)도 이 계층으로 공유합니다.
+    구현체(SQLite/Redis)는 추상 메서드를 모두 구현해야 생성할 수 있습니다.
+    """
+
+    name = 'local'
+
+    def __init__(self):
+        self.reset_stats()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """단일 조회 (없거나 오류면 None)"""
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """여러 키 조회 (찾은 키만 반환)"""
+        try:
+            values = await self._get_many(keys) if keys else {}
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error("공유 캐시 조회 오류 (%s): %s", self.name, e)
+            return {}
+        self.stats['hits'] += len(values)
+        self.stats['misses'] += len(keys) - len(values)
+        return values
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float):
+        """단일 저장"""
+        await self.set_many({key: value}, ttl_seconds)
+
+    async def set_many(self, items: Dict[str, bytes], ttl_seconds: float):
+        """여러 항목 저장 (오류는 기록만 하고 무시)"""
+        if not items:
+            return
+        try:
+            await self._set_many(items, ttl_seconds)
+            self.stats['writes'] += len(items)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error("공유 캐시 저장 오류 (%s): %s", self.name, e)
+
+    @abc.abstractmethod
+    async def clear(self) -> int:
+        """공유 캐시 전체 삭제 + 삭제 세대 증가 (다른 워커가 메모리 캐시를 비우도록)"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_generation(self) -> int:
+        """캐시 삭제 세대"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def publish_stats(self, worker_id: str, stats: Dict[str, Any]):
+        """이 워커의 캐시 통계 공유"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def collect_stats(self) -> Dict[str, Dict[str, Any]]:
+        """최근 통계를 공유한 워커별 캐시 통계"""
+        raise NotImplementedError
+
+    async def maintain(self):
+        """만료 항목 정리 등 주기 작업"""
+
+    async def close(self):
+        """연결 종료"""
+
+    @abc.abstractmethod
+    async def _get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def _set_many(self, items: Dict[str, bytes], ttl_seconds: float):
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict[str, Any]:
+        """이 워커의 공유 계층 조회 통계"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] / lookups * 100) if lookups > 0 else 0
+
+        return {
+            "backend": self.name,
+            "cache_hits": self.stats['hits'],
+            "cache_misses": self.stats['misses'],
+            "hit_rate": f"{hit_rate:.2f}%",
+            "writes": self.stats['writes'],
+            "errors": self.stats['errors']
+        }
+
+    def reset_stats(self):
+        """통계 초기화"""
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'errors': 0
+        }
+
+class SQLiteSharedCache(SharedCacheBackend):
+    """
+    SQLite 파일 공유 캐시 (같은 호스트의 워커/컨테이너끼리 공유)
+
+    WAL 모드 + mmap으로 읽기는 잠금 없이 메모리 매핑된 페이지에서 처리합니다.
+    호출은 스레드에서 실행해 이벤트 루프를 막지 않습니다.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path: str, max_bytes: int):
+        super().__init__()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(f'PRAGMA mmap_size={max_bytes}')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS cache_entries_expires_at ON cache_entries (expires_at);
+            CREATE TABLE IF NOT EXISTS cache_workers (
+                worker_id TEXT PRIMARY KEY, stats TEXT NOT NULL, updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        ''')
+
+    async def _run(self, fn, *args):
+        """연결 하나를 잠금으로 보호하여 스레드에서 실행"""
+        def locked():
+            with self._lock:
+                return fn(*args)
+        return await asyncio.to_thread(locked)
+
+    async def _get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        def query():
+            placeholders = ','.join('?' * len(keys))
+            rows = self._conn.execute(
+                f'SELECT key, value FROM cache_entries WHERE key IN ({placeholders}) AND expires_at > ?',
+                (*keys, time.time())
+            ).fetchall()
+            return {key: bytes(value) for key, value in rows}
+        return await self._run(query)
+
+    def _transaction(self, fn):
+        """fn(conn)을 하나의 쓰기 트랜잭션으로 실행"""
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = fn(self._conn)
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        self._conn.execute('COMMIT')
+        return result
+
+    async def _set_many(self, items: Dict[str, bytes], ttl_seconds: float):
+        expires_at = time.time() + ttl_seconds
+        await self._run(self._transaction, lambda conn: conn.executemany(
+            'INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)',
+            [(key, value, expires_at) for key, value in items.items()]
+        ))
+
+    async def clear(self) -> int:
+        def clear_entries(conn):
+            cleared_count = conn.execute('DELETE FROM cache_entries').rowcount
+            conn.execute(
+                'INSERT INTO cache_meta (name, value) VALUES (\'generation\', 1) '
+                'ON CONFLICT(name) DO UPDATE SET value = value + 1'
+            )
+            return cleared_count
+        return await self._run(self._transaction, clear_entries)
+
+    async def get_generation(self) -> int:
+        def query():
+            row = self._conn.execute('SELECT value FROM cache_meta WHERE name = \'generation\'').fetchone()
+            return row[0] if row else 0
+        return await self._run(query)
+
+    async def publish_stats(self, worker_id: str, stats: Dict[str, Any]):
+        await self._run(
+            self._conn.execute,
+            'INSERT OR REPLACE INTO cache_workers (worker_id, stats, updated_at) VALUES (?, ?, ?)',
+            (worker_id, json.dumps(stats), time.time())
+        )
+
+    async def collect_stats(self) -> Dict[str, Dict[str, Any]]:
+        def query():
+            # 통계 공유가 끊긴(종료된) 워커는 제외 후 정리
+            cutoff = time.time() - CACHE_SHARED_SYNC_SECONDS * 3
+            self._conn.execute('DELETE FROM cache_workers WHERE updated_at < ?', (cutoff,))
+            rows = self._conn.execute('SELECT worker_id, stats FROM cache_workers').fetchall()
+            return {worker_id: json.loads(stats) for worker_id, stats in rows}
+        return await self._run(query)
+
+    async def maintain(self):
+        """만료 항목 삭제, 최대 크기를 넘으면 만료가 가까운 항목부터 10%씩 삭제"""
+        def purge():
+            self._conn.execute('DELETE FROM cache_entries WHERE expires_at <= ?', (time.time(),))
+            while True:
+                page_count = self._conn.execute('PRAGMA page_count').fetchone()[0]
+                freelist_count = self._conn.execute('PRAGMA freelist_count').fetchone()[0]
+                page_size = self._conn.execute('PRAGMA page_size').fetchone()[0]
+                if (page_count - freelist_count) * page_size <= self.max_bytes:
+                    return
+                deleted = self._conn.execute(
+                    'DELETE FROM cache_entries WHERE key IN '
+                    '(SELECT key FROM cache_entries ORDER BY expires_at LIMIT '
+                    '(SELECT MAX(COUNT(*) / 10, 1) FROM cache_entries))'
+                ).rowcount
+                if deleted == 0:
+                    return
+        await self._run(purge)
+
+    async def close(self):
+        await self._run(self._conn.close)
+
+class RedisSharedCache(SharedCacheBackend):
+    """Redis(호환 서버) 공유 캐시 (여러 호스트의 컨테이너끼리 공유, 만료는 Redis TTL 사용)"""
+
+    name = 'redis'
+    KEY_PREFIX = 'hrp:cache:'
+    WORKER_PREFIX = 'hrp:worker:'
+    GENERATION_KEY = 'hrp:generation'
+
+    def __init__(self, url: str):
+        super().__init__()
+        self.client = redis_asyncio.from_url(url)
+
+    async def _get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        values = await self.client.mget([self.KEY_PREFIX + key for key in keys])
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    async def _set_many(self, items: Dict[str, bytes], ttl_seconds: float):
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(self.KEY_PREFIX + key, value, ex=max(1, int(ttl_seconds)))
+            await pipe.execute()
+
+    async def clear(self) -> int:
+        cleared_count = 0
+        batch = []
+        async for key in self.client.scan_iter(match=self.KEY_PREFIX + '*', count=1000):
+            batch.append(key)
+            if len(batch) >= 1000:
+                cleared_count += await self.client.delete(*batch)
+                batch = []
+        if batch:
+            cleared_count += await self.client.delete(*batch)
+        await self.client.incr(self.GENERATION_KEY)
+        return cleared_count
+
+    async def get_generation(self) -> int:
+        return int(await self.client.get(self.GENERATION_KEY) or 0)
+
+    async def publish_stats(self, worker_id: str, stats: Dict[str, Any]):
+        await self.client.set(self.WORKER_PREFIX + worker_id, json.dumps(stats), ex=CACHE_SHARED_SYNC_SECONDS * 3)
+
+    async def collect_stats(self) -> Dict[str, Dict[str, Any]]:
+        keys = [key async for key in self.client.scan_iter(match=self.WORKER_PREFIX + '*', count=1000)]
+        values = await self.client.mget(keys) if keys else []
+        return {
+            key.decode('utf-8')[len(self.WORKER_PREFIX):]: json.loads(value)
+            for key, value in zip(keys, values) if value is not None
+        }
+
+    async def close(self):
+        await self.client.aclose()
+
+def create_shared_cache() -> Optional[SharedCacheBackend]:
+    """CACHE_BACKEND 설정에 맞는 공유 캐시 계층 생성 (local이면 None)"""
+    if CACHE_BACKEND == 'sqlite':
+        return SQLiteSharedCache(CACHE_SHARED_PATH, int(CACHE_SHARED_MAX_MB * 1024 * 1024))
+    if CACHE_BACKEND == 'redis':
+        if redis_asyncio is None:
+            raise ValueError("CACHE_BACKEND=redis 설정에는 redis 패키지가 필요합니다 (pip install redis)")
+        return RedisSharedCache(CACHE_REDIS_URL)
+    if CACHE_BACKEND != 'local':
+        raise ValueError(f"알 수 없는 CACHE_BACKEND: {CACHE_BACKEND}")
+    return None
+
+# 전역 변수: 공유 캐시 계층 (앱 시작 시 워커마다 연결, CACHE_BACKEND=local이면 None)
+shared_cache: Optional[SharedCacheBackend] = None
+
+# 경계 데이터 캐시 설정 (항목은 직렬화된 JSON 바이트로 저장되며 바이트 크기로 예산 계산)
+MAX_CACHE_SIZE = int(os.getenv("MAX_CACHE_SIZE", "5000"))  # 최대 항목 수 (지역당 1개, 전체 행정구역 ~3.8k)
+MAX_CACHE_MEMORY_MB = float(os.getenv("MAX_CACHE_MEMORY_MB", "50"))  # 최대 50MB
+
+# 전역 변수: 경계 데이터 캐시 ("{level}:{region_code}" → LOD별 BoundaryPayload, 지역당 1개 항목)
+boundary_cache = LRUByteCache(
+    'boundary',
+    max_items=MAX_CACHE_SIZE,
+    max_bytes=int(MAX_CACHE_MEMORY_MB * 1024 * 1024)
+)
+boundary_flight = SingleFlight('boundary')  # (region_code, level) → 원본 경계 조회 + 전체 LOD 계산
+
+# 경계 응답 사전 압축 설정 (true면 경계 JSON을 gzip 조각으로도 보관하여 응답에 그대로 이어 붙임)
+BOUNDARY_PRECOMPRESS = os.getenv("BOUNDARY_PRECOMPRESS", "false").lower() == "true"
+BOUNDARY_GZIP_LEVEL = 6  # nginx gzip_comp_level과 동일
+
+# 디스크 경계 저장소 설정 (재시작/재배포 후에도 경계 RPC 없이 시작)
+BOUNDARY_STORE_ENABLED = os.getenv("BOUNDARY_STORE_ENABLED", "false").lower() == "true"
+BOUNDARY_STORE_DIR = os.getenv("BOUNDARY_STORE_DIR", "data/boundary_store")
+BOUNDARY_DATA_VERSION = os.getenv("BOUNDARY_DATA_VERSION", "")  # 경계 데이터 릴리스 버전 (버전별로 저장소 파일 분리)
+
+class BoundaryPayload(NamedTuple):
+    """캐시된 경계 데이터 (응답 본문에 그대로 삽입하는 JSON 바이트)"""
+    json: bytes  # BoundaryCoordinates JSON
+    deflated: Optional[bytes]  # json의 raw deflate 조각 (Z_SYNC_FLUSH로 끝남, 사전 압축 시에만)
+    delta: Optional['BoundaryPayload'] = None  # 같은 경계의 정수 델타 인코딩 (encode_boundary_delta)
+
+    @property
+    def size(self) -> int:
+        size = len(self.json) + (len(self.deflated) if self.deflated else 0)
+        if self.delta is not None:
+            size += self.delta.size
+        return size
+
+def make_boundary_payload(serialized: bytes, delta_serialized: Optional[bytes] = None) -> BoundaryPayload:
+    """직렬화된 경계 JSON으로 캐시 항목 생성 (BOUNDARY_PRECOMPRESS면 deflate 조각도 미리 생성)"""
+    deflated = None
+    if BOUNDARY_PRECOMPRESS:
+        compressor = zlib.compressobj(BOUNDARY_GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated = compressor.compress(serialized) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    delta = make_boundary_payload(delta_serialized) if delta_serialized is not None else None
+    return BoundaryPayload(serialized, deflated, delta)
+
+# gzip 헤더 (RFC 1952: magic, deflate, 플래그/시각 없음, OS=unknown)
+GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+
+def splice_gzip(prefix: bytes, payload: BoundaryPayload, suffix: bytes) -> bytes:
+    """
+    prefix + 경계 JSON + suffix를 하나의 gzip 스트림으로 만듭니다.
+
+    경계 부분은 미리 압축해 둔 deflate 조각을 그대로 사용하고, 앞뒤의 작은 JSON만 새로 압축합니다.
+    (Z_SYNC_FLUSH로 끝난 deflate 조각은 바이트 경계에서 끝나므로 이어 붙여도 유효한 스트림이 됨)
+    """
+    head = zlib.compressobj(BOUNDARY_GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+    tail = zlib.compressobj(BOUNDARY_GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+    crc = zlib.crc32(suffix, zlib.crc32(payload.json, zlib.crc32(prefix)))
+    total_length = len(prefix) + len(payload.json) + len(suffix)
+
+    return b''.join([
+        GZIP_HEADER,
+        head.compress(prefix) + head.flush(zlib.Z_SYNC_FLUSH),
+        payload.deflated,
+        tail.compress(suffix) + tail.flush(zlib.Z_FINISH),
+        crc.to_bytes(4, 'little'),
+        (total_length & 0xFFFFFFFF).to_bytes(4, 'little')
+    ])
+
+def render_population_response(
+    result: 'PopulationResult',
+    boundary: Optional[BoundaryPayload],
+    accept_encoding: str = ''
+) -> Response:
+    """
+    PopulationResult 응답 생성 (경계 JSON 바이트를 재직렬화 없이 본문에 삽입)
+
+    경계를 제외한 작은 결과만 직렬화하고, 캐시된 경계 JSON은 "boundary" 필드에 그대로 이어 붙입니다.
+    클라이언트가 gzip을 받을 수 있고 사전 압축 조각이 있으면 gzip 본문을 바로 반환합니다.
+    """
+    with metrics.measure('serialization'):
+        prefix = result.model_dump_json(exclude={'boundary'}).encode('utf-8')[:-1] + b',"boundary":'
+        suffix = b'}'
+
+        if boundary is None:
+            return Response(content=prefix + b'null' + suffix, media_type='application/json')
+
+        if boundary.deflated is not None and 'gzip' in accept_encoding:
+            return Response(
+                content=splice_gzip(prefix, boundary, suffix),
+                media_type='application/json',
+                headers={'Content-Encoding': 'gzip', 'Vary': 'Accept, Accept-Encoding'}
+            )
+
+        return Response(
+            content=prefix + boundary.json + suffix,
+            media_type='application/json',
+            headers={'Vary': 'Accept'}
+        )
+
+def render_json_response(content: Any) -> Response:
+    """dict/list를 JSON 응답으로 직렬화 (Starlette JSONResponse와 같은 형식, 직렬화 시간 기록)"""
+    with metrics.measure('serialization'):
+        body = json.dumps(content, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return Response(content=body, media_type='application/json')
+
+# 카카오맵 레벨 L ↔ 웹 지도 표준 줌(256px 타일 기준) 변환: 줌 = KAKAO_LEVEL_ZOOM_OFFSET - L
+# (카카오맵 레벨 3 = 1m/px ≈ 위도 37도의 줌 17, static/script.*.js의 kakaoLevelToZoom()과 같은 값)
+KAKAO_LEVEL_ZOOM_OFFSET = 20
+
+# 경계 LOD(Level of Detail) 설정 (줌은 웹 지도 표준 줌)
+BOUNDARY_LOD_ZOOMS = (5, 7, 9, 11, 13)  # 미리 계산해 두는 단순화 단계
+BOUNDARY_FULL_DETAIL_ZOOM = 14  # 이 줌 이상이면 원본 좌표 사용
+
+def get_boundary_lod(zoom: Optional[int]) -> Optional[int]:
+    """요청 줌에 사용할 LOD 단계 (None이면 원본 좌표)"""
+    if zoom is None or zoom >= BOUNDARY_FULL_DETAIL_ZOOM:
+        return None
+    lower_lods = [lod for lod in BOUNDARY_LOD_ZOOMS if lod <= zoom]
+    return lower_lods[-1] if lower_lods else BOUNDARY_LOD_ZOOMS[0]
+
+def get_boundary_grid(lod: int) -> float:
+    """LOD 줌에서 반 픽셀에 해당하는 격자 크기 (도 단위)"""
+    return 360.0 / (256 * 2 ** lod) / 2
+
+def get_boundary_cache_key(region_code: str, level: str) -> str:
+    """경계 캐시/저장소 키 ("{level}:{region_code}", 원본과 모든 LOD 단계를 한 항목에 보관)"""
+    return f"{level}:{region_code}"
+
+def _douglas_peucker(points: List[Tuple[int, int]], tolerance: float) -> List[Tuple[int, int]]:
+    """열린 선분열 Douglas-Peucker 단순화 (양 끝점 유지)"""
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        (x1, y1), (x2, y2) = points[start], points[end]
+        dx, dy = x2 - x1, y2 - y1
+        length = (dx * dx + dy * dy) ** 0.5
+
+        max_distance = 0.0
+        max_index = -1
+        for i in range(start + 1, end):
+            px, py = points[i]
+            if length == 0:
+                distance = ((px - x1) ** 2 + (py - y1) ** 2) ** 0.5
+            else:
+                distance = abs(dx * (py - y1) - dy * (px - x1)) / length
+            if distance > max_distance:
+                max_distance = distance
+                max_index = i
+
+        if max_distance > tolerance:
+            keep[max_index] = True
+            stack.append((start, max_index))
+            stack.append((max_index, end))
+
+    return [point for point, kept in zip(points, keep) if kept]
+
+def _simplify_ring(ring: List[List[float]], grid: float) -> Optional[List[List[float]]]:
+    """
+    링 단순화
+
+    1. 꼭짓점을 격자에 맞추고 연속 중복점/일직선 위의 점을 제거합니다.
+       각 꼭짓점은 자기 좌표만으로 이동하므로 이웃 행정구역과 공유하는 꼭짓점은 양쪽에서 같은 위치가 됩니다.
+    2. 격자 1칸을 허용 오차로 Douglas-Peucker 단순화를 적용하여 격자 맞춤으로 생긴 계단 모양을 없앱니다.
+       링은 가장 먼 두 점을 기준으로 나누어 처리하므로 삼각형 이상으로 유지됩니다.
+
+    Returns:
+        닫힌 링 (첫 점 == 마지막 점) 또는 None (서로 다른 점이 3개 미만으로 줄어든 경우)
+    """
+    points: List[Tuple[int, int]] = []
+    for coord in ring:
+        point = (round(coord[0] / grid), round(coord[1] / grid))
+        if points and points[-1] == point:
+            continue
+        # 직전 두 점과 일직선이면 가운데 점 제거 (정수 격자 좌표라 외적 판정이 정확함)
+        while len(points) >= 2:
+            (x1, y1), (x2, y2) = points[-2], points[-1]
+            if (x2 - x1) * (point[1] - y1) - (y2 - y1) * (point[0] - x1) != 0:
+                break
+            points.pop()
+        if points and points[-1] == point:
+            continue
+        points.append(point)
+
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    if len(points) < 3:
+        return None
+
+    # 시작점과 가장 먼 점에서 링을 두 선분열로 나누어 단순화
+    x0, y0 = points[0]
+    far_index = max(range(len(points)), key=lambda i: (points[i][0] - x0) ** 2 + (points[i][1] - y0) ** 2)
+    first_half = _douglas_peucker(points[:far_index + 1], 1.0)
+    second_half = _douglas_peucker(points[far_index:] + points[:1], 1.0)
+    points = first_half[:-1] + second_half[:-1]
+
+    if len(points) < 3:
+        return None
+
+    simplified = [[round(x * grid, 7), round(y * grid, 7)] for x, y in points]
+    simplified.append(simplified[0])
+    return simplified
+
+def _simplify_polygon(polygon: List[List[List[float]]], grid: float) -> Optional[List[List[List[float]]]]:
+    """다각형(외곽 링 + 구멍) 단순화, 외곽 링이 사라지면 None"""
+    exterior = _simplify_ring(polygon[0], grid) if polygon else None
+    if exterior is None:
+        return None
+    holes = [hole for hole in (_simplify_ring(ring, grid) for ring in polygon[1:]) if hole is not None]
+    return [exterior] + holes
+
+def simplify_boundary(boundary_type: str, coordinates: Any, lod: int) -> Any:
+    """
+    LOD 줌에서 반 픽셀 크기의 격자로 경계 좌표를 단순화합니다.
+
+    Polygon/MultiPolygon (ST_ 접두사 포함) 모두 지원하며, 모든 부분이 한 점으로
+    줄어들 만큼 작은 경계는 원래 좌표의 외곽 사각형으로 대체합니다.
+    """
+    grid = get_boundary_grid(lod)
+
+    if boundary_type.endswith('MultiPolygon'):
+        polygons = [p for p in (_simplify_polygon(polygon, grid) for polygon in coordinates) if p is not None]
+        if polygons:
+            return polygons
+        flat = [coord for polygon in coordinates for ring in polygon for coord in ring]
+    else:
+        polygon = _simplify_polygon(coordinates, grid)
+        if polygon is not None:
+            return polygon
+        flat = [coord for ring in coordinates for coord in ring]
+
+    # 화면상 한 점보다 작은 경계: 외곽 사각형
+    min_x = min(c[0] for c in flat)
+    max_x = max(c[0] for c in flat)
+    min_y = min(c[1] for c in flat)
+    max_y = max(c[1] for c in flat)
+    bbox_ring = [[[min_x, min_y], [max_x, min_y], [max_x, max_y], [min_x, max_y], [min_x, min_y]]]
+    return [bbox_ring] if boundary_type.endswith('MultiPolygon') else bbox_ring
+
+# 정수 델타 경계 인코딩 설정
+# 요청 시 ?boundary_encoding=delta 또는 Accept 헤더에 아래 미디어 타입을 지정하면 사용
+BOUNDARY_DELTA_MEDIA_TYPE = 'application/vnd.hrp.boundary-delta+json'
+BOUNDARY_DELTA_SCALE = 1e-6  # 원본 경계 양자화 단위 (도, ≈ 0.1m). LOD 단계는 해당 격자 크기 사용
+
+def _encode_ring_delta(ring: List[List[float]], scale: float) -> List[int]:
+    """링을 [x0, y0, dx1, dy1, ...] 정수 배열로 변환 (닫는 점과 양자화 후 중복점 생략)"""
+    encoded: List[int] = []
+    prev_x = prev_y = 0
+    for coord in ring:
+        x, y = round(coord[0] / scale), round(coord[1] / scale)
+        if encoded and x == prev_x and y == prev_y:
+            continue
+        encoded.extend((x - prev_x, y - prev_y))
+        prev_x, prev_y = x, y
+
+    if len(encoded) > 2 and prev_x == encoded[0] and prev_y == encoded[1]:
+        del encoded[-2:]
+    return encoded
+
+def encode_boundary_delta(boundary_data: 'BoundaryCoordinates', scale: float) -> bytes:
+    """
+    경계를 양자화된 정수 델타 형식의 JSON 바이트로 인코딩합니다.
+
+    형식: {"type", "encoding": "delta", "scale", "coordinates", "centroid"}
+    coordinates는 GeoJSON과 같은 중첩 구조이되 각 링이 [x0, y0, dx1, dy1, ...] 정수 배열이며,
+    좌표는 누적합 × scale로 복원하고 링은 첫 점을 다시 붙여 닫습니다.
+    """
+    if boundary_data.type.endswith('MultiPolygon'):
+        coordinates = [[_encode_ring_delta(ring, scale) for ring in polygon] for polygon in boundary_data.coordinates]
+    else:
+        coordinates = [_encode_ring_delta(ring, scale) for ring in boundary_data.coordinates]
+
+    encoded = {
+        'type': boundary_data.type,
+        'encoding': 'delta',
+        'scale': scale,
+        'coordinates': coordinates,
+        'centroid': boundary_data.centroid.model_dump()
+    }
+    return json.dumps(encoded, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def build_boundary_payloads(boundary_data: 'BoundaryCoordinates') -> Dict[Optional[int], BoundaryPayload]:
+    """원본 경계와 모든 LOD 단계의 캐시 항목 생성 (키 None = 원본, 각 항목에 델타 인코딩 포함)"""
+    payloads = {None: make_boundary_payload(
+        boundary_data.model_dump_json().encode('utf-8'),
+        encode_boundary_delta(boundary_data, BOUNDARY_DELTA_SCALE)
+    )}
+
+    for lod in BOUNDARY_LOD_ZOOMS:
+        simplified = boundary_data.model_copy(update={
+            'coordinates': simplify_boundary(boundary_data.type, boundary_data.coordinates, lod)
+        })
+        payloads[lod] = make_boundary_payload(
+            simplified.model_dump_json().encode('utf-8'),
+            encode_boundary_delta(simplified, get_boundary_grid(lod))
+        )
+
+    return payloads
+
+def parse_region_boundary(geojson_data: Any) -> Optional['BoundaryCoordinates']:
+    """get_region_boundary_wgs84 RPC 응답(GeoJSON + 중심점)을 BoundaryCoordinates로 변환 (형식 오류/빈 응답이면 None)"""
+    if not geojson_data:
+        return None
+
+    # 필수 필드 검증
+    if not (isinstance(geojson_data, dict) and
+            'type' in geojson_data and
+            'coordinates' in geojson_data and
+            'centroid' in geojson_data):
+        logger.warning("예상치 못한 응답 형식: %s", geojson_data)
+        return None
+
+    # 중심점 데이터 검증
+    centroid_data = geojson_data['centroid']
+    if not (isinstance(centroid_data, dict) and 'lng' in centroid_data and 'lat' in centroid_data):
+        logger.warning("중심점 데이터 형식 오류: %s", centroid_data)
+        return None
+
+    return BoundaryCoordinates(
+        type=geojson_data['type'],
+        coordinates=geojson_data['coordinates'],
+        centroid=Centroid(
+            lng=centroid_data['lng'],
+            lat=centroid_data['lat']
+        )
+    )
+
+def pack_boundary_payloads(payloads: Dict[Optional[int], BoundaryPayload]) -> bytes:
+    """원본 + 모든 LOD 단계 캐시 항목을 공유 캐시용 바이트 하나로 묶기 (JSON/델타 JSON만 저장)"""
+    blobs = []
+    for lod in (None, *BOUNDARY_LOD_ZOOMS):
+        payload = payloads[lod]
+        blobs.append(payload.json)
+        blobs.append(payload.delta.json if payload.delta is not None else b'')
+    return pack_blobs(blobs)
+
+def unpack_boundary_payloads(data: bytes) -> Dict[Optional[int], BoundaryPayload]:
+    """pack_boundary_payloads로 묶은 바이트를 캐시 항목으로 복원 (LOD 설정이 다르면 ValueError)"""
+    lods = (None, *BOUNDARY_LOD_ZOOMS)
+    blobs = unpack_blobs(data)
+    if len(blobs) != len(lods) * 2:
+        raise ValueError("공유 캐시의 경계 LOD 단계 수가 현재 설정과 다릅니다")
+    return {
+        lod: make_boundary_payload(blobs[i * 2], blobs[i * 2 + 1] or None)
+        for i, lod in enumerate(lods)
+    }
+
+def get_boundary_store_path(directory: str, version: str) -> str:
+    """데이터 릴리스 버전별 경계 저장소 파일 경로"""
+    return os.path.join(directory, f"boundaries-{version}.bin" if version else "boundaries.bin")
+
+class BoundaryStore:
+    """
+    디스크 경계 저장소 (데이터 릴리스 버전별 파일 하나, 재시작 후에도 유지)
+
+    파일 = 헤더(버전, LOD 단계) + 레코드 [본문 길이 | crc32 | 키 길이 | 키 | pack_boundary_payloads 바이트] 나열.
+    시작 시 파일을 mmap하여 레코드 위치만 색인하고(본문은 읽지 않음), 조회한 레코드만 페이지 캐시에서 읽습니다.
+    새 경계는 파일 끝에 추가하며(flock으로 워커/프로세스 간 직렬화), 다른 워커가 추가한 레코드는 미스 시 다시 색인합니다.
+    """
+
+    MAGIC = b'HRPBND01'
+    RECORD_HEADER = struct.Struct('>IIH')  # 본문(키 + 값) 길이, 본문 crc32, 키 길이
+
+    def __init__(self, path: str, version: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.version = version
+        self._lock = threading.Lock()
+        self._index: Dict[str, Tuple[int, int]] = {}  # 키 → (값 시작 위치, 값 길이)
+        self._mmap: Optional[mmap.mmap] = None
+        self._indexed_size = 0  # 색인한 마지막 정상 레코드의 끝 위치
+        self.reset_stats()
+
+        self._file = open(os.open(path, os.O_RDWR | os.O_CREAT, 0o644), 'r+b')
+        try:
+            self._indexed_size = self._open_header()
+            self._refresh_index()
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _open_header(self) -> int:
+        """헤더 확인 (빈 파일이면 작성), 현재 설정과 버전/LOD 단계가 다르면 ValueError. 첫 레코드 위치 반환"""
+        meta = json.dumps({'version': self.version, 'lods': list(BOUNDARY_LOD_ZOOMS)}).encode('utf-8')
+        header = self.MAGIC + len(meta).to_bytes(4, 'big') + meta
+
+        fcntl.flock(self._file, fcntl.LOCK_EX)
+        try:
+            self._file.seek(0)
+            existing = self._file.read(len(header))
+            if not existing:
+                self._file.write(header)
+                self._file.flush()
+            elif existing != header:
+                raise ValueError(f"경계 저장소 헤더가 현재 설정(버전 {self.version!r}, LOD {BOUNDARY_LOD_ZOOMS})과 다릅니다: {self.path}")
+        finally:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        return len(header)
+
+    def _refresh_index(self):
+        """파일이 커졌으면 다시 mmap하고 새 레코드만 색인 (잘린 마지막 레코드는 건너뜀)"""
+        size = os.fstat(self._file.fileno()).st_size
+        if size <= self._indexed_size:
+            return
+
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        offset = self._indexed_size
+        while offset + self.RECORD_HEADER.size <= size:
+            body_length, _, key_length = self.RECORD_HEADER.unpack_from(self._mmap, offset)
+            body_start = offset + self.RECORD_HEADER.size
+            end = body_start + body_length
+            if end > size or key_length > body_length:
+                break
+            key = self._mmap[body_start:body_start + key_length].decode('utf-8')
+            self._index[key] = (offset, end)
+            offset = end
+        self._indexed_size = offset
+
+    def get(self, key: str) -> Optional[bytes]:
+        """pack_boundary_payloads 바이트 조회 (없거나 손상되었으면 None)"""
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                self._refresh_index()
+                location = self._index.get(key)
+            if location is None:
+                self.stats['misses'] += 1
+                return None
+
+            offset, end = location
+            _, crc, key_length = self.RECORD_HEADER.unpack_from(self._mmap, offset)
+            body = self._mmap[offset + self.RECORD_HEADER.size:end]
+
+        if zlib.crc32(body) != crc:
+            self.stats['errors'] += 1
+            logger.error("경계 저장소 레코드 손상: %s (%s)", key, self.path)
+            return None
+
+        self.stats['hits'] += 1
+        return body[key_length:]
+
+    def put(self, key: str, value: bytes) -> bool:
+        """파일 끝에 레코드 추가 (이미 있으면 False, 쓰기 오류는 기록만 하고 False)"""
+        key_bytes = key.encode('utf-8')
+        body = key_bytes + value
+        record = self.RECORD_HEADER.pack(len(body), zlib.crc32(body), len(key_bytes)) + body
+
+        with self._lock:
+            try:
+                fcntl.flock(self._file, fcntl.LOCK_EX)
+                try:
+                    self._refresh_index()
+                    if key in self._index:
+                        return False
+
+                    # 비정상 종료로 잘린 레코드가 끝에 남아 있으면 잘라내고 그 자리에 추가
+                    if os.fstat(self._file.fileno()).st_size > self._indexed_size:
+                        self._file.truncate(self._indexed_size)
+                    self._file.seek(self._indexed_size)
+                    self._file.write(record)
+                    self._file.flush()
+                finally:
+                    fcntl.flock(self._file, fcntl.LOCK_UN)
+
+                self._refresh_index()
+            except OSError as e:
+                self.stats['errors'] += 1
+                logger.error("경계 저장소 쓰기 오류 (%s): %s", key, e)
+                return False
+
+        self.stats['writes'] += 1
+        return True
+
+    def close(self):
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            self._file.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """저장소 조회 통계"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] / lookups * 100) if lookups > 0 else 0
+
+        return {
+            "path": self.path,
+            "version": self.version,
+            "stored_regions": len(self._index),
+            "file_size_mb": round(self._indexed_size / (1024 * 1024), 2),
+            "hits": self.stats['hits'],
+            "misses": self.stats['misses'],
+            "hit_rate": f"{hit_rate:.2f}%",
+            "writes": self.stats['writes'],
+            "errors": self.stats['errors']
+        }
+
+    def reset_stats(self):
+        """통계 초기화"""
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'errors': 0
+        }
+
+# 전역 변수: 디스크 경계 저장소 (BOUNDARY_STORE_ENABLED=true이면 앱 시작 시 열림)
+boundary_store: Optional[BoundaryStore] = None
+
+@app.on_event("startup")
+async def open_boundary_store():
+    """BOUNDARY_STORE_ENABLED=true이면 현재 BOUNDARY_DATA_VERSION의 경계 저장소를 엽니다 (레코드 위치만 색인)"""
+    global boundary_store
+    if not BOUNDARY_STORE_ENABLED:
+        return
+
+    path = get_boundary_store_path(BOUNDARY_STORE_DIR, BOUNDARY_DATA_VERSION)
+    try:
+        boundary_store = await asyncio.to_thread(BoundaryStore, path, BOUNDARY_DATA_VERSION)
+        logger.info("✓ 경계 저장소 열기: %s (경계 %s개)", path, len(boundary_store))
+    except Exception as e:
+        logger.error("경계 저장소 열기 실패 (%s): %s. 경계는 RPC로 조회합니다.", path, e)
+
+@app.on_event("shutdown")
+async def close_boundary_store():
+    """경계 저장소 파일 닫기"""
+    if boundary_store is not None:
+        boundary_store.close()
+
+def select_boundary_payload(payload: Optional[BoundaryPayload], request: Request) -> Optional[BoundaryPayload]:
+    """요청이 델타 인코딩을 원하면(쿼리 플래그 또는 Accept 헤더) 델타 형식 항목 선택"""
+    if payload is None or payload.delta is None:
+        return payload
+
+    wants_delta = (
+        request.query_params.get('boundary_encoding') == 'delta' or
+        BOUNDARY_DELTA_MEDIA_TYPE in request.headers.get('accept', '')
+    )
+    return payload.delta if wants_delta else payload
+
+# 분석 결과 캐시 설정 (/analyze)
+ANALYSIS_CACHE_MAX_ITEMS = int(os.getenv("ANALYSIS_CACHE_MAX_ITEMS", "2000"))
+ANALYSIS_CACHE_MAX_MB = float(os.getenv("ANALYSIS_CACHE_MAX_MB", "10"))
+ANALYSIS_COORD_PRECISION = 6  # 좌표 반올림 자릿수 (소수점 6자리 ≈ 0.1m)
+ANALYSIS_RADIUS_PRECISION = 1  # 반지름 반올림 자릿수 (0.1m)
+REGION_BATCH_MAX_ITEMS = int(os.getenv("REGION_BATCH_MAX_ITEMS", "1000"))  # /getRegionPop/batch 요청당 최대 지역 수 (하위 지역 확장 후)
+REGION_BATCH_QUERY_CHUNK = 200  # 한 번의 in 쿼리로 조회할 region_cd 수 (URL 길이 제한)
+ANALYSIS_BATCH_MAX_ITEMS = int(os.getenv("ANALYSIS_BATCH_MAX_ITEMS", "100"))  # /analyze/batch 요청당 최대 도형 수
+ANALYSIS_BATCH_CONCURRENCY = int(os.getenv("ANALYSIS_BATCH_CONCURRENCY", "8"))  # 배치 요청당 동시 분석 수
+
+# 전역 변수: 분석 결과 캐시 (정규화된 도형 키 → PopulationResult JSON 바이트)
+analysis_cache = LRUByteCache(
+    'analysis',
+    max_items=ANALYSIS_CACHE_MAX_ITEMS,
+    max_bytes=int(ANALYSIS_CACHE_MAX_MB * 1024 * 1024)
+)
+analysis_flight = SingleFlight('analysis')  # 분석 캐시 키 → 분석 실행
+
+# 병원 상세 정보 캐시 설정 (/getHospitalDetail)
+HOSPITAL_DETAIL_CACHE_TTL_SECONDS = int(os.getenv("HOSPITAL_DETAIL_CACHE_TTL_SECONDS", "3600"))
+HOSPITAL_DETAIL_CACHE_MAX_ITEMS = int(os.getenv("HOSPITAL_DETAIL_CACHE_MAX_ITEMS", "10000"))
+HOSPITAL_DETAIL_CACHE_MAX_MB = float(os.getenv("HOSPITAL_DETAIL_CACHE_MAX_MB", "20"))
+HOSPITAL_DETAIL_QUERY_CHUNK = 50  # 한 번의 in 쿼리로 조회할 ykiho 수 (URL 길이 제한)
+HOSPITAL_DETAIL_BATCH_MAX = 200  # 일괄 조회 요청당 최대 ykiho 수
+
+# 병원 검색 타일 캐시 설정 (/getHospitals)
+# 지도 영역을 웹 지도 표준 타일(z/x/y)로 나누어 타일 단위로 조회/캐시
+HOSPITAL_TILE_CACHE_TTL_SECONDS = int(os.getenv("HOSPITAL_TILE_CACHE_TTL_SECONDS", "3600"))
+HOSPITAL_TILE_CACHE_MAX_ITEMS = int(os.getenv("HOSPITAL_TILE_CACHE_MAX_ITEMS", "20000"))
+HOSPITAL_TILE_CACHE_MAX_MB = float(os.getenv("HOSPITAL_TILE_CACHE_MAX_MB", "100"))
+HOSPITAL_TILE_MIN_ZOOM = 10  # 이보다 넓은 영역은 타일로 나누지 않고 직접 조회
+HOSPITAL_TILE_MAX_ZOOM = 14  # 좁은 영역도 이 줌의 타일 사용 (캐시 재사용률)
+HOSPITAL_CLUSTER_MAX_ZOOM = int(os.getenv("HOSPITAL_CLUSTER_MAX_ZOOM", "12"))  # 요청 zoom이 이 값 이하면 클러스터로 응답 (12 = 카카오맵 레벨 8)
+HOSPITAL_CLUSTER_MIN_SIZE = int(os.getenv("HOSPITAL_CLUSTER_MIN_SIZE", "3"))  # 병원 수가 이 값 이하인 셀은 원본 행으로 반환
+HOSPITAL_CLUSTER_MIN_ZOOM = 5  # 클러스터 타일 최소 줌 (이보다 넓게 보면 5줌 타일로 집계)
+HOSPITAL_CLUSTER_MAX_PAGES = int(os.getenv("HOSPITAL_CLUSTER_MAX_PAGES", "5"))  # 인덱스 없이 클러스터 타일 하나를 집계할 때 조회할 최대 RPC 페이지 수
+HOSPITAL_CLUSTER_CELL_ZOOM_OFFSET = 2  # 클러스터 셀 = (타일 줌 + 2) 타일 (256px 타일을 4x4로 나눈 약 64px 셀)
+HOSPITAL_INDEX_ENABLED = os.getenv("HOSPITAL_INDEX_ENABLED", "false").lower() == "true"  # 병원 검색을 메모리 인덱스로 처리
+HOSPITAL_INDEX_REFRESH_SECONDS = int(os.getenv("HOSPITAL_INDEX_REFRESH_SECONDS", "21600"))  # 인덱스 재적재 주기 (초, 기본 6시간)
+HOSPITAL_INDEX_BUCKET_DEGREES = 0.01  # 인덱스 버킷 크기 (경위도, 약 1km)
+HOSPITAL_STREAM_PAGE_SIZE = 1000  # 스트리밍 모드에서 넓은 영역 RPC를 나눠 조회할 페이지 크기 (PostgREST max-rows 이하)
+HOSPITAL_NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+# 전역 변수: 병원 검색 타일 캐시 ("{z}/{x}/{y}:{진료과목}:{전문의 필터}" → 병원 목록)
+hospital_tile_cache = LRUByteCache(
+    'hospital_tile',
+    max_items=HOSPITAL_TILE_CACHE_MAX_ITEMS,
+    max_bytes=int(HOSPITAL_TILE_CACHE_MAX_MB * 1024 * 1024),
+    ttl_seconds=HOSPITAL_TILE_CACHE_TTL_SECONDS
+)
+hospital_tile_flight = SingleFlight('hospital_tile')  # 타일/클러스터 캐시 키 → 타일 조회
+
+# 전역 변수: 병원 상세 정보 캐시 (ykiho → 상세 정보 JSON 바이트)
+hospital_detail_cache = LRUByteCache(
+    'hospital_detail',
+    max_items=HOSPITAL_DETAIL_CACHE_MAX_ITEMS,
+    max_bytes=int(HOSPITAL_DETAIL_CACHE_MAX_MB * 1024 * 1024),
+    ttl_seconds=HOSPITAL_DETAIL_CACHE_TTL_SECONDS
+)
+hospital_detail_flight = SingleFlight('hospital_detail')  # 조회할 ykiho 묶음 → 상세 정보 조회
+
+# 인구 통계 캐시 설정 (census_region은 연 1회 수준으로만 갱신됨)
+CENSUS_CACHE_TTL_SECONDS = int(os.getenv("CENSUS_CACHE_TTL_SECONDS", "86400"))  # 기본 24시간
+CENSUS_DATA_VERSION = os.getenv("CENSUS_DATA_VERSION", "")  # 데이터 릴리스 버전 (변경 시 캐시 무효화)
+CENSUS_PRELOAD = os.getenv("CENSUS_PRELOAD", "false").lower() == "true"  # 시작 시 전체 지역 일괄 로드
+CENSUS_PRELOAD_PAGE_SIZE = 1000  # PostgREST 기본 최대 행 수
+
+# census_region 연령대 컬럼 (PopulationResult.age_distribution 키 순서)
+AGE_GROUPS = ['10세 미만', '10대', '20대', '30대', '40대', '50대', '60대', '70대', '80대', '90대', '100세 이상']
+
+def convert_census_row(census_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    census_region 행을 PopulationResult 형식(연령별 인구, 총 인구, 총 가구)으로 변환합니다.
+
+    Note: census_region 테이블 컬럼은 "10세 미만" ~ "100세 이상" 연령 범위 컬럼입니다
+    (일부 데이터는 "10세미만", "100세이상"처럼 공백이 없음)
+    """
+    age_distribution = {
+        age_group: int(census_data.get(age_group, census_data.get(age_group.replace(' ', ''), 0)))
+        for age_group in AGE_GROUPS
+    }
+
+    return {
+        'age_distribution': age_distribution,
+        'total_population': int(census_data.get('pop', census_data.get('총인구수', 0))),
+        'total_households': int(census_data.get('households', census_data.get('총가구수', 0)))
+    }
+
+class CensusCache:
+    """
+    인구 통계 캐시 (region_cd → 변환된 연령별 인구/총계)
+
+    - TTL: CENSUS_CACHE_TTL_SECONDS가 지난 항목은 다음 조회 시 DB에서 다시 가져옴
+    - 버전: CENSUS_DATA_VERSION이 바뀌면 기존 항목을 모두 무효화
+    - 일괄 로드: preload()로 전체 지역(~3.8k)을 몇 번의 페이지 쿼리로 미리 적재
+    """
+
+    def __init__(self, ttl_seconds: int, version: str = ""):
+        self.ttl_seconds = ttl_seconds
+        self.version = version
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}  # region_cd → (만료 시각, 데이터)
+        self.last_preload_at: Optional[datetime] = None
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'preloaded': 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, region_cd: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회 (없거나 만료되었으면 None)"""
+        entry = self._entries.get(region_cd)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+
+        expires_at, data = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[region_cd]
+            self.stats['expired'] += 1
+            self.stats['misses'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        return data
+
+    def set(self, region_cd: str, data: Dict[str, Any]):
+        """변환된 인구 통계 저장"""
+        self._entries[region_cd] = (time.monotonic() + self.ttl_seconds, data)
+
+    def set_version(self, version: str):
+        """데이터 버전 변경 시 전체 무효화"""
+        if version != self.version:
+            logger.info("인구 통계 데이터 버전 변경: %s → %s, 캐시 무효화", self.version or '-', version or '-')
+            self.version = version
+            self.clear()
+
+    def clear(self) -> int:
+        """캐시 전체 삭제 (삭제된 항목 수 반환)"""
+        cleared_count = len(self._entries)
+        self._entries.clear()
+        return cleared_count
+
+    async def preload(self, gateway: 'SupabaseGateway', page_size: int = CENSUS_PRELOAD_PAGE_SIZE) -> int:
+        """census_region 전체를 페이지 단위로 조회하여 캐시에 적재합니다 (적재된 지역 수 반환)"""
+        loaded = 0
+        offset = 0
+
+        while True:
+            result = await gateway.execute(
+                gateway.table('census_region')
+                    .select('*')
+                    .order('region_cd')
+                    .range(offset, offset + page_size - 1),
+                'census_region'
+            )
+            rows = result.data or []
+
+            for row in rows:
+                self.set(str(row['region_cd']), convert_census_row(row))
+            loaded += len(rows)
+
+            if len(rows) < page_size:
+                break
+            offset += page_size
+
+        self.stats['preloaded'] = loaded
+        self.last_preload_at = datetime.now()
+        return loaded
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] / lookups * 100) if lookups > 0 else 0
 
-def evict_lru_cache():
-    """LRU 방식으로 가장 오래된 캐시 항목 삭제"""
-    global boundary_cache, cache_stats
-
-    if len(boundary_cache) > 0:
-        # OrderedDict의 첫 번째 항목 (가장 오래된 항목) 삭제
-        oldest_key = next(iter(boundary_cache))
-        del boundary_cache[oldest_key]
-        cache_stats['evictions'] += 1
-        logger.info(f"✓ LRU 캐시 삭제: {oldest_key} (총 {len(boundary_cache)}개 남음)")
-
-def get_cache_memory_usage():
-    """캐시 메모리 사용량 추정 (MB)"""
-    total_size = sys.getsizeof(boundary_cache)
-    for key, value in boundary_cache.items():
-        total_size += sys.getsizeof(key) + sys.getsizeof(value)
-    return total_size / (1024 * 1024)  # MB로 변환
-
-def check_cache_limits():
-    """캐시 제한 확인 및 자동 정리"""
-    global boundary_cache
-
-    # 항목 수 제한
-    while len(boundary_cache) >= MAX_CACHE_SIZE:
-        logger.warning(f"캐시 항목 수 제한 도달: {len(boundary_cache)}/{MAX_CACHE_SIZE}")
-        evict_lru_cache()
-
-    # 메모리 제한 (선택적)
-    memory_mb = get_cache_memory_usage()
-    if memory_mb > MAX_CACHE_MEMORY_MB:
-        logger.warning(f"캐시 메모리 제한 도달: {memory_mb:.2f}MB/{MAX_CACHE_MEMORY_MB}MB")
-        # 10% 정도 삭제
-        items_to_remove = max(1, len(boundary_cache) // 10)
-        for _ in range(items_to_remove):
-            evict_lru_cache()
+        return {
+            "cache_hits": self.stats['hits'],
+            "cache_misses": self.stats['misses'],
+            "expired": self.stats['expired'],
+            "hit_rate": f"{hit_rate:.2f}%",
+            "cached_items": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+            "data_version": self.version,
+            "preload_enabled": CENSUS_PRELOAD,
+            "preloaded_items": self.stats['preloaded'],
+            "last_preload_at": self.last_preload_at.isoformat() if self.last_preload_at else None
+        }
+
+    def reset_stats(self):
+        """통계 초기화 (적재 정보는 유지)"""
+        self.stats.update({'hits': 0, 'misses': 0, 'expired': 0})
+
+census_cache = CensusCache(CENSUS_CACHE_TTL_SECONDS, CENSUS_DATA_VERSION)
+census_flight = SingleFlight('census')  # region_cd (또는 in 쿼리 코드 묶음) → census_region 조회
 
 # 로깅 설정 (CORS보다 먼저 설정하여 로그 출력 가능)
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()  # text 또는 json
+LOG_QUEUE_ENABLED = os.getenv("LOG_QUEUE_ENABLED", "true").lower() == "true"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
+def parse_log_sample_rates(value: str) -> List[Tuple[str, float]]:
+    """'/getHospitals=0.1,/getRegionPop=0.2' → [(경로 접두사, 비율)] (긴 접두사 우선)"""
+    rates = []
+    for item in value.split(','):
+        prefix, sep, rate = item.strip().partition('=')
+        if sep:
+            rates.append((prefix.strip().rstrip('/'), float(rate)))
+    return sorted(rates, key=lambda item: len(item[0]), reverse=True)
+
+LOG_SAMPLE_RATES = parse_log_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
+# 현재 요청의 ID와 INFO 이하 로그 기록 여부 (요청 밖의 작업은 '-' / 항상 기록)
+current_request_id: contextvars.ContextVar[str] = contextvars.ContextVar('current_request_id', default='-')
+current_log_sampled: contextvars.ContextVar[bool] = contextvars.ContextVar('current_log_sampled', default=True)
+
+def get_log_sample_rate(path: str) -> float:
+    """요청 경로의 INFO 이하 로그 샘플링 비율 (LOG_SAMPLE_RATES에 없으면 LOG_SAMPLE_RATE)"""
+    for prefix, rate in LOG_SAMPLE_RATES:
+        if path == prefix or path.startswith(prefix + '/'):
+            return rate
+    return LOG_SAMPLE_RATE
+
+class RequestContextFilter(logging.Filter):
+    """
+    로그 레코드에 요청 ID를 붙이고, 샘플링에서 제외된 요청의 INFO 이하 로그를 버립니다 (WARNING 이상은 항상 기록)
+
+    핸들러 필터는 로그를 호출한 스레드에서 실행되므로 요청의 contextvars를 읽을 수 있습니다.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING and not current_log_sampled.get():
+            return False
+        record.request_id = current_request_id.get()
+        return True
+
+class JsonLogFormatter(logging.Formatter):
+    """한 줄 JSON 로그 (LOG_FORMAT=json, 로그 수집기용)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'request_id': getattr(record, 'request_id', '-'),
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    메시지 포맷팅과 출력을 리스너 스레드로 넘기는 QueueHandler
+
+    기본 QueueHandler는 큐에 넣기 전에 메시지를 포맷팅하지만, 같은 프로세스 안의 큐이므로 레코드를 그대로 넘기고
+    포맷팅은 리스너 스레드에서 합니다. 따라서 로그 인자는 이후에 바뀌지 않는 값(문자열, 숫자, PayloadSummary)이어야 합니다.
+    큐가 가득 차면 요청을 막지 않도록 레코드를 버리고 개수만 셉니다.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class PayloadSummary:
+    """
+    로그용 페이로드 요약 (전체 내용 대신 형식과 크기만 출력)
+
+    실제로 로그가 출력될 때만 __str__이 호출되므로 샘플링으로 버려진 로그는 비용이 거의 없습니다.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: Any):
+        self.data = data
+
+    def __str__(self) -> str:
+        data = self.data
+        if data is None:
+            return 'None'
+        if isinstance(data, (str, bytes, bytearray)):
+            return f"{type(data).__name__} {len(data) / 1024:.1f}KB"
+        if isinstance(data, (list, tuple)):
+            return f"{type(data).__name__}[{len(data)}]"
+        if isinstance(data, dict):
+            keys = ', '.join(str(key) for key in list(data)[:5])
+            return f"dict({len(data)}: {keys}{', ...' if len(data) > 5 else ''})"
+        return type(data).__name__
+
+def setup_logging() -> Optional[DeferredQueueHandler]:
+    """
+    루트 로거 설정 (LOG_QUEUE_ENABLED=true면 큐 핸들러 + 백그라운드 리스너 스레드)
+
+    이미 루트 핸들러가 있으면(다른 진입점에서 설정) 그대로 둡니다 (logging.basicConfig와 같은 동작).
+    """
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    if root.handlers:
+        return None
+
+    stream_handler = logging.StreamHandler()
+    if LOG_FORMAT == 'json':
+        stream_handler.setFormatter(JsonLogFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter('%(levelname)s:%(name)s:[%(request_id)s] %(message)s'))
+
+    if not LOG_QUEUE_ENABLED:
+        stream_handler.addFilter(RequestContextFilter())
+        root.addHandler(stream_handler)
+        return None
+
+    queue_handler = DeferredQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    queue_handler.addFilter(RequestContextFilter())
+    root.addHandler(queue_handler)
+
+    def start_listener():
+        # 종료 시 큐에 남은 로그까지 출력
+        listener = logging.handlers.QueueListener(queue_handler.queue, stream_handler)
+        listener.start()
+        atexit.register(listener.stop)
+
+    def restart_listener_after_fork():
+        # 스레드는 fork 후 자식 프로세스에 복제되지 않고, 기존 큐에는 부모 리스너의 대기 상태가 남아 있으므로
+        # fork된 워커(gunicorn --preload)에서는 새 큐와 리스너를 사용
+        queue_handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+        start_listener()
+
+    start_listener()
+    os.register_at_fork(after_in_child=restart_listener_after_fork)
+    return queue_handler
+
+# 전역 변수: 로그 큐 핸들러 (큐를 사용하지 않으면 None)
+log_queue_handler = setup_logging()
+
+# 지연 시간 지표 설정 (/metrics, Prometheus 히스토그램 버킷 경계, 초)
+METRICS_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 현재 처리 중인 요청의 ASGI scope (단계별 지표의 endpoint 레이블, 요청 밖의 작업은 None)
+current_request_scope: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar('current_request_scope', default=None)
+
+def get_endpoint_label(scope: Optional[dict]) -> str:
+    """지표 endpoint 레이블 (경로 변수 대신 라우트 템플릿 사용, 요청 밖의 작업은 background)"""
+    if scope is None:
+        return 'background'
+    route = scope.get('route')
+    if route is not None:
+        return route.path
+    return '/static' if scope.get('path', '').startswith('/static/') else 'unmatched'
+
+class LatencyMetrics:
+    """
+    지연 시간 히스토그램 모음 (워커별 누적)
+
+    시리즈마다 버킷별 개수(누적 아님, 마지막 칸은 +Inf)와 합계만 보관하여 기록 비용은 O(log 버킷 수)입니다.
+    snapshot()은 JSON으로 공유할 수 있는 형식이며, 여러 워커의 스냅샷은 merge()로 합산합니다.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], List[float]] = {}  # (이름, 레이블) → 버킷 개수 + [합계]
+
+    def observe(self, name: str, seconds: float, **labels: str):
+        """소요 시간 한 건 기록"""
+        key = (name, tuple(sorted(labels.items())))
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, seconds)] += 1
+        series[-1] += seconds
+
+    @contextmanager
+    def measure(self, stage: str):
+        """현재 요청 endpoint의 단계 소요 시간 기록 (hrp_stage_duration_seconds)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(
+                'hrp_stage_duration_seconds',
+                time.perf_counter() - started,
+                endpoint=get_endpoint_label(current_request_scope.get()),
+                stage=stage
+            )
+
+    def reset(self):
+        """기록된 지표 전체 삭제"""
+        self._series.clear()
+
+    def snapshot(self) -> List[list]:
+        """[이름, 레이블, 버킷 개수 + 합계] 목록"""
+        return [[name, dict(labels), list(series)] for (name, labels), series in self._series.items()]
+
+    @staticmethod
+    def merge(snapshots: List[List[list]]) -> Dict[Tuple[str, Tuple[Tuple[str, str], ...]], List[float]]:
+        """여러 워커의 스냅샷을 시리즈별로 합산"""
+        merged: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], List[float]] = {}
+        for snapshot in snapshots:
+            for name, labels, series in snapshot:
+                key = (name, tuple(sorted(labels.items())))
+                total = merged.get(key)
+                if total is None:
+                    merged[key] = list(series)
+                else:
+                    for i, value in enumerate(series):
+                        total[i] += value
+        return merged
+
+# 전역 변수: 이 워커의 지연 시간 지표
+metrics = LatencyMetrics(METRICS_LATENCY_BUCKETS)
+
+class MetricsMiddleware:
+    """요청별 소요 시간을 기록하고, 단계별 지표가 endpoint 레이블을 찾을 수 있도록 요청 scope를 공유합니다"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        token = current_request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            current_request_scope.reset(token)
+            metrics.observe(
+                'hrp_request_duration_seconds',
+                time.perf_counter() - started,
+                endpoint=get_endpoint_label(scope),
+                method=scope['method'],
+                status=str(status)
+            )
+
+app.add_middleware(MetricsMiddleware)
+
+def is_valid_request_id(value: str) -> bool:
+    """클라이언트/프록시가 보낸 요청 ID를 로그에 그대로 써도 되는지 (영숫자와 -_. 만, 최대 64자)"""
+    return 0 < len(value) <= 64 and value.isascii() and all(c.isalnum() or c in '-_.' for c in value)
+
+class RequestContextMiddleware:
+    """
+    요청 ID와 로그 샘플링 여부를 요청 범위에 설정합니다
+
+    요청 ID는 X-Request-ID 헤더(nginx 등 앞단에서 전달)를 사용하고 없으면 생성하며, 응답 헤더로 돌려줍니다.
+    샘플링 여부는 요청 시작 시 한 번 정하므로 한 요청의 로그는 모두 기록되거나 모두 생략됩니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope['headers']:
+            if name == b'x-request-id':
+                request_id = value.decode('latin-1')
+                break
+        if request_id is None or not is_valid_request_id(request_id):
+            request_id = uuid.uuid4().hex[:16]
+        header = (b'x-request-id', request_id.encode('latin-1'))
+
+        async def send_with_request_id(message):
+            if message['type'] == 'http.response.start':
+                message = {**message, 'headers': [*message.get('headers', []), header]}
+            await send(message)
+
+        id_token = current_request_id.set(request_id)
+        sampled_token = current_log_sampled.set(random.random() < get_log_sample_rate(scope['path']))
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            current_log_sampled.reset(sampled_token)
+            current_request_id.reset(id_token)
+
+app.add_middleware(RequestContextMiddleware)
 
 # CORS 설정 - 환경 변수에서 허용 도메인 로드
 allowed_origins_env = os.getenv("ALLOWED_ORIGINS", "*")
@@ -91,6 +1629,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
 
 # 환경 변수에서 Supabase 설정 로드
@@ -102,10 +1641,125 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     logger.error("SUPABASE_URL 및 SUPABASE_KEY 환경 변수가 설정되지 않았습니다")
     raise ValueError("SUPABASE_URL 및 SUPABASE_KEY 환경 변수가 필요합니다. .env 파일을 확인하세요.")
 
-logger.info(f"Supabase URL: {SUPABASE_URL}")
-logger.info("Supabase 클라이언트 초기화 완료")
+logger.info("Supabase URL: %s", SUPABASE_URL)
+
+# Supabase 호출 설정 (동시 실행 수 제한, 호출별 타임아웃)
+SUPABASE_MAX_CONCURRENCY = int(os.getenv("SUPABASE_MAX_CONCURRENCY", "20"))
+SUPABASE_TIMEOUT_SECONDS = float(os.getenv("SUPABASE_TIMEOUT_SECONDS", "30"))
+SUPABASE_ERROR_WINDOW_SECONDS = 60  # /readyz에 보고하는 최근 호출 오류율 집계 구간
+
+class RecentOutcomeCounter:
+    """최근 window_seconds 동안의 성공/실패 수 (1초 단위 버킷, 기록 O(1))"""
+
+    def __init__(self, window_seconds: int):
+        self.window_seconds = window_seconds
+        self._buckets = deque()  # [초, 성공 수, 실패 수]
+        self.last_success_at: Optional[float] = None  # 마지막 성공 시각 (time.monotonic())
+
+    def _trim(self, now: int):
+        while self._buckets and self._buckets[0][0] <= now - self.window_seconds:
+            self._buckets.popleft()
+
+    def record(self, ok: bool):
+        if ok:
+            self.last_success_at = time.monotonic()
+        now = int(time.monotonic())
+        if not self._buckets or self._buckets[-1][0] != now:
+            self._trim(now)
+            self._buckets.append([now, 0, 0])
+        self._buckets[-1][1 if ok else 2] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._trim(int(time.monotonic()))
+        ok = sum(bucket[1] for bucket in self._buckets)
+        errors = sum(bucket[2] for bucket in self._buckets)
+        return {
+            "window_seconds": self.window_seconds,
+            "calls": ok + errors,
+            "errors": errors,
+            "error_rate": f"{(errors / (ok + errors) * 100) if ok + errors > 0 else 0:.2f}%"
+        }
+
+class SupabaseGateway:
+    """
+    Supabase 비동기 데이터 접근 계층
+
+    동기 클라이언트의 execute()는 이벤트 루프를 막기 때문에 AsyncClient를 사용합니다.
+    - 커넥션 재사용: 프로세스당 하나의 AsyncClient(httpx 커넥션 풀)를 공유
+    - 동시성 제한: 세마포어로 동시에 실행되는 쿼리 수를 SUPABASE_MAX_CONCURRENCY로 제한
+    - 타임아웃: 호출마다 SUPABASE_TIMEOUT_SECONDS 초과 시 TimeoutError 발생
+    - 최근 오류율: 최근 SUPABASE_ERROR_WINDOW_SECONDS 동안의 호출 성공/실패 수 (/readyz)
+    """
+
+    def __init__(self, url: str, key: str, max_concurrency: int, timeout: float):
+        self.url = url
+        self.key = key
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.client: Optional[AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.recent_outcomes = RecentOutcomeCounter(SUPABASE_ERROR_WINDOW_SECONDS)
+
+    async def connect(self):
+        """AsyncClient 생성 (워커 프로세스의 이벤트 루프 안에서 호출해야 함)"""
+        if self.client is None:
+            self.client = await acreate_client(self.url, self.key)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            logger.info("Supabase 비동기 클라이언트 초기화 완료 (동시 실행 %s개, 타임아웃 %s초)",
+                        self.max_concurrency, self.timeout)
+
+    async def close(self):
+        """커넥션 풀 정리"""
+        if self.client is not None:
+            await self.client.postgrest.aclose()
+            self.client = None
+
+    def table(self, name: str):
+        """테이블 쿼리 빌더 반환 (execute()로 실행)"""
+        return self.client.table(name)
+
+    async def execute(self, query, label: str):
+        """
+        쿼리 빌더를 동시성 제한과 타임아웃을 적용하여 실행합니다.
+
+        Args:
+            query: postgrest 쿼리 빌더 (table(...) 또는 rpc(...) 결과)
+            label: 로그/오류 메시지에 사용할 이름 (테이블명 또는 RPC 함수명)
+
+        Raises:
+            TimeoutError: 호출이 SUPABASE_TIMEOUT_SECONDS 안에 끝나지 않은 경우
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        세마포어 대기 시간(supabase_wait 단계)과 호출 시간(hrp_supabase_duration_seconds)을 따로 기록합니다.
+        """
+        endpoint = get_endpoint_label(current_request_scope.get())
+        queued = time.perf_counter()
+        async with self._semaphore:
+            started = time.perf_counter()
+            metrics.observe('hrp_stage_duration_seconds', started - queued, endpoint=endpoint, stage='supabase_wait')
+
+            outcome = 'error'
+            try:
+                result = await asyncio.wait_for(query.execute(), timeout=self.timeout)
+                outcome = 'ok'
+                return result
+            except asyncio.TimeoutError:
+                outcome = 'timeout'
+                raise TimeoutError(f"Supabase 호출 시간 초과: {label} ({self.timeout}초)")
+            finally:
+                self.recent_outcomes.record(outcome == 'ok')
+                metrics.observe(
+                    'hrp_supabase_duration_seconds',
+                    time.perf_counter() - started,
+                    endpoint=endpoint,
+                    target=label,
+                    outcome=outcome
+                )
+
+    async def rpc(self, fn: str, params: dict):
+        """RPC 함수 호출"""
+        return await self.execute(self.client.rpc(fn, params), fn)
+
+db = SupabaseGateway(SUPABASE_URL, SUPABASE_KEY, SUPABASE_MAX_CONCURRENCY, SUPABASE_TIMEOUT_SECONDS)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -141,6 +1795,10 @@ class DrawingObject(BaseModel):
             raise ValueError('type은 circle 또는 polygon이어야 합니다')
         return v
 
+class BatchAnalysisRequest(BaseModel):
+    # 항목별로 검증하여 잘못된 도형(객체가 아닌 값 포함)이 있어도 나머지는 분석 (DrawingObject 형식)
+    objects: List[Any]
+
 class Centroid(BaseModel):
     """중심점 좌표 (WGS84)"""
     lng: float  # 경도
@@ -177,31 +1835,154 @@ class RegionData(BaseModel):
     sigungu: Optional[str] = None
     dong: Optional[str] = None
     level: str  # "sido", "sigungu", "dong"
+    zoom: Optional[int] = None  # 경계를 표시할 지도 줌 (없으면 원본 해상도)
+
+class RegionBatchRequest(BaseModel):
+    regions: List[RegionData]  # 조회할 행정구역 목록
+    expand_children: bool = False  # true면 각 지역 대신 바로 아래 레벨의 하위 지역 전체를 조회
+    include_boundary: bool = False  # true면 각 지역의 경계도 함께 반환
+    zoom: Optional[int] = None  # 경계 단순화 줌 (include_boundary일 때)
 
-# 앱 시작 이벤트: korea_admin_codes.json 로드
+# 앱 시작/종료 이벤트: Supabase 비동기 클라이언트 연결
 @app.on_event("startup")
-async def load_region_codes():
-    """앱 시작 시 행정구역 코드 데이터를 로드합니다"""
-    global korea_admin_codes
+async def connect_database():
+    """앱 시작 시 Supabase 비동기 클라이언트를 생성합니다"""
+    await db.connect()
+
+@app.on_event("shutdown")
+async def close_database():
+    """앱 종료 시 Supabase 커넥션 풀을 정리합니다"""
+    await db.close()
+
+class RegionNode(NamedTuple):
+    """행정구역 노드"""
+    cd: str  # 행정구역 코드
+    name: str  # 행정구역 이름
+    level: str  # 'sido', 'sigungu', 'dong'
+    parent_cd: Optional[str]  # 상위 행정구역 코드 (sido는 None)
+
+REGION_LEVELS = ('sido', 'sigungu', 'dong')
+
+class RegionIndex:
+    """
+    행정구역 계층 인덱스 (불변, 해시 기반 조회)
+
+    korea_admin_codes.json을 앱 시작 시 한 번만 인덱싱하여 요청 간 공유합니다.
+    - (parent_cd, 이름) → 코드: 계층 조회 O(1) (중복 이름은 상위 코드로 구분)
+    - 코드 → 노드: 역방향 조회 (코드 → sido/sigungu/dong 경로)
+    - 코드 → 하위 노드 목록: 하위 행정구역 열거
+    """
+
+    def __init__(self, admin_codes: Dict[str, List[Dict[str, str]]]):
+        nodes: Dict[str, RegionNode] = {}
+        codes_by_name: Dict[Tuple[Optional[str], str], str] = {}
+        children: Dict[Optional[str], List[RegionNode]] = {}
+
+        for level in REGION_LEVELS:
+            for item in admin_codes[level]:
+                node = RegionNode(
+                    cd=item['cd'],
+                    name=item['name'],
+                    level=level,
+                    parent_cd=item.get('parent_cd')
+                )
+                nodes[node.cd] = node
+                codes_by_name[(node.parent_cd, node.name)] = node.cd
+                children.setdefault(node.parent_cd, []).append(node)
+
+        self._nodes = MappingProxyType(nodes)
+        self._codes_by_name = MappingProxyType(codes_by_name)
+        self._children = MappingProxyType({cd: tuple(items) for cd, items in children.items()})
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def count(self, level: str) -> int:
+        """레벨별 행정구역 수"""
+        return sum(1 for node in self._nodes.values() if node.level == level)
+
+    def find_code(self, name: str, parent_cd: Optional[str] = None) -> Optional[str]:
+        """상위 코드 + 이름으로 행정구역 코드 조회 (sido는 parent_cd=None)"""
+        return self._codes_by_name.get((parent_cd, name))
+
+    def get_node(self, cd: str) -> Optional[RegionNode]:
+        """코드로 행정구역 노드 조회"""
+        return self._nodes.get(cd)
+
+    def get_path(self, cd: str) -> Tuple[RegionNode, ...]:
+        """코드의 전체 경로 (sido → sigungu → dong 순서), 없는 코드면 빈 튜플"""
+        path = []
+        node = self._nodes.get(cd)
+        while node is not None:
+            path.append(node)
+            node = self._nodes.get(node.parent_cd) if node.parent_cd else None
+        return tuple(reversed(path))
+
+    def get_children(self, cd: Optional[str]) -> Tuple[RegionNode, ...]:
+        """하위 행정구역 목록 (cd=None이면 전체 sido 목록)"""
+        return self._children.get(cd, ())
+
+def load_region_index():
+    """행정구역 코드 데이터를 로드하고 계층 인덱스를 생성합니다 (이미 로드되었으면 건너뜀)"""
+    global korea_admin_codes, region_index, region_lookup_service
+    if region_index is not None:
+        return
+
     try:
         korea_admin_codes_path = os.path.join("static", "korea_admin_codes.json")
         with open(korea_admin_codes_path, 'r', encoding='utf-8') as f:
             korea_admin_codes = json.load(f)
-        logger.info(f"행정구역 코드 데이터 로드 완료: sido {len(korea_admin_codes['sido'])}개, "
-                   f"sigungu {len(korea_admin_codes['sigungu'])}개, "
-                   f"dong {len(korea_admin_codes['dong'])}개")
+
+        region_index = RegionIndex(korea_admin_codes)
+        region_lookup_service = RegionLookupService(region_index)
+
+        logger.info("행정구역 코드 데이터 로드 완료: sido %s개, sigungu %s개, dong %s개",
+                   region_index.count('sido'), region_index.count('sigungu'), region_index.count('dong'))
     except Exception as e:
-        logger.error(f"행정구역 코드 데이터 로드 실패: {str(e)}")
+        logger.error("행정구역 코드 데이터 로드 실패: %s", e)
         raise
 
+# 앱 시작 이벤트: korea_admin_codes.json 로드 (gunicorn --preload면 fork 전에 로드된 인덱스 사용)
+@app.on_event("startup")
+async def load_region_codes():
+    """앱 시작 시 행정구역 코드 데이터를 로드하고 계층 인덱스를 생성합니다"""
+    load_region_index()
+
+async def refresh_census_cache_periodically():
+    """census_region 전체를 적재하고 TTL이 끝나기 전에 주기적으로 다시 적재합니다"""
+    # TTL의 90% 주기로 갱신하여 만료로 인한 DB 조회가 요청 경로에서 발생하지 않도록 함
+    refresh_interval = max(60, CENSUS_CACHE_TTL_SECONDS * 0.9)
+
+    while True:
+        try:
+            started = time.monotonic()
+            loaded = await census_cache.preload(db)
+            logger.info("인구 통계 일괄 로드 완료: %s개 지역 (%.2f초)", loaded, time.monotonic() - started)
+        except Exception as e:
+            logger.error("인구 통계 일괄 로드 실패: %s", e)
+        await asyncio.sleep(refresh_interval)
+
+census_preload_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def preload_census_cache():
+    """CENSUS_PRELOAD=true이면 백그라운드에서 인구 통계를 일괄 로드합니다"""
+    global census_preload_task
+    if CENSUS_PRELOAD:
+        census_preload_task = asyncio.create_task(refresh_census_cache_periodically())
+
+@app.on_event("shutdown")
+async def stop_census_preload():
+    """인구 통계 갱신 작업 중지"""
+    if census_preload_task is not None:
+        census_preload_task.cancel()
+
 # 서비스 클래스
 class RegionLookupService:
-    """행정구역 계층 조회 서비스"""
+    """행정구역 계층 조회 서비스 (RegionIndex 기반)"""
 
-    def __init__(self):
-        self.admin_codes = korea_admin_codes
-        if not self.admin_codes:
-            raise ValueError("행정구역 코드 데이터가 로드되지 않았습니다")
+    def __init__(self, index: RegionIndex):
+        self.index = index
 
     def find_region_code(self, sido: str, sigungu: Optional[str], dong: Optional[str], level: str) -> str:
         """
@@ -221,99 +2002,626 @@ class RegionLookupService:
             ValueError: 지역을 찾을 수 없는 경우
         """
         # 1단계: sido 코드 찾기
-        sido_code = None
-        for sido_item in self.admin_codes['sido']:
-            if sido_item['name'] == sido:
-                sido_code = sido_item['cd']
-                break
-
+        sido_code = self.index.find_code(sido)
         if not sido_code:
             raise ValueError(f"시/도를 찾을 수 없습니다: {sido}")
 
         # sido 레벨이면 sido 코드 반환
         if level == 'sido':
-            logger.info(f"지역 코드 조회 완료: {sido} = {sido_code}")
+            logger.debug("지역 코드 조회 완료: %s = %s", sido, sido_code)
             return sido_code
 
-        # 2단계: sigungu 코드 찾기
+        # 2단계: sigungu 코드 찾기 (parent_cd가 sido_code와 일치해야 함)
         if not sigungu:
             raise ValueError(f"시/군/구 이름이 필요합니다 (level: {level})")
 
-        sigungu_code = None
-        for sigungu_item in self.admin_codes['sigungu']:
-            # 이름이 일치하고 parent_cd가 sido_code와 일치해야 함
-            if sigungu_item['name'] == sigungu and sigungu_item['parent_cd'] == sido_code:
-                sigungu_code = sigungu_item['cd']
-                break
-
+        sigungu_code = self.index.find_code(sigungu, sido_code)
         if not sigungu_code:
             raise ValueError(f"시/군/구를 찾을 수 없습니다: {sido} > {sigungu}")
 
         # sigungu 레벨이면 sigungu 코드 반환
         if level == 'sigungu':
-            logger.info(f"지역 코드 조회 완료: {sido} > {sigungu} = {sigungu_code}")
+            logger.debug("지역 코드 조회 완료: %s > %s = %s", sido, sigungu, sigungu_code)
             return sigungu_code
 
-        # 3단계: dong 코드 찾기
+        # 3단계: dong 코드 찾기 (parent_cd가 sigungu_code와 일치해야 함)
         if not dong:
             raise ValueError(f"행정동 이름이 필요합니다 (level: {level})")
 
-        dong_code = None
-        for dong_item in self.admin_codes['dong']:
-            # 이름이 일치하고 parent_cd가 sigungu_code와 일치해야 함
-            if dong_item['name'] == dong and dong_item['parent_cd'] == sigungu_code:
-                dong_code = dong_item['cd']
-                break
-
+        dong_code = self.index.find_code(dong, sigungu_code)
         if not dong_code:
             raise ValueError(f"행정동을 찾을 수 없습니다: {sido} > {sigungu} > {dong}")
 
-        logger.info(f"지역 코드 조회 완료: {sido} > {sigungu} > {dong} = {dong_code}")
+        logger.debug("지역 코드 조회 완료: %s > %s > %s = %s", sido, sigungu, dong, dong_code)
         return dong_code
 
+    def get_region_path(self, region_code: str) -> Dict[str, str]:
+        """
+        행정구역 코드로 전체 경로를 조회합니다 (역방향 조회).
+
+        Returns:
+            {'sido': ..., 'sigungu': ..., 'dong': ..., 'level': ...} (해당 레벨까지만 포함)
+
+        Raises:
+            ValueError: 코드를 찾을 수 없는 경우
+        """
+        path = self.index.get_path(region_code)
+        if not path:
+            raise ValueError(f"행정구역 코드를 찾을 수 없습니다: {region_code}")
+
+        result = {node.level: node.name for node in path}
+        result['level'] = path[-1].level
+        return result
+
+    def get_children(self, region_code: Optional[str]) -> List[RegionNode]:
+        """하위 행정구역 목록을 조회합니다 (region_code=None이면 전체 시/도)"""
+        return list(self.index.get_children(region_code))
+
+def get_region_lookup_service() -> RegionLookupService:
+    """앱 시작 시 생성된 공유 RegionLookupService 반환"""
+    if region_lookup_service is None:
+        raise ValueError("행정구역 코드 데이터가 로드되지 않았습니다")
+    return region_lookup_service
+
+# 격자 인구 분석 엔진 설정
+# rpc: analyze_hospital_service_area RPC (기본)
+# local: 로컬 격자 스냅샷으로 서버 프로세스 안에서 계산 (DB 왕복 없음)
+# shadow: RPC 결과를 반환하면서 로컬 계산 결과와 비교하여 차이를 로그로 기록
+ANALYSIS_ENGINE = os.getenv("ANALYSIS_ENGINE", "rpc").lower()
+GRID_SNAPSHOT_PATH = os.getenv("GRID_SNAPSHOT_PATH", "data/grid_snapshot.npz")
+GRID_OVERLAP_CHUNK_ELEMENTS = 250_000  # (격자, 변) 쌍을 한 번에 계산할 개수 (메모리 상한)
+GRID_INDEX_BUCKET_METERS = 1000  # 공간 인덱스 버킷 크기 (1km = 100m 격자 10×10)
+GRID_UNION_SAMPLES_PER_SIDE = 10  # 여러 도형의 경계가 함께 지나는 격자의 합집합 비율 추정용 표본 (10×10점)
+# shadow 모드 비교 설정: 비교할 요청 비율 (0~1), 워커당 동시에 실행하는 비교 작업 수 (초과분은 비교하지 않고 건너뜀)
+SHADOW_SAMPLE_RATE = min(1.0, max(0.0, float(os.getenv("SHADOW_SAMPLE_RATE", "1.0"))))
+SHADOW_MAX_CONCURRENCY = max(1, int(os.getenv("SHADOW_MAX_CONCURRENCY", "2")))
+
+# EPSG:5179 (Korea 2000 / Unified CS) 횡메르카토르 투영 상수 (GRS80 타원체)
+EPSG5179_A = 6378137.0
+EPSG5179_F = 1 / 298.257222101
+EPSG5179_LAT0 = 38.0
+EPSG5179_LON0 = 127.5
+EPSG5179_K0 = 0.9996
+EPSG5179_FALSE_EASTING = 1_000_000.0
+EPSG5179_FALSE_NORTHING = 2_000_000.0
+
+def _transverse_mercator_coefficients() -> Tuple[float, float, List[float]]:
+    """Krüger 급수 계수 (n⁶까지, 오차 1mm 미만)"""
+    n = EPSG5179_F / (2 - EPSG5179_F)
+    rectifying_radius = EPSG5179_A / (1 + n) * (1 + n ** 2 / 4 + n ** 4 / 64 + n ** 6 / 256)
+    alpha = [
+        n / 2 - 2 * n ** 2 / 3 + 5 * n ** 3 / 16 + 41 * n ** 4 / 180 - 127 * n ** 5 / 288 + 7891 * n ** 6 / 37800,
+        13 * n ** 2 / 48 - 3 * n ** 3 / 5 + 557 * n ** 4 / 1440 + 281 * n ** 5 / 630 - 1983433 * n ** 6 / 1935360,
+        61 * n ** 3 / 240 - 103 * n ** 4 / 140 + 15061 * n ** 5 / 26880 + 167603 * n ** 6 / 181440,
+        49561 * n ** 4 / 161280 - 179 * n ** 5 / 168 + 6601661 * n ** 6 / 7257600,
+        34729 * n ** 5 / 80640 - 3418889 * n ** 6 / 1995840,
+        212378941 * n ** 6 / 319334400
+    ]
+    eccentricity = math.sqrt(EPSG5179_F * (2 - EPSG5179_F))
+    return rectifying_radius, eccentricity, alpha
+
+def wgs84_to_epsg5179(lng: Any, lat: Any) -> Tuple[Any, Any]:
+    """
+    WGS84 경위도 → EPSG:5179 좌표 (미터, numpy 배열 입력)
+
+    PostGIS ST_Transform(…, 5179)와 같은 횡메르카토르 투영입니다 (Korea 2000 측지계는 WGS84와 동일하게 취급).
+    """
+    rectifying_radius, eccentricity, alpha = _transverse_mercator_coefficients()
+
+    def gauss_schreiber(phi, dlam):
+        sin_phi = np.sin(phi)
+        t = np.sinh(np.arctanh(sin_phi) - eccentricity * np.arctanh(eccentricity * sin_phi))
+        xi_prime = np.arctan2(t, np.cos(dlam))
+        eta_prime = np.arctanh(np.sin(dlam) / np.sqrt(1 + t * t))
+        xi, eta = xi_prime.copy(), eta_prime.copy()
+        for j, coefficient in enumerate(alpha, start=1):
+            xi = xi + coefficient * np.sin(2 * j * xi_prime) * np.cosh(2 * j * eta_prime)
+            eta = eta + coefficient * np.cos(2 * j * xi_prime) * np.sinh(2 * j * eta_prime)
+        return xi, eta
+
+    xi0, _ = gauss_schreiber(np.radians(np.array([EPSG5179_LAT0])), np.zeros(1))
+    xi, eta = gauss_schreiber(
+        np.radians(np.asarray(lat, dtype=np.float64)),
+        np.radians(np.asarray(lng, dtype=np.float64) - EPSG5179_LON0)
+    )
+
+    x = EPSG5179_FALSE_EASTING + EPSG5179_K0 * rectifying_radius * eta
+    y = EPSG5179_FALSE_NORTHING + EPSG5179_K0 * rectifying_radius * (xi - xi0[0])
+    return x, y
+
+def _concatenate_ranges(starts: Any, ends: Any) -> Any:
+    """[starts[i], ends[i]) 구간들을 이어 붙인 인덱스 배열"""
+    counts = ends - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return offsets + np.arange(total)
+
+def box_overlap_areas(box_x0: Any, box_y0: Any, box_x1: Any, box_y1: Any, ring: Any) -> Any:
+    """
+    사각형들과 다각형의 겹친 면적 (사각형별, 제곱미터)
+
+    반시계 방향 다각형 P와 사각형 R = [x0, x1] × [y0, y1]에 대해
+    area(P ∩ R) = -Σ_변 ∫ (clamp(y, y0, y1) - y0) dx  (각 변을 x 범위 [x0, x1]로 잘라서 적분)
+    이며, x 범위가 겹치지 않는 변은 0이므로 사각형마다 x 범위가 겹치는 변만 골라 (사각형, 변) 쌍으로 계산합니다.
+
+    Args:
+        box_x0, box_y0, box_x1, box_y1: 사각형 좌표 배열
+        ring: 닫힌 반시계 방향 링 (k+1, 2) 배열
+    """
+    xa, ya = ring[:-1, 0], ring[:-1, 1]
+    xb, yb = ring[1:, 0], ring[1:, 1]
+    dx = xb - xa
+    slope = np.divide(yb - ya, dx, out=np.zeros_like(dx), where=dx != 0)
+    edge_min_x = np.minimum(xa, xb)
+    edge_max_x = np.maximum(xa, xb)
+
+    # 같은 x 범위(열)의 사각형은 같은 변 목록을 공유
+    columns, column_of_box = np.unique(np.column_stack([box_x0, box_x1]), axis=0, return_inverse=True)
+    column_of_box = column_of_box.ravel()
+    column_edges = (edge_min_x < columns[:, 1:2]) & (edge_max_x > columns[:, 0:1])
+    _, pair_edges = np.nonzero(column_edges)
+    column_counts = column_edges.sum(axis=1)
+    column_starts = np.cumsum(column_counts) - column_counts
+
+    areas = np.zeros(len(box_x0), dtype=np.float64)
+    chunk = max(1, GRID_OVERLAP_CHUNK_ELEMENTS // max(1, int(column_counts.max(initial=0))))
+
+    for start in range(0, len(box_x0), chunk):
+        boxes = np.arange(start, min(start + chunk, len(box_x0)))
+        box_columns = column_of_box[boxes]
+        box_pairs = column_counts[box_columns]
+        if box_pairs.sum() == 0:
+            continue
+
+        pair_box = np.repeat(np.arange(len(boxes)), box_pairs)
+        edges = pair_edges[_concatenate_ranges(column_starts[box_columns], column_starts[box_columns] + box_pairs)]
+        x0 = box_x0[boxes][pair_box]
+        x1 = box_x1[boxes][pair_box]
+        y0 = box_y0[boxes][pair_box]
+        y1 = box_y1[boxes][pair_box]
+
+        # 변을 사각형의 x 범위로 자른 구간과 양 끝의 y
+        edge_xa, edge_xb, edge_ya, edge_slope = xa[edges], xb[edges], ya[edges], slope[edges]
+        clipped_xa = np.clip(edge_xa, x0, x1)
+        clipped_xb = np.clip(edge_xb, x0, x1)
+        clipped_ya = edge_ya + (clipped_xa - edge_xa) * edge_slope
+        clipped_yb = edge_ya + (clipped_xb - edge_xa) * edge_slope
+
+        # 구간 위에서 clamp(y, y0, y1) - y0 의 평균 (y는 선형이므로 y0 아래/위/사이 비율로 계산)
+        low = np.minimum(clipped_ya, clipped_yb)
+        high = np.maximum(clipped_ya, clipped_yb)
+        span = high - low
+        has_span = span > 0
+        below = np.divide(y0 - low, span, out=(low < y0).astype(np.float64), where=has_span).clip(0, 1)
+        above = np.divide(high - y1, span, out=(high > y1).astype(np.float64), where=has_span).clip(0, 1)
+        middle = np.clip(1 - below - above, 0, 1)
+        middle_mean = (np.clip(low, y0, y1) + np.clip(high, y0, y1)) / 2 - y0
+        mean_height = above * (y1 - y0) + middle * middle_mean
+
+        areas[boxes] = -np.bincount(
+            pair_box, weights=(clipped_xb - clipped_xa) * mean_height, minlength=len(boxes)
+        )
+
+    return areas
+
+def points_in_ring(point_x: Any, point_y: Any, ring: Any) -> Any:
+    """점들이 닫힌 링 안에 있는지 (교차 횟수 판정, 점 × 변 배열을 나누어 계산)"""
+    xa, ya = ring[:-1, 0], ring[:-1, 1]
+    xb, yb = ring[1:, 0], ring[1:, 1]
+    inside = np.zeros(len(point_x), dtype=bool)
+    chunk = max(1, GRID_OVERLAP_CHUNK_ELEMENTS // len(xa))
+
+    for start in range(0, len(point_x), chunk):
+        px = point_x[start:start + chunk, None]
+        py = point_y[start:start + chunk, None]
+        crosses = (ya > py) != (yb > py)
+        dy = np.where(crosses, yb - ya, 1.0)
+        crossing_x = xa + (py - ya) * (xb - xa) / dy
+        inside[start:start + chunk] = (crosses & (px < crossing_x)).sum(axis=1) % 2 == 1
+
+    return inside
+
+class UniformGridIndex:
+    """
+    균일 버킷 격자 공간 인덱스 (CSR 형식)
+
+    점을 bucket_size 크기의 정사각형 버킷으로 묶고 버킷 ID(행 우선) 순서로 정렬합니다.
+    같은 행의 연속된 버킷은 정렬된 배열에서도 연속 구간이므로, 사각형 범위 조회는
+    행마다 이진 탐색 두 번으로 끝납니다. 점 배열은 order로 재배열해서 사용합니다.
+    """
+
+    def __init__(self, x: Any, y: Any, bucket_size: float):
+        self.bucket_size = float(bucket_size)
+        self.origin_x = math.floor(float(x.min()) / self.bucket_size) * self.bucket_size if len(x) else 0.0
+        self.origin_y = math.floor(float(y.min()) / self.bucket_size) * self.bucket_size if len(y) else 0.0
+
+        bucket_columns = ((x - self.origin_x) // self.bucket_size).astype(np.int64)
+        bucket_rows = ((y - self.origin_y) // self.bucket_size).astype(np.int64)
+        self.columns = int(bucket_columns.max()) + 1 if len(x) else 1
+        self.rows = int(bucket_rows.max()) + 1 if len(y) else 1
+
+        ids = bucket_rows * self.columns + bucket_columns
+        self.order = np.argsort(ids, kind='stable')  # 원래 인덱스 → 버킷 순서 재배열
+        self.bucket_ids, self.bucket_starts = np.unique(ids[self.order], return_index=True)
+        self.bucket_ends = np.append(self.bucket_starts[1:], len(ids)).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.bucket_ids)
+
+    def query(self, x_min: float, y_min: float, x_max: float, y_max: float) -> Any:
+        """사각형 범위와 겹치는 (비어 있지 않은) 버킷 번호 배열"""
+        column_start = max(0, math.floor((x_min - self.origin_x) / self.bucket_size))
+        column_end = min(self.columns - 1, math.floor((x_max - self.origin_x) / self.bucket_size))
+        row_start = max(0, math.floor((y_min - self.origin_y) / self.bucket_size))
+        row_end = min(self.rows - 1, math.floor((y_max - self.origin_y) / self.bucket_size))
+        if column_start > column_end or row_start > row_end:
+            return np.empty(0, dtype=np.int64)
+
+        row_ids = np.arange(row_start, row_end + 1, dtype=np.int64) * self.columns
+        return _concatenate_ranges(
+            np.searchsorted(self.bucket_ids, row_ids + column_start, side='left'),
+            np.searchsorted(self.bucket_ids, row_ids + column_end, side='right')
+        )
+
+    def items(self, buckets: Any) -> Any:
+        """버킷들에 속한 점의 위치 배열 (order로 재배열한 배열 기준)"""
+        return _concatenate_ranges(self.bucket_starts[buckets], self.bucket_ends[buckets])
+
+def round_half_up(value: float) -> int:
+    """PostgreSQL round()와 같은 반올림 (0.5는 올림)"""
+    return int(math.floor(value + 0.5))
+
+class GridPopulationEngine:
+    """
+    로컬 격자 인구 분석 엔진 (analyze_hospital_service_area RPC와 같은 계산)
+
+    1. 도형을 EPSG:5179로 투영 (원은 ST_Buffer처럼 사분원당 segments개 선분의 다각형)
+    2. 도형과 겹치는 100m 격자를 찾고 겹친 면적 비율만큼 인구/가구 집계
+    3. parent_cd(1km 격자)별 인구를 grid_1km_age_ratio 비율로 연령별 인구로 분배 후 합산
+
+    격자는 1km 버킷 인덱스(UniformGridIndex)로 묶어 두고, 도형 안에 완전히 들어가는 버킷은
+    미리 계산한 버킷 합계를 그대로 더하며 도형 경계에 걸친 버킷의 격자만 겹친 면적을 계산합니다.
+    (연령별 인구는 격자별 인구 × 비율의 합과 같으므로 버킷 합계로 미리 계산 가능)
+
+    스냅샷(.npz)은 tools/build_grid_snapshot.py로 생성합니다.
+    """
+
+    def __init__(
+        self,
+        cell_x: Any,
+        cell_y: Any,
+        cell_size: float,
+        population: Any,
+        households: Any,
+        parent_index: Any,
+        age_labels: List[str],
+        age_ratios: Any,
+        version: str = ''
+    ):
+        cell_x = np.asarray(cell_x, dtype=np.float64)
+        cell_y = np.asarray(cell_y, dtype=np.float64)
+
+        # 격자 배열을 버킷 순서로 재배열 (버킷별 격자는 연속 구간)
+        self.index = UniformGridIndex(cell_x, cell_y, GRID_INDEX_BUCKET_METERS)
+        order = self.index.order
+        self.cell_x = cell_x[order]
+        self.cell_y = cell_y[order]
+        self.cell_size = float(cell_size)
+        self.population = np.asarray(population, dtype=np.float64)[order]
+        self.households = np.asarray(households, dtype=np.float64)[order]
+        self.parent_index = np.asarray(parent_index, dtype=np.int64)[order]
+        self.age_labels = list(age_labels)
+        self.age_ratios = np.asarray(age_ratios, dtype=np.float64).reshape(-1, len(self.age_labels))
+        self.version = version
+
+        # 버킷별 격자 범위와 인구/가구/연령별 인구 합계
+        starts = self.index.bucket_starts
+        self.bucket_x0 = np.minimum.reduceat(self.cell_x, starts)
+        self.bucket_y0 = np.minimum.reduceat(self.cell_y, starts)
+        self.bucket_x1 = np.maximum.reduceat(self.cell_x, starts) + self.cell_size
+        self.bucket_y1 = np.maximum.reduceat(self.cell_y, starts) + self.cell_size
+        self.cell_bucket = np.repeat(np.arange(len(self.index)), self.index.bucket_ends - starts)
+        self.bucket_population = np.add.reduceat(self.population, starts)
+        self.bucket_households = np.add.reduceat(self.households, starts)
+        self.bucket_age_population = self._bucket_age_population()
+
+        # analyze/compare는 asyncio.to_thread로 여러 스레드에서 실행되므로 카운터는 잠금으로 보호
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'analyses': 0,
+            'shadow_comparisons': 0,
+            'shadow_mismatches': 0,
+            'shadow_skipped': 0
+        }
+
+    @classmethod
+    def load(cls, path: str) -> 'GridPopulationEngine':
+        """스냅샷 파일(.npz) 로드"""
+        with np.load(path, allow_pickle=False) as snapshot:
+            return cls(
+                cell_x=snapshot['cell_x'],
+                cell_y=snapshot['cell_y'],
+                cell_size=float(snapshot['cell_size']),
+                population=snapshot['population'],
+                households=snapshot['households'],
+                parent_index=snapshot['parent_index'],
+                age_labels=[str(label) for label in snapshot['age_labels']],
+                age_ratios=snapshot['age_ratios'],
+                version=str(snapshot['version']) if 'version' in snapshot else ''
+            )
+
+    def _bucket_age_population(self) -> Any:
+        """버킷별 연령별 인구 합계 (버킷 × 연령 구간), (버킷, parent_cd) 쌍으로 묶어 계산"""
+        pairs, pair_of_cell = np.unique(
+            self.cell_bucket * len(self.age_ratios) + self.parent_index, return_inverse=True
+        )
+        pair_population = np.bincount(pair_of_cell.ravel(), weights=self.population, minlength=len(pairs))
+        pair_ages = pair_population[:, None] * self.age_ratios[pairs % len(self.age_ratios)]
+
+        bucket_ages = np.zeros((len(self.index), len(self.age_labels)), dtype=np.float64)
+        np.add.at(bucket_ages, pairs // len(self.age_ratios), pair_ages)
+        return bucket_ages
+
+    def _coverage(self, ring: Any) -> Tuple[Any, Any, Any]:
+        """
+        도형이 덮는 격자
+
+        Returns:
+            (도형 안에 완전히 들어가는 버킷 번호, 경계 버킷의 격자 위치, 각 격자의 겹친 면적 비율)
+        """
+        x_min, y_min = ring.min(axis=0)
+        x_max, y_max = ring.max(axis=0)
+
+        # 외곽 사각형과 겹치는 버킷을 도형 안/밖/경계로 분류
+        buckets = self.index.query(x_min - self.cell_size, y_min - self.cell_size, x_max, y_max)
+        bucket_overlap = box_overlap_areas(
+            self.bucket_x0[buckets], self.bucket_y0[buckets], self.bucket_x1[buckets], self.bucket_y1[buckets], ring
+        )
+        bucket_area = (self.bucket_x1[buckets] - self.bucket_x0[buckets]) * (self.bucket_y1[buckets] - self.bucket_y0[buckets])
+        inside = bucket_overlap >= bucket_area * (1 - 1e-9)
+        boundary = (bucket_overlap > 0) & ~inside
+
+        # 경계 버킷의 격자만 겹친 면적 비율 계산
+        cells = self.index.items(buckets[boundary])
+        cell_x = self.cell_x[cells]
+        cell_y = self.cell_y[cells]
+        fractions = np.clip(
+            box_overlap_areas(cell_x, cell_y, cell_x + self.cell_size, cell_y + self.cell_size, ring)
+            / (self.cell_size * self.cell_size),
+            0.0,
+            1.0
+        )
+        return buckets[inside], cells, fractions
+
+    def _summarize(self, inside_buckets: Any, cells: Any, fractions: Any) -> Tuple[float, float, Any]:
+        """완전히 덮인 버킷 합계 + 격자별 비율 가중 합계 → (인구, 가구, 연령별 인구)"""
+        weighted_population = self.population[cells] * fractions
+
+        # parent_cd별 인구 → 연령별 비율로 분배
+        parent_population = np.bincount(
+            self.parent_index[cells], weights=weighted_population, minlength=len(self.age_ratios)
+        )
+
+        return (
+            self.bucket_population[inside_buckets].sum() + weighted_population.sum(),
+            self.bucket_households[inside_buckets].sum() + (self.households[cells] * fractions).sum(),
+            self.bucket_age_population[inside_buckets].sum(axis=0) + parent_population @ self.age_ratios
+        )
+
+    def analyze(self, drawing_obj: 'DrawingObject') -> 'PopulationResult':
+        """도형의 인구 분석 결과 (CPU 작업이므로 asyncio.to_thread로 호출)"""
+        ring = self._project_shape(drawing_obj)
+        total_population, total_households, age_population = self._summarize(*self._coverage(ring))
+
+        self.increment_stat('analyses')
+
+        return PopulationResult(
+            total_population=round_half_up(total_population),
+            total_households=round_half_up(total_households),
+            age_distribution={
+                label: round_half_up(value) for label, value in zip(self.age_labels, age_population)
+            },
+            analysis_area_sqm=float(abs(self._signed_area(ring))),
+            shape_type=drawing_obj.type
+        )
+
+    def analyze_union(self, drawing_objs: List['DrawingObject']) -> Dict[str, Any]:
+        """
+        여러 도형의 합집합 영역 인구 (배치 분석용)
+
+        어느 한 도형이라도 완전히 덮는 격자는 1, 한 도형만 일부 덮는 격자는 그 비율을 그대로 사용하고,
+        여러 도형의 경계가 함께 지나는 격자만 10×10 표본점으로 합집합 비율을 추정합니다.
+        """
+        rings = [self._project_shape(drawing_obj) for drawing_obj in drawing_objs]
+        coverages = [self._coverage(ring) for ring in rings]
+
+        inside_buckets = np.unique(np.concatenate([coverage[0] for coverage in coverages]))
+        is_inside_bucket = np.zeros(len(self.index), dtype=bool)
+        is_inside_bucket[inside_buckets] = True
+
+        # 합집합에서 완전히 덮인 버킷의 격자는 제외하고 격자별로 도형들의 비율 모으기
+        cells = np.concatenate([coverage[1] for coverage in coverages])
+        fractions = np.concatenate([coverage[2] for coverage in coverages])
+        remaining = ~is_inside_bucket[self.cell_bucket[cells]] & (fractions > 0)
+        union_cells, cell_of_entry = np.unique(cells[remaining], return_inverse=True)
+        cell_of_entry = cell_of_entry.ravel()
+        fractions = fractions[remaining]
+
+        full = np.bincount(cell_of_entry, weights=fractions >= 1 - 1e-9, minlength=len(union_cells)) > 0
+        partial_count = np.bincount(cell_of_entry, minlength=len(union_cells))
+        union_fractions = np.zeros(len(union_cells), dtype=np.float64)
+        np.maximum.at(union_fractions, cell_of_entry, fractions)
+        union_fractions[full] = 1.0
+
+        ambiguous = ~full & (partial_count >= 2)
+        if ambiguous.any():
+            union_fractions[ambiguous] = self._sampled_union_fractions(union_cells[ambiguous], rings)
+
+        total_population, total_households, age_population = self._summarize(
+            inside_buckets, union_cells, union_fractions
+        )
+        return {
+            'total_population': round_half_up(total_population),
+            'total_households': round_half_up(total_households),
+            'age_distribution': {
+                label: round_half_up(value) for label, value in zip(self.age_labels, age_population)
+            }
+        }
+
+    def _sampled_union_fractions(self, cells: Any, rings: List[Any]) -> Any:
+        """격자 안 표본점 중 어느 한 도형에라도 포함된 점의 비율"""
+        samples = GRID_UNION_SAMPLES_PER_SIDE
+        offsets = (np.arange(samples) + 0.5) / samples * self.cell_size
+        point_x = (self.cell_x[cells][:, None] + np.tile(offsets, samples)[None, :]).ravel()
+        point_y = (self.cell_y[cells][:, None] + np.repeat(offsets, samples)[None, :]).ravel()
+
+        covered = np.zeros(len(point_x), dtype=bool)
+        for ring in rings:
+            uncovered = np.nonzero(~covered)[0]
+            covered[uncovered] = points_in_ring(point_x[uncovered], point_y[uncovered], ring)
+
+        return covered.reshape(len(cells), samples * samples).mean(axis=1)
+
+    def _project_shape(self, drawing_obj: 'DrawingObject') -> Any:
+        """도형 → EPSG:5179 닫힌 반시계 방향 링"""
+        if drawing_obj.type == 'circle':
+            data = drawing_obj.data
+            center_x, center_y = wgs84_to_epsg5179(np.array([data.center_lng]), np.array([data.center_lat]))
+            point_count = 4 * (data.segments or 32)
+            angles = np.arange(point_count) * (2 * math.pi / point_count)
+            x = center_x[0] + data.radius * np.cos(angles)
+            y = center_y[0] + data.radius * np.sin(angles)
+        else:
+            coordinates = np.asarray(drawing_obj.data.coordinates, dtype=np.float64)
+            x, y = wgs84_to_epsg5179(coordinates[:, 0], coordinates[:, 1])
+
+        ring = np.column_stack([x, y])
+        if not np.array_equal(ring[0], ring[-1]):
+            ring = np.vstack([ring, ring[:1]])
+        if self._signed_area(ring) < 0:
+            ring = ring[::-1]
+        return ring
+
+    @staticmethod
+    def _signed_area(ring: Any) -> float:
+        """닫힌 링의 부호 있는 면적 (반시계 방향이면 양수)"""
+        x, y = ring[:, 0], ring[:, 1]
+        return float((x[:-1] * y[1:] - x[1:] * y[:-1]).sum() / 2)
+
+    def compare(self, drawing_obj: 'DrawingObject', rpc_result: 'PopulationResult'):
+        """shadow 모드: RPC 결과와 로컬 계산 결과 비교 (차이가 있으면 경고 로그)"""
+        local_result = self.analyze(drawing_obj)
+        self.increment_stat('shadow_comparisons')
+
+        differences = {}
+        for field in ('total_population', 'total_households'):
+            if getattr(local_result, field) != getattr(rpc_result, field):
+                differences[field] = (getattr(rpc_result, field), getattr(local_result, field))
+        for label in set(rpc_result.age_distribution) | set(local_result.age_distribution):
+            rpc_value = rpc_result.age_distribution.get(label)
+            local_value = local_result.age_distribution.get(label)
+            if rpc_value != local_value:
+                differences[label] = (rpc_value, local_value)
+
+        if differences:
+            self.increment_stat('shadow_mismatches')
+            logger.warning("격자 엔진 결과 불일치 (%s, RPC → 로컬): %s", drawing_obj.type, differences)
+
+    def increment_stat(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return {
+            "version": self.version,
+            "cells": len(self.cell_x),
+            "parents": len(self.age_ratios),
+            **stats
+        }
+
+# 전역 변수: 로컬 격자 엔진 (ANALYSIS_ENGINE이 local/shadow일 때 앱 시작 시 로드)
+grid_engine = None
+shadow_comparison_tasks = set()  # 실행 중인 shadow 비교 작업 (가비지 컬렉션 방지, 최대 SHADOW_MAX_CONCURRENCY개)
+
+def schedule_shadow_comparison(drawing_obj: 'DrawingObject', rpc_result: 'PopulationResult'):
+    """
+    shadow 모드: RPC 결과와 로컬 계산 비교를 백그라운드에서 실행
+
+    SHADOW_SAMPLE_RATE 비율의 요청만 비교하고, 이미 SHADOW_MAX_CONCURRENCY개가 실행 중이면
+    기다리지 않고 건너뜁니다 (트래픽이 몰려도 비교 작업이 스레드 풀과 메모리를 계속 차지하지 않도록).
+    """
+    if SHADOW_SAMPLE_RATE < 1.0 and random.random() >= SHADOW_SAMPLE_RATE:
+        return
+    if len(shadow_comparison_tasks) >= SHADOW_MAX_CONCURRENCY:
+        grid_engine.increment_stat('shadow_skipped')
+        return
+
+    task = asyncio.create_task(asyncio.to_thread(grid_engine.compare, drawing_obj, rpc_result))
+    shadow_comparison_tasks.add(task)
+    task.add_done_callback(shadow_comparison_tasks.discard)
+
+def load_grid_snapshot():
+    """ANALYSIS_ENGINE이 local/shadow이면 격자 스냅샷을 로드합니다 (이미 로드되었으면 건너뜀)"""
+    global grid_engine
+
+    if ANALYSIS_ENGINE not in ('local', 'shadow') or grid_engine is not None:
+        return
+
+    if np is None:
+        logger.error("ANALYSIS_ENGINE=%s 설정에는 numpy가 필요합니다. RPC로 분석합니다.", ANALYSIS_ENGINE)
+        return
+
+    try:
+        grid_engine = GridPopulationEngine.load(GRID_SNAPSHOT_PATH)
+        logger.info("✓ 격자 스냅샷 로드 완료 (%s): %s, 격자 %s개, 1km 격자 %s개",
+                   ANALYSIS_ENGINE, GRID_SNAPSHOT_PATH, len(grid_engine.cell_x), len(grid_engine.age_ratios))
+    except Exception as e:
+        logger.error("격자 스냅샷 로드 실패 (%s): %s. RPC로 분석합니다.", GRID_SNAPSHOT_PATH, e)
+
+# 앱 시작 이벤트: 격자 스냅샷 로드 (gunicorn --preload면 fork 전에 로드된 스냅샷 사용)
+@app.on_event("startup")
+async def load_grid_engine():
+    await asyncio.to_thread(load_grid_snapshot)
+
+def load_static_data():
+    """
+    읽기 전용 정적 데이터(행정구역 코드 인덱스, 격자 스냅샷, 병원 인덱스)를 로드합니다
+
+    gunicorn.conf.py(preload_app)가 워커를 fork하기 전에 마스터 프로세스에서 호출하므로,
+    워커들은 JSON 파싱/스냅샷 로드를 다시 하지 않고 같은 메모리 페이지를 copy-on-write로 공유합니다.
+    """
+    load_region_index()
+    load_grid_snapshot()
+    load_hospital_index()
+    # fork 전 적재 중 기록된 지표(병원 인덱스 조회 등)가 워커마다 복제되어 중복 합산되지 않도록 비움
+    metrics.reset()
+
 # 서비스 클래스
 class SpatialAnalysisService:
     def __init__(self):
-        self.supabase = supabase
+        self.db = db
 
     async def process_drawing_object(self, drawing_obj: DrawingObject) -> PopulationResult:
-        """메인 분석 함수 호출"""
+        """메인 분석 함수 호출 (정규화된 도형 기준 결과 캐싱)"""
         try:
-            # 데이터 형식 변환
-            shape_data = self._convert_to_db_format(drawing_obj)
-
-            logger.info(f"분석 요청: {drawing_obj.type}, 데이터: {shape_data}")
-
-            # Supabase 함수 호출
-            result = self.supabase.rpc(
-                'analyze_hospital_service_area',
-                {
-                    'shape_type': drawing_obj.type,
-                    'shape_data': shape_data
-                }
-            ).execute()
-
-            logger.info(f"Supabase 응답: {result.data}")
-            logger.info(f"응답 데이터 타입: {type(result.data)}")
-
-            if result.data:
-                # Supabase RPC는 JSON 객체를 직접 반환
-                response_data = result.data
-                logger.info(f"응답 데이터: {response_data}")
-
-                if isinstance(response_data, dict):
-                    if response_data.get('error'):
-                        error_msg = response_data.get('message', '알 수 없는 오류')
-                        raise Exception(error_msg)
-                    else:
-                        return PopulationResult(**response_data)
-                else:
-                    raise Exception(f"예상치 못한 응답 형식: {type(response_data)} - {response_data}")
-            else:
-                raise Exception("빈 응답이 반환되었습니다")
+            # 캐시 확인 (같은 원/다각형을 다시 그린 경우 RPC 생략)
+            cache_key = self._make_cache_key(drawing_obj)
+            cached_result = analysis_cache.get(cache_key)
+            if cached_result is not None:
+                logger.debug("✓ 캐시에서 분석 결과 로드: %s", drawing_obj.type)
+                return PopulationResult.model_validate_json(cached_result)
+
+            # 같은 도형을 동시에 요청하면 분석은 한 번만 실행 (호출마다 결과 모델은 따로 생성)
+            with metrics.measure('analysis'):
+                serialized = await analysis_flight.do(cache_key, lambda: self._analyze(drawing_obj, cache_key))
+            return PopulationResult.model_validate_json(serialized)
 
         except Exception as e:
-            logger.error(f"분석 오류: {str(e)}")
+            logger.error("분석 오류: %s", e)
             return PopulationResult(
                 total_population=0,
                 total_households=0,
@@ -324,9 +2632,68 @@ class SpatialAnalysisService:
                 message=str(e)
             )
 
-    def _convert_to_db_format(self, drawing_obj: DrawingObject) -> dict:
-        """프론트엔드 데이터를 DB 함수 형식으로 변환"""
-        if drawing_obj.type == 'circle':
+    async def _analyze(self, drawing_obj: DrawingObject, cache_key: str) -> bytes:
+        """설정된 엔진으로 분석 후 결과를 캐시에 저장 (공유 캐시 우선, 직렬화된 JSON 바이트 반환)"""
+        shared_key = f"analysis:{cache_key}"
+        if shared_cache is not None:
+            serialized = await shared_cache.get(shared_key)
+            if serialized is not None:
+                analysis_cache.set(cache_key, serialized, len(serialized))
+                return serialized
+
+        if ANALYSIS_ENGINE == 'local' and grid_engine is not None:
+            # 로컬 격자 스냅샷으로 계산 (DB 왕복 없음)
+            population_result = await asyncio.to_thread(grid_engine.analyze, drawing_obj)
+        else:
+            population_result = await self._analyze_with_rpc(drawing_obj)
+
+            if ANALYSIS_ENGINE == 'shadow' and grid_engine is not None:
+                # 응답은 RPC 결과로 보내고, 로컬 계산 비교는 백그라운드에서 실행
+                schedule_shadow_comparison(drawing_obj, population_result)
+
+        # 정상 결과만 캐시에 저장 (직렬화된 JSON 바이트 크기로 메모리 계산)
+        serialized = population_result.model_dump_json().encode('utf-8')
+        analysis_cache.set(cache_key, serialized, len(serialized))
+        if shared_cache is not None:
+            await shared_cache.set(shared_key, serialized, CACHE_SHARED_TTL_SECONDS)
+        return serialized
+
+    async def _analyze_with_rpc(self, drawing_obj: DrawingObject) -> PopulationResult:
+        """analyze_hospital_service_area RPC로 분석 (오류 응답은 예외 발생)"""
+        # 데이터 형식 변환
+        shape_data = self._convert_to_db_format(drawing_obj)
+
+        logger.info("분석 요청: %s, 데이터: %s", drawing_obj.type, PayloadSummary(shape_data))
+
+        # Supabase 함수 호출
+        result = await self.db.rpc(
+            'analyze_hospital_service_area',
+            {
+                'shape_type': drawing_obj.type,
+                'shape_data': shape_data
+            }
+        )
+
+        logger.info("Supabase 응답: %s", PayloadSummary(result.data))
+
+        if result.data:
+            # Supabase RPC는 JSON 객체를 직접 반환
+            response_data = result.data
+
+            if isinstance(response_data, dict):
+                if response_data.get('error'):
+                    error_msg = response_data.get('message', '알 수 없는 오류')
+                    raise Exception(error_msg)
+                else:
+                    return PopulationResult(**response_data)
+            else:
+                raise Exception(f"예상치 못한 응답 형식: {type(response_data)} - {response_data}")
+        else:
+            raise Exception("빈 응답이 반환되었습니다")
+
+    def _convert_to_db_format(self, drawing_obj: DrawingObject) -> dict:
+        """프론트엔드 데이터를 DB 함수 형식으로 변환"""
+        if drawing_obj.type == 'circle':
             data = drawing_obj.data
             return {
                 'center_lng': data.center_lng,
@@ -339,10 +2706,50 @@ class SpatialAnalysisService:
                 'coordinates': drawing_obj.data.coordinates
             }
 
+    def _make_cache_key(self, drawing_obj: DrawingObject) -> str:
+        """
+        도형의 정규화된 캐시 키를 생성합니다.
+
+        - 원: 중심 좌표/반지름을 반올림하고 segments 포함
+        - 다각형: 좌표 반올림, 닫는 꼭짓점/연속 중복 제거, 반시계 방향으로 통일,
+          사전순으로 가장 작은 꼭짓점에서 시작하도록 회전
+        """
+        if drawing_obj.type == 'circle':
+            data = drawing_obj.data
+            canonical = [
+                'circle',
+                round(data.center_lng, ANALYSIS_COORD_PRECISION),
+                round(data.center_lat, ANALYSIS_COORD_PRECISION),
+                round(data.radius, ANALYSIS_RADIUS_PRECISION),
+                data.segments
+            ]
+        else:
+            points = []
+            for coord in drawing_obj.data.coordinates:
+                point = (round(coord[0], ANALYSIS_COORD_PRECISION), round(coord[1], ANALYSIS_COORD_PRECISION))
+                if not points or points[-1] != point:
+                    points.append(point)
+            if len(points) > 1 and points[0] == points[-1]:
+                points.pop()
+
+            # 신발끈 공식으로 방향 판별 (음수면 시계 방향 → 뒤집기)
+            signed_area = sum(
+                x1 * y2 - x2 * y1
+                for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1])
+            )
+            if signed_area < 0:
+                points.reverse()
+
+            start = points.index(min(points))
+            canonical = ['polygon', points[start:] + points[:start]]
+
+        return json.dumps(canonical, separators=(',', ':'))
+
     async def get_region_boundary(
         self,
         region_code: str,
-        level: str
+        level: str,
+        zoom: Optional[int] = None
     ) -> Optional[BoundaryCoordinates]:
         """
         행정구역 경계 좌표 및 중심점을 조회하여 WGS84로 변환 (캐싱 적용)
@@ -350,94 +2757,130 @@ class SpatialAnalysisService:
         Args:
             region_code: 행정구역 코드
             level: 'sido', 'sigungu', 'dong'
+            zoom: 표시할 지도 줌 (지정 시 해당 줌에 맞게 단순화된 경계)
 
         Returns:
             BoundaryCoordinates (경계 좌표 + 중심점) 또는 None (경계 데이터가 없는 경우)
         """
-        global boundary_cache, cache_stats
+        payload = await self.get_region_boundary_payload(region_code, level, zoom)
+        if payload is None:
+            return None
+        return BoundaryCoordinates.model_validate_json(payload.json)
+
+    async def get_region_boundary_payload(
+        self,
+        region_code: str,
+        level: str,
+        zoom: Optional[int] = None
+    ) -> Optional[BoundaryPayload]:
+        """
+        행정구역 경계를 응답에 그대로 삽입할 수 있는 JSON 바이트로 조회 (캐싱 적용)
 
+        캐시 히트 시 모델 재구성이나 재직렬화 없이 캐시된 바이트를 반환합니다.
+        캐시 미스로 원본 경계를 가져오면 모든 LOD 단계를 함께 계산하여 캐시에 저장합니다.
+
+        Returns:
+            BoundaryPayload 또는 None (경계 데이터가 없는 경우)
+        """
         try:
-            # 캐시 키 생성
-            cache_key = f"{level}:{region_code}"
-            cache_stats['total_requests'] += 1
-
-            # 캐시 확인
-            if cache_key in boundary_cache:
-                cache_stats['hits'] += 1
-                logger.info(f"✓ 캐시에서 경계 데이터 로드: {cache_key}")
-
-                # LRU: 접근한 항목을 맨 뒤로 이동 (최근 사용으로 표시)
-                cached_data = boundary_cache[cache_key]
-                boundary_cache.move_to_end(cache_key)
-
-                return BoundaryCoordinates(**cached_data)
-
-            cache_stats['misses'] += 1
-            logger.info(f"경계 조회 요청 (캐시 미스): {region_code}, level: {level}")
-
-            # Supabase RPC 함수 호출
-            result = self.supabase.rpc(
-                'get_region_boundary_wgs84',
-                {
-                    'p_region_code': region_code,
-                    'p_level': level
-                }
-            ).execute()
+            # 줌에 해당하는 LOD 단계
+            lod = get_boundary_lod(zoom)
+            cache_key = get_boundary_cache_key(region_code, level)
 
-            logger.info(f"경계 조회 응답: {result.data}")
+            # 캐시 확인 (LRU: 접근한 항목은 최근 사용으로 표시됨)
+            cached_payloads = boundary_cache.get(cache_key)
+            if cached_payloads is not None:
+                logger.debug("✓ 캐시에서 경계 데이터 로드: %s (LOD %s)", cache_key, lod)
+                return cached_payloads[lod]
 
-            if result.data:
-                # GeoJSON 형식 데이터 + 중심점을 BoundaryCoordinates로 변환
-                geojson_data = result.data
-
-                # 필수 필드 검증
-                if (isinstance(geojson_data, dict) and
-                    'type' in geojson_data and
-                    'coordinates' in geojson_data and
-                    'centroid' in geojson_data):
-
-                    centroid_data = geojson_data['centroid']
-
-                    # 중심점 데이터 검증
-                    if isinstance(centroid_data, dict) and 'lng' in centroid_data and 'lat' in centroid_data:
-                        boundary_data = BoundaryCoordinates(
-                            type=geojson_data['type'],
-                            coordinates=geojson_data['coordinates'],
-                            centroid=Centroid(
-                                lng=centroid_data['lng'],
-                                lat=centroid_data['lat']
-                            )
-                        )
-
-                        # 캐시 제한 확인 및 자동 정리
-                        check_cache_limits()
-
-                        # 캐시에 저장
-                        boundary_cache[cache_key] = boundary_data.dict()
-                        logger.info(f"✓ 경계 데이터를 캐시에 저장: {cache_key} (총 {len(boundary_cache)}개)")
-
-                        return boundary_data
-                    else:
-                        logger.warning(f"중심점 데이터 형식 오류: {centroid_data}")
-                        return None
-                else:
-                    logger.warning(f"예상치 못한 응답 형식: {geojson_data}")
-                    return None
-            else:
-                logger.warning(f"경계 데이터가 없습니다: {region_code}")
-                return None
+            logger.info("경계 조회 요청 (캐시 미스): %s, level: %s", region_code, level)
+
+            # 같은 지역을 동시에 요청하면 RPC와 LOD 계산은 한 번만 실행
+            payloads = await boundary_flight.do(
+                (region_code, level), lambda: self._load_region_boundary(region_code, level)
+            )
+            return payloads[lod] if payloads is not None else None
 
         except Exception as e:
-            logger.error(f"경계 조회 오류: {str(e)}")
+            logger.error("경계 조회 오류: %s", e)
+            return None
+
+    async def _load_region_boundary(self, region_code: str, level: str) -> Optional[Dict[int, BoundaryPayload]]:
+        """
+        원본 경계를 RPC로 조회해 모든 LOD 단계를 계산하고 캐시에 저장
+        (디스크 경계 저장소 → 공유 캐시 순으로 확인하여 있으면 RPC 생략)
+
+        Returns:
+            LOD → BoundaryPayload 또는 None (경계 데이터가 없는 경우)
+        """
+        store_key = get_boundary_cache_key(region_code, level)
+        if boundary_store is not None:
+            stored_value = boundary_store.get(store_key)
+            if stored_value is not None:
+                payloads = unpack_boundary_payloads(stored_value)
+                self._cache_boundary_payloads(region_code, level, payloads)
+                logger.info("✓ 디스크 경계 저장소에서 로드: %s", store_key)
+                return payloads
+
+        shared_key = f"boundary:{BOUNDARY_DATA_VERSION}:{level}:{region_code}"
+        if shared_cache is not None:
+            shared_value = await shared_cache.get(shared_key)
+            if shared_value is not None:
+                payloads = unpack_boundary_payloads(shared_value)
+                self._cache_boundary_payloads(region_code, level, payloads)
+                if boundary_store is not None:
+                    await asyncio.to_thread(boundary_store.put, store_key, shared_value)
+                logger.info("✓ 공유 캐시에서 경계 데이터 로드: %s:%s", level, region_code)
+                return payloads
+
+        # Supabase RPC 함수 호출
+        result = await self.db.rpc(
+            'get_region_boundary_wgs84',
+            {
+                'p_region_code': region_code,
+                'p_level': level
+            }
+        )
+
+        logger.info("경계 조회 응답: %s", PayloadSummary(result.data))
+
+        boundary_data = parse_region_boundary(result.data)
+        if boundary_data is None:
+            logger.warning("경계 데이터가 없습니다: %s", region_code)
             return None
 
+        # 원본 + 모든 LOD 단계를 계산 (CPU 작업이므로 이벤트 루프 밖에서 실행)
+        with metrics.measure('boundary_lod_build'):
+            payloads = await asyncio.to_thread(build_boundary_payloads, boundary_data)
+
+        self._cache_boundary_payloads(region_code, level, payloads)
+        if shared_cache is not None or boundary_store is not None:
+            packed = pack_boundary_payloads(payloads)
+            if shared_cache is not None:
+                await shared_cache.set(shared_key, packed, CACHE_SHARED_TTL_SECONDS)
+            if boundary_store is not None:
+                await asyncio.to_thread(boundary_store.put, store_key, packed)
+        logger.info("✓ 경계 데이터를 캐시에 저장: %s:%s (LOD %d단계, 캐시 %d개 지역)",
+                    level, region_code, len(payloads), len(boundary_cache))
+
+        return payloads
+
+    @staticmethod
+    def _cache_boundary_payloads(region_code: str, level: str, payloads: Dict[Optional[int], BoundaryPayload]):
+        """원본 + LOD 단계를 한 항목으로 메모리 캐시에 저장 (중첩 float 리스트 대신 JSON 바이트로 저장, 초과분은 LRU 삭제)"""
+        boundary_cache.set(
+            get_boundary_cache_key(region_code, level),
+            payloads,
+            sum(payload.size for payload in payloads.values())
+        )
+
     async def test_connection(self) -> dict:
         """연결 테스트"""
         try:
-            result = self.supabase.rpc('test_coordinate_conversion', {
+            result = await self.db.rpc('test_coordinate_conversion', {
                 'lng': 126.9780,
                 'lat': 37.5665
-            }).execute()
+            })
             return {'status': 'success', 'data': result.data}
         except Exception as e:
             return {'status': 'error', 'message': str(e)}
@@ -452,69 +2895,68 @@ class SpatialAnalysisService:
         Returns:
             PopulationResult: 연령별 인구 분포, 총 인구수, 가구수, 경계 좌표(WGS84) 등
         """
+        result, boundary_payload = await self.process_region_data_with_payload(region_data)
+        if boundary_payload is not None:
+            result.boundary = BoundaryCoordinates.model_validate_json(boundary_payload.json)
+        return result
+
+    async def process_region_data_with_payload(
+        self,
+        region_data: RegionData
+    ) -> Tuple[PopulationResult, Optional[BoundaryPayload]]:
+        """
+        행정구역 인구 데이터 분석 (경계는 모델 대신 캐시된 JSON 바이트로 반환)
+
+        /getRegionPop 응답 경로에서 경계 좌표를 재검증/재직렬화하지 않기 위해 사용합니다.
+
+        Returns:
+            (boundary가 비어 있는 PopulationResult, BoundaryPayload 또는 None)
+        """
         try:
             # 1. 행정구역 코드 조회
-            lookup_service = RegionLookupService()
-            region_code = lookup_service.find_region_code(
-                sido=region_data.sido,
-                sigungu=region_data.sigungu,
-                dong=region_data.dong,
-                level=region_data.level
-            )
+            with metrics.measure('region_lookup'):
+                lookup_service = get_region_lookup_service()
+                region_code = lookup_service.find_region_code(
+                    sido=region_data.sido,
+                    sigungu=region_data.sigungu,
+                    dong=region_data.dong,
+                    level=region_data.level
+                )
+
+            logger.info("지역 코드 조회: %s", region_code)
+
+            # 2. 인구 통계 조회 (캐시 우선, 미스 시 census_region 테이블 조회)
+            with metrics.measure('census'):
+                census = census_cache.get(region_code)
+                if census is None:
+                    census = await census_flight.do(region_code, lambda: self._load_census(region_code))
+                else:
+                    logger.debug("✓ 캐시에서 인구 데이터 로드: %s", region_code)
 
-            logger.info(f"지역 코드 조회: {region_code}")
-
-            # 2. Supabase census_region 테이블 조회
-            result = self.supabase.table('census_region') \
-                .select('*') \
-                .eq('region_cd', region_code) \
-                .execute()
-
-            logger.info(f"Supabase 조회 결과: {result.data}")
-
-            if not result.data or len(result.data) == 0:
-                raise ValueError(f"해당 지역의 인구 데이터를 찾을 수 없습니다: {region_code}")
-
-            census_data = result.data[0]
-
-            # 3. 행정구역 경계 조회 (WGS84 좌표계로 변환)
-            boundary_data = await self.get_region_boundary(region_code, region_data.level)
-
-            # 4. 데이터 변환: census_region 컬럼 → PopulationResult 형식
-            # Note: census_region 테이블 컬럼은 "10세 미만"이 아니라 구체적 연령 범위 컬럼입니다
-            # 알고리즘 문서: "10세 미만" ~ "100세 이상" 컬럼이 있음
-            age_distribution = {
-                '10세 미만': int(census_data.get('10세 미만', census_data.get('10세미만', 0))),
-                '10대': int(census_data.get('10대', 0)),
-                '20대': int(census_data.get('20대', 0)),
-                '30대': int(census_data.get('30대', 0)),
-                '40대': int(census_data.get('40대', 0)),
-                '50대': int(census_data.get('50대', 0)),
-                '60대': int(census_data.get('60대', 0)),
-                '70대': int(census_data.get('70대', 0)),
-                '80대': int(census_data.get('80대', 0)),
-                '90대': int(census_data.get('90대', 0)),
-                '100세 이상': int(census_data.get('100세 이상', census_data.get('100세이상', 0)))
-            }
+            # 3. 행정구역 경계 조회 (WGS84 좌표계로 변환, 캐시된 JSON 바이트)
+            with metrics.measure('boundary'):
+                boundary_payload = await self.get_region_boundary_payload(
+                    region_code, region_data.level, region_data.zoom
+                )
 
-            total_population = int(census_data.get('pop', census_data.get('총인구수', 0)))
-            total_households = int(census_data.get('households', census_data.get('총가구수', 0)))
+            total_population = census['total_population']
+            total_households = census['total_households']
 
-            logger.info(f"변환된 데이터: 총인구 {total_population}, 총가구 {total_households}, 경계 데이터: {boundary_data is not None}")
+            logger.info("변환된 데이터: 총인구 %s, 총가구 %s, 경계 데이터: %s",
+                        total_population, total_households, boundary_payload is not None)
 
             return PopulationResult(
                 total_population=total_population,
                 total_households=total_households,
-                age_distribution=age_distribution,
+                age_distribution=census['age_distribution'],
                 analysis_area_sqm=0.0,  # 행정구역은 면적 정보 없음
                 shape_type='region',
-                boundary=boundary_data,  # WGS84 경계 좌표 추가
                 error=False,
                 message=None
-            )
+            ), boundary_payload
 
         except ValueError as e:
-            logger.error(f"지역 데이터 조회 오류: {str(e)}")
+            logger.error("지역 데이터 조회 오류: %s", e)
             return PopulationResult(
                 total_population=0,
                 total_households=0,
@@ -523,9 +2965,9 @@ class SpatialAnalysisService:
                 shape_type='region',
                 error=True,
                 message=str(e)
-            )
+            ), None
         except Exception as e:
-            logger.error(f"지역 분석 오류: {str(e)}")
+            logger.error("지역 분석 오류: %s", e)
             return PopulationResult(
                 total_population=0,
                 total_households=0,
@@ -534,7 +2976,175 @@ class SpatialAnalysisService:
                 shape_type='region',
                 error=True,
                 message=f"데이터베이스 조회 중 오류 발생: {str(e)}"
+            ), None
+
+    async def _load_census(self, region_code: str) -> Dict[str, Any]:
+        """census_region 한 지역 조회 후 캐시에 저장 (공유 캐시 우선, 데이터가 없으면 ValueError)"""
+        shared_key = f"census:{census_cache.version}:{region_code}"
+        if shared_cache is not None:
+            shared_value = await shared_cache.get(shared_key)
+            if shared_value is not None:
+                census = json.loads(shared_value)
+                census_cache.set(region_code, census)
+                return census
+
+        result = await self.db.execute(
+            self.db.table('census_region')
+                .select('*')
+                .eq('region_cd', region_code),
+            'census_region'
+        )
+
+        logger.info("Supabase 조회 결과: %s", PayloadSummary(result.data))
+
+        if not result.data or len(result.data) == 0:
+            raise ValueError(f"해당 지역의 인구 데이터를 찾을 수 없습니다: {region_code}")
+
+        # 데이터 변환: census_region 컬럼 → PopulationResult 형식
+        census = convert_census_row(result.data[0])
+        census_cache.set(region_code, census)
+        if shared_cache is not None:
+            await shared_cache.set(shared_key, json.dumps(census).encode('utf-8'), CENSUS_CACHE_TTL_SECONDS)
+        return census
+
+    async def _load_census_rows(self, region_codes: Tuple[str, ...]) -> Dict[str, Dict[str, Any]]:
+        """census_region 여러 지역을 in 쿼리 한 번으로 조회 후 캐시에 저장 (공유 캐시 우선, region_cd → 인구 통계)"""
+        def shared_key(region_code: str) -> str:
+            return f"census:{census_cache.version}:{region_code}"
+
+        censuses = {}
+        if shared_cache is not None:
+            shared_values = await shared_cache.get_many([shared_key(code) for code in region_codes])
+            for region_code in region_codes:
+                shared_value = shared_values.get(shared_key(region_code))
+                if shared_value is not None:
+                    censuses[region_code] = json.loads(shared_value)
+                    census_cache.set(region_code, censuses[region_code])
+
+        missing_codes = [code for code in region_codes if code not in censuses]
+        if not missing_codes:
+            return censuses
+
+        result = await self.db.execute(
+            self.db.table('census_region').select('*').in_('region_cd', missing_codes),
+            'census_region'
+        )
+
+        fetched = {}
+        for row in result.data or []:
+            # 숫자 열로 반환되어도 조회 키(문자열 코드)와 맞도록 일괄 로드(preload)와 같이 문자열로 저장
+            code = str(row['region_cd'])
+            census = convert_census_row(row)
+            census_cache.set(code, census)
+            fetched[code] = census
+
+        if shared_cache is not None:
+            await shared_cache.set_many(
+                {shared_key(code): json.dumps(census).encode('utf-8') for code, census in fetched.items()},
+                CENSUS_CACHE_TTL_SECONDS
+            )
+        censuses.update(fetched)
+        return censuses
+
+    async def process_region_batch(self, request: RegionBatchRequest) -> List[Dict[str, Any]]:
+        """
+        여러 행정구역 인구 데이터 일괄 조회
+
+        지역 코드는 메모리의 행정구역 계층에서 찾고, 캐시에 없는 인구 통계는 region_cd in 쿼리로
+        한 번에 조회합니다. 오류는 항목별로 반환합니다.
+
+        Returns:
+            지역별 결과 목록 (region_code/level/지역 이름/PopulationResult 필드, include_boundary면 boundary_payload 포함)
+        """
+        lookup_service = get_region_lookup_service()
+
+        # 1. 지역 코드 조회 (+ 하위 지역 확장)
+        items: List[Dict[str, Any]] = []
+        with metrics.measure('region_lookup'):
+            for region_data in request.regions:
+                try:
+                    region_code = lookup_service.find_region_code(
+                        sido=region_data.sido,
+                        sigungu=region_data.sigungu,
+                        dong=region_data.dong,
+                        level=region_data.level
+                    )
+                except ValueError as e:
+                    items.append({'region_code': None, 'level': region_data.level, 'error': True, 'message': str(e)})
+                    continue
+
+                if request.expand_children:
+                    children = lookup_service.get_children(region_code)
+                    if not children:
+                        items.append({
+                            'region_code': region_code,
+                            'level': region_data.level,
+                            'error': True,
+                            'message': f"하위 행정구역이 없습니다: {region_code}"
+                        })
+                    items.extend({'region_code': child.cd, 'level': child.level} for child in children)
+                else:
+                    items.append({'region_code': region_code, 'level': region_data.level})
+
+        if len(items) > REGION_BATCH_MAX_ITEMS:
+            raise ValueError(f"한 번에 조회할 수 있는 지역은 최대 {REGION_BATCH_MAX_ITEMS}개입니다 (요청: {len(items)}개)")
+
+        region_codes = list(dict.fromkeys(item['region_code'] for item in items if not item.get('error')))
+
+        # 2. 인구 통계 조회 (캐시 우선, 나머지는 in 쿼리로 한 번에)
+        with metrics.measure('census'):
+            census_by_code = {code: census_cache.get(code) for code in region_codes}
+            missing_codes = [code for code, census in census_by_code.items() if census is None]
+
+            if missing_codes:
+                chunks = [
+                    tuple(missing_codes[i:i + REGION_BATCH_QUERY_CHUNK])
+                    for i in range(0, len(missing_codes), REGION_BATCH_QUERY_CHUNK)
+                ]
+                results = await asyncio.gather(*(
+                    census_flight.do(chunk, lambda chunk=chunk: self._load_census_rows(chunk))
+                    for chunk in chunks
+                ))
+                for censuses in results:
+                    census_by_code.update(censuses)
+
+        logger.info("지역 일괄 조회: %d개 지역 (인구 통계 DB 조회 %d개)", len(items), len(missing_codes))
+
+        # 3. 경계 조회 (선택, 캐시된 JSON 바이트)
+        boundaries: Dict[str, Optional[BoundaryPayload]] = {}
+        if request.include_boundary:
+            levels = {item['region_code']: item['level'] for item in items if not item.get('error')}
+            with metrics.measure('boundary'):
+                payloads = await asyncio.gather(*(
+                    self.get_region_boundary_payload(code, levels[code], request.zoom) for code in region_codes
+                ))
+            boundaries = dict(zip(region_codes, payloads))
+
+        # 4. 항목별 결과 조립
+        for item in items:
+            if item.get('error'):
+                continue
+
+            region_code = item['region_code']
+            item.update(lookup_service.get_region_path(region_code))
+
+            census = census_by_code.get(region_code)
+            if census is None:
+                item['error'] = True
+                item['message'] = f"해당 지역의 인구 데이터를 찾을 수 없습니다: {region_code}"
+                continue
+
+            item.update(
+                total_population=census['total_population'],
+                total_households=census['total_households'],
+                age_distribution=census['age_distribution'],
+                error=False,
+                message=None
             )
+            if request.include_boundary:
+                item['boundary_payload'] = boundaries.get(region_code)
+
+        return items
 
 # 의존성 주입
 def get_analysis_service() -> SpatialAnalysisService:
@@ -558,24 +3168,311 @@ async def analyze_hospital_area(
         if result.error:
             raise HTTPException(status_code=400, detail=result.message)
 
-        return result
+        with metrics.measure('serialization'):
+            body = result.model_dump_json().encode('utf-8')
+        return Response(content=body, media_type='application/json')
 
     except ValueError as e:
-        logger.error(f"유효성 검사 오류: {str(e)}")
+        logger.error("유효성 검사 오류: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"API 오류: {str(e)}")
+        logger.error("API 오류: %s", e)
         raise HTTPException(status_code=500, detail="서버 내부 오류")
 
+# 배치 분석 API 엔드포인트
+@app.post("/analyze/batch")
+async def analyze_hospital_areas_batch(
+    request: BatchAnalysisRequest,
+    service: SpatialAnalysisService = Depends(get_analysis_service)
+):
+    """
+    여러 병원 후보지 영역을 한 번에 분석합니다.
+
+    같은 도형은 한 번만 분석하고 (정규화된 도형 키 기준), 최대 ANALYSIS_BATCH_CONCURRENCY개씩 동시에 실행합니다.
+    오류는 항목별 결과(error=True)로 반환합니다.
+
+    합집합 인구(union)와 중복 집계된 인구(overlap = 개별 결과 합 - 합집합)는 격자 스냅샷이 로드되어 있으면
+    (ANALYSIS_ENGINE=local/shadow) 로컬 격자 엔진으로 계산하고 union_engine="grid"로 표시합니다.
+    overlap은 합집합과 같은 엔진의 개별 결과로 계산하므로, 항목 결과가 RPC에서 온 shadow 모드에서는
+    격자 엔진으로 도형별 인구를 다시 계산해 사용합니다 (results_engine="rpc").
+    기본 rpc 모드에는 격자 스냅샷이 없으므로 union_status="unsupported"와 설정 안내(union_message)를 반환합니다.
+    같은 도형을 여러 번 보낸 경우 overlap에는 한 번만 포함됩니다 (서로 다른 도형 사이의 중복만 집계).
+    """
+    if len(request.objects) > ANALYSIS_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 분석할 수 있는 도형은 최대 {ANALYSIS_BATCH_MAX_ITEMS}개입니다"
+        )
+
+    results: List[Optional[PopulationResult]] = [None] * len(request.objects)
+    unique_objects: Dict[str, DrawingObject] = {}
+    indices_by_key: Dict[str, List[int]] = {}
+
+    # 항목별 검증 + 같은 도형 묶기
+    for i, item in enumerate(request.objects):
+        try:
+            drawing_obj = DrawingObject.model_validate(item)
+            cache_key = service._make_cache_key(drawing_obj)
+        except Exception as e:
+            results[i] = PopulationResult(
+                total_population=0,
+                total_households=0,
+                age_distribution={},
+                analysis_area_sqm=0.0,
+                shape_type=str(item.get('type', 'unknown')) if isinstance(item, dict) else 'unknown',
+                error=True,
+                message=str(e)
+            )
+            continue
+
+        unique_objects.setdefault(cache_key, drawing_obj)
+        indices_by_key.setdefault(cache_key, []).append(i)
+
+    logger.info("배치 분석 요청: %d건 (고유 도형 %d건)", len(request.objects), len(unique_objects))
+
+    semaphore = asyncio.Semaphore(ANALYSIS_BATCH_CONCURRENCY)
+
+    async def analyze(drawing_obj: DrawingObject) -> PopulationResult:
+        async with semaphore:
+            return await service.process_drawing_object(drawing_obj)
+
+    unique_results = await asyncio.gather(*(analyze(obj) for obj in unique_objects.values()))
+    for cache_key, result in zip(unique_objects, unique_results):
+        for i in indices_by_key[cache_key]:
+            results[i] = result
+
+    # 합집합/중복 인구 (격자 스냅샷이 로드된 경우, 개별 결과도 같은 격자 엔진 기준)
+    union = None
+    overlap = None
+    union_message = None
+    union_engine = None
+    results_engine = 'grid' if ANALYSIS_ENGINE == 'local' and grid_engine is not None else 'rpc'
+    successful = [(key, result) for key, result in zip(unique_objects, unique_results) if not result.error]
+
+    if grid_engine is None:
+        union_status = 'unsupported'
+        union_message = ("합집합/중복 인구는 격자 스냅샷이 필요합니다 "
+                         "(ANALYSIS_ENGINE=local 또는 shadow로 GRID_SNAPSHOT_PATH 스냅샷을 로드하세요)")
+    elif not successful:
+        union_status = 'empty'
+    else:
+        try:
+            drawing_objs = [unique_objects[key] for key, _ in successful]
+            union = await asyncio.to_thread(grid_engine.analyze_union, drawing_objs)
+            if results_engine == 'grid':
+                successful_results = [result for _, result in successful]
+            else:
+                # 항목 결과(RPC)와 격자 합집합을 섞지 않도록 개별 결과도 격자 엔진으로 계산
+                successful_results = await asyncio.to_thread(
+                    lambda: [grid_engine.analyze(drawing_obj) for drawing_obj in drawing_objs]
+                )
+                union_message = "union/overlap은 격자 스냅샷 기준이며 항목 결과(RPC)와 약간 다를 수 있습니다"
+            # 같은 엔진의 결과이므로 개별 합 >= 합집합 (차이는 반올림/경계 격자 표본 추정 오차뿐이라 0 미만은 0으로 처리)
+            overlap = {
+                'total_population': max(0, sum(r.total_population for r in successful_results) - union['total_population']),
+                'total_households': max(0, sum(r.total_households for r in successful_results) - union['total_households']),
+                'age_distribution': {
+                    label: max(0, sum(r.age_distribution.get(label, 0) for r in successful_results) - value)
+                    for label, value in union['age_distribution'].items()
+                }
+            }
+            union_status = 'ok'
+            union_engine = 'grid'
+        except Exception as e:
+            logger.error("배치 분석 합집합 계산 오류: %s", e)
+            union_status = 'error'
+            union_message = "합집합 계산 중 오류가 발생했습니다"
+
+    return {
+        "success": True,
+        "count": len(results),
+        "error_count": sum(1 for result in results if result.error),
+        "results": results,
+        "results_engine": results_engine,
+        "union_status": union_status,
+        "union_message": union_message,
+        "union_engine": union_engine,
+        "union": union,
+        "overlap": overlap
+    }
+
+# 상태 확인 설정 (DB 확인 주기/타임아웃, 초)
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "15"))
+HEALTH_PROBE_TIMEOUT_SECONDS = float(os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS", "5"))
+
+class HealthMonitor:
+    """
+    DB 연결 상태를 백그라운드에서 주기적으로 확인하여 결과를 보관합니다
+
+    /readyz와 /health는 보관된 결과만 읽으므로 상태 확인 요청이 DB를 호출하거나 DB 지연에 묶이지 않습니다.
+    마지막 성공이 확인 주기의 3배보다 오래되었으면 DB가 준비되지 않은 것으로 봅니다 (일시적인 실패 1~2회는 허용).
+
+    워커마다 따로 확인하므로 확인 쿼리는 최대 워커 수(WEB_CONCURRENCY) / 확인 주기 건/초입니다.
+    지난 확인 이후 이 워커의 Supabase 호출이 성공했으면 그 결과로 대신하고 확인 쿼리를 보내지 않으므로,
+    실제로는 요청이 없는 워커만 확인 쿼리를 보냅니다. 확인 주기는 ±10% 분산하여 워커들이 동시에 확인하지 않도록 합니다.
+    """
+
+    def __init__(self, interval_seconds: float, timeout_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.last_checked_at: Optional[float] = None  # time.monotonic()
+        self.last_success_at: Optional[float] = None
+        self.consecutive_failures = 0
+        self.probes = 0
+        self.skipped_probes = 0
+
+    async def probe(self):
+        """test_coordinate_conversion RPC로 DB 상태 확인 (타임아웃 포함)"""
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(get_analysis_service().test_connection(), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            result = {'status': 'error', 'message': f"DB 상태 확인 시간 초과 ({self.timeout_seconds}초)"}
+
+        self.probes += 1
+        self._record({**result, 'source': 'probe', 'latency_ms': round((time.perf_counter() - started) * 1000, 1)})
+
+    def _record(self, result: Dict[str, Any]):
+        self.last_result = result
+        self.last_checked_at = time.monotonic()
+        if result['status'] == 'success':
+            if self.consecutive_failures > 0:
+                logger.info("DB 상태 확인 복구 (%s회 연속 실패 후)", self.consecutive_failures)
+            self.last_success_at = self.last_checked_at
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+            logger.warning("DB 상태 확인 실패 (%s회 연속): %s", self.consecutive_failures, result.get('message'))
+
+    async def check(self):
+        """지난 확인 이후 Supabase 호출이 성공했으면 확인 쿼리 생략, 아니면 probe()"""
+        traffic_success_at = db.recent_outcomes.last_success_at
+        if (self.last_checked_at is not None and traffic_success_at is not None
+                and traffic_success_at > self.last_checked_at):
+            self.skipped_probes += 1
+            # 마지막 확인 쿼리의 data(좌표 변환 결과)는 유지
+            self._record({'status': 'success', 'data': (self.last_result or {}).get('data'), 'source': 'traffic'})
+            return
+        await self.probe()
+
+    async def run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval_seconds * random.uniform(0.9, 1.1))
+
+    def is_database_ready(self) -> bool:
+        return (self.last_success_at is not None and
+                time.monotonic() - self.last_success_at <= self.interval_seconds * 3)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """마지막 확인 결과"""
+        now = time.monotonic()
+        result = self.last_result or {}
+        return {
+            "status": result.get('status', 'unknown'),
+            "source": result.get('source'),
+            "message": result.get('message'),
+            "latency_ms": result.get('latency_ms'),
+            "checked_seconds_ago": round(now - self.last_checked_at, 1) if self.last_checked_at is not None else None,
+            "last_success_seconds_ago": round(now - self.last_success_at, 1) if self.last_success_at is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+            "probes": self.probes,
+            "skipped_probes": self.skipped_probes,
+            "interval_seconds": self.interval_seconds
+        }
+
+# 전역 변수: 이 워커의 DB 상태 확인 결과
+health_monitor = HealthMonitor(HEALTH_PROBE_INTERVAL_SECONDS, HEALTH_PROBE_TIMEOUT_SECONDS)
+health_monitor_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def start_health_monitor():
+    """백그라운드 DB 상태 확인 시작 (첫 확인도 백그라운드에서 실행되어 시작을 지연시키지 않음)"""
+    global health_monitor_task
+    health_monitor_task = asyncio.create_task(health_monitor.run())
+
+@app.on_event("shutdown")
+async def stop_health_monitor():
+    """DB 상태 확인 작업 중지"""
+    if health_monitor_task is not None:
+        health_monitor_task.cancel()
+
+def get_warmup_state() -> Dict[str, Any]:
+    """정적 데이터/캐시 준비 상태 (disabled: 사용 안 함, loading: 적재 중, ready: 사용 가능, unavailable: 적재 실패)"""
+    def state(enabled: bool, ready: bool, loading: bool = True) -> str:
+        if not enabled:
+            return 'disabled'
+        if ready:
+            return 'ready'
+        return 'loading' if loading else 'unavailable'
+
+    return {
+        "region_index": state(True, region_index is not None),
+        "census_preload": state(CENSUS_PRELOAD, census_cache.last_preload_at is not None),
+        "census_cached_items": len(census_cache),
+        "hospital_index": state(HOSPITAL_INDEX_ENABLED, hospital_index is not None, hospital_index_task is not None),
+        # 격자 스냅샷은 시작 시 한 번만 로드하므로 실패하면 RPC로 분석 (unavailable)
+        "grid_snapshot": state(ANALYSIS_ENGINE in ('local', 'shadow'), grid_engine is not None, False),
+        "boundary_store": state(BOUNDARY_STORE_ENABLED, boundary_store is not None, False),
+        "shared_cache": state(CACHE_BACKEND != 'local', shared_cache is not None, False)
+    }
+
+def get_readiness_checks() -> Dict[str, bool]:
+    """트래픽 처리 준비 조건 (/readyz 응답 코드와 /health status에 사용)"""
+    return {
+        "region_index": region_index is not None,
+        "database": health_monitor.is_database_ready()
+    }
+
+@app.get("/livez")
+async def liveness_check():
+    """프로세스 생존 확인 (I/O 없음, Docker HEALTHCHECK용)"""
+    return {"status": "alive"}
+
+@app.get("/readyz")
+async def readiness_check():
+    """
+    트래픽 처리 준비 상태 (행정구역 인덱스 로드 + 최근 DB 상태 확인 성공이면 200, 아니면 503)
+
+    DB는 백그라운드에서 HEALTH_PROBE_INTERVAL_SECONDS마다 확인한 결과를 사용하므로 이 요청은 DB를 호출하지 않습니다.
+    캐시 준비 상태와 최근 Supabase 호출 오류율은 참고용이며 준비 여부에 영향을 주지 않습니다.
+    """
+    checks = get_readiness_checks()
+    ready = all(checks.values())
+
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "checks": checks,
+            "database": health_monitor.get_stats(),
+            "supabase_recent": db.recent_outcomes.get_stats(),
+            "warmup": get_warmup_state(),
+            "worker_id": get_worker_id()
+        }
+    )
+
 @app.get("/health")
-async def health_check(service: SpatialAnalysisService = Depends(get_analysis_service)):
-    """헬스 체크"""
-    connection_test = await service.test_connection()
+async def health_check():
+    """
+    헬스 체크 (DB 상태는 백그라운드 확인 결과 사용, 요청 시 DB를 호출하지 않음)
+
+    기존 호환을 위해 항상 200으로 응답하고, status는 /readyz와 같은 기준으로 healthy/unhealthy를 표시합니다.
+    """
+    database = health_monitor.last_result or {}
+    checks = get_readiness_checks()
 
     return {
-        "status": "healthy",
-        "database": connection_test['status'],
-        "database_data": connection_test.get('data'),
+        "status": "healthy" if all(checks.values()) else "unhealthy",
+        "checks": checks,
+        "database": database.get('status', 'unknown'),
+        "database_data": database.get('data'),
+        "analysis_engine": {
+            "mode": ANALYSIS_ENGINE,
+            "grid_snapshot": grid_engine.get_stats() if grid_engine is not None else None
+        },
+        "hospital_index": hospital_index.get_stats() if hospital_index is not None else None,
         "version": "1.0.0"
     }
 
@@ -587,7 +3484,7 @@ async def get_population_updated(
 ):
     """업데이트된 인구 분석 엔드포인트 (기존 호환성 + 새 기능)"""
     try:
-        logger.info(f"getPop 요청 데이터: {request_data}")
+        logger.info("getPop 요청 데이터: %s", PayloadSummary(request_data))
 
         # 새로운 형식인지 확인
         if "type" in request_data and "data" in request_data:
@@ -611,18 +3508,16 @@ async def get_population_updated(
             return {"message": "기존 형식 데이터 처리", "data": request_data}
 
     except Exception as e:
-        logger.error(f"getPop 오류: {str(e)}")
+        logger.error("getPop 오류: %s", e)
         return {"error": True, "message": str(e)}
 
 # 데이터 수신 엔드포인트
 @app.post("/getDrawingPop")
 async def receive_shape_data(data: Union[CircleData, PolygonData]):
-    print(f"받은 데이터: {data}")
-
     if data.type == "circle":
-        print(f"원형 데이터 - 중심: {data.center}, 반지름: {data.radius}")
+        logger.info("받은 원형 데이터 - 중심: %s, 반지름: %s", data.center, data.radius)
     elif data.type == "polygon":
-        print(f"다각형 데이터 - 점들: {data.points}")
+        logger.info("받은 다각형 데이터 - 점: %s", PayloadSummary(data.points))
 
     return {"status": "success", "message": "데이터를 성공적으로 받았습니다"}
 
@@ -630,74 +3525,513 @@ async def receive_shape_data(data: Union[CircleData, PolygonData]):
 @app.post("/getRegionPop", response_model=PopulationResult)
 async def get_region_population(
     region_data: RegionData,
+    request: Request,
     service: SpatialAnalysisService = Depends(get_analysis_service)
 ):
     """행정구역 선택 기반 인구 데이터 조회"""
     try:
-        logger.info(f"지역 조회 요청: {region_data}")
+        logger.info("지역 조회 요청: %s > %s > %s (%s, zoom=%s)", region_data.sido, region_data.sigungu or '-',
+                    region_data.dong or '-', region_data.level, region_data.zoom)
 
         # 지역 데이터 분석 실행
-        result = await service.process_region_data(region_data)
+        result, boundary_payload = await service.process_region_data_with_payload(region_data)
 
         if result.error:
             raise HTTPException(status_code=400, detail=result.message)
 
-        return result
+        # 캐시된 경계 JSON을 재직렬화 없이 응답 본문에 삽입 (요청 시 정수 델타 인코딩)
+        return render_population_response(
+            result,
+            select_boundary_payload(boundary_payload, request),
+            request.headers.get('accept-encoding', '')
+        )
 
     except ValueError as e:
-        logger.error(f"지역 조회 유효성 오류: {str(e)}")
+        logger.error("지역 조회 유효성 오류: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"지역 조회 API 오류: {str(e)}")
+        logger.error("지역 조회 API 오류: %s", e)
         raise HTTPException(status_code=500, detail="서버 내부 오류")
 
+# 지역 일괄 조회 엔드포인트
+@app.post("/getRegionPop/batch")
+async def get_region_population_batch(
+    batch_request: RegionBatchRequest,
+    request: Request,
+    service: SpatialAnalysisService = Depends(get_analysis_service)
+):
+    """
+    여러 행정구역 인구 데이터를 한 번에 조회합니다.
+
+    expand_children=true면 각 지역의 하위 지역 전체(예: 시/군/구 → 모든 행정동)를 조회하며,
+    include_boundary=true면 경계도 함께 반환합니다 (/getRegionPop과 같은 zoom/boundary_encoding 옵션).
+    """
+    try:
+        items = await service.process_region_batch(batch_request)
+    except ValueError as e:
+        logger.error("지역 일괄 조회 유효성 오류: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("지역 일괄 조회 API 오류: %s", e)
+        raise HTTPException(status_code=500, detail="서버 내부 오류")
+
+    # 캐시된 경계 JSON은 재직렬화 없이 항목에 삽입
+    with metrics.measure('serialization'):
+        serialized_items = []
+        for item in items:
+            boundary_payload = item.pop('boundary_payload', None)
+            serialized = json.dumps(item, ensure_ascii=False).encode('utf-8')
+            if batch_request.include_boundary:
+                boundary_payload = select_boundary_payload(boundary_payload, request)
+                serialized = serialized[:-1] + b',"boundary":' + (boundary_payload.json if boundary_payload else b'null') + b'}'
+            serialized_items.append(serialized)
+
+        error_count = sum(1 for item in items if item.get('error'))
+        body = (
+            f'{{"success":true,"count":{len(items)},"error_count":{error_count},"regions":['.encode('utf-8')
+            + b','.join(serialized_items)
+            + b']}'
+        )
+    return Response(content=body, media_type='application/json', headers={'Vary': 'Accept'})
+
+# 행정구역 경계 조회 엔드포인트 (줌별 단순화)
+@app.get("/getRegionBoundary/{region_code}")
+async def get_region_boundary_api(
+    region_code: str,
+    request: Request,
+    zoom: Optional[int] = None,
+    service: SpatialAnalysisService = Depends(get_analysis_service)
+):
+    """
+    행정구역 코드로 경계만 조회합니다.
+    zoom을 지정하면 해당 지도 줌에 맞게 미리 단순화된 경계를 반환하고,
+    ?boundary_encoding=delta 또는 Accept 헤더로 정수 델타 인코딩을 요청할 수 있습니다.
+    """
+    node = region_index.get_node(region_code) if region_index else None
+    if node is None:
+        raise HTTPException(status_code=404, detail=f"행정구역 코드를 찾을 수 없습니다: {region_code}")
+
+    payload = await service.get_region_boundary_payload(region_code, node.level, zoom)
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"경계 데이터가 없습니다: {region_code}")
+
+    payload = select_boundary_payload(payload, request)
+    return Response(content=payload.json, media_type='application/json', headers={'Vary': 'Accept'})
+
 # 캐시 관리 API 엔드포인트
+# 동시 조회 합치기 통계 대상
+SINGLE_FLIGHTS = (boundary_flight, census_flight, analysis_flight, hospital_tile_flight, hospital_detail_flight)
+
+def clear_local_caches() -> Dict[str, int]:
+    """이 워커의 메모리 캐시 전체 삭제 (캐시별 삭제된 항목 수)"""
+    return {
+        "cleared_count": boundary_cache.clear(),
+        "census_cleared_count": census_cache.clear(),
+        "analysis_cleared_count": analysis_cache.clear(),
+        "hospital_detail_cleared_count": hospital_detail_cache.clear(),
+        "hospital_tile_cleared_count": hospital_tile_cache.clear()
+    }
+
+def get_local_cache_counters() -> Dict[str, Dict[str, int]]:
+    """워커 간 합산용 캐시 카운터 (캐시 이름 → 숫자 항목)"""
+    counters = {
+        cache.name: {
+            'hits': cache.stats['hits'],
+            'misses': cache.stats['misses'],
+            'evictions': cache.stats['evictions'],
+            'items': len(cache),
+            'bytes': cache.total_bytes
+        }
+        for cache in (boundary_cache, analysis_cache, hospital_detail_cache, hospital_tile_cache)
+    }
+    counters['census'] = {'hits': census_cache.stats['hits'], 'misses': census_cache.stats['misses'], 'items': len(census_cache)}
+    for flight in SINGLE_FLIGHTS:
+        counters[f"single_flight.{flight.name}"] = {'executions': flight.stats['executions'], 'coalesced': flight.stats['coalesced']}
+    if boundary_store is not None:
+        counters['boundary_store'] = {'hits': boundary_store.stats['hits'], 'misses': boundary_store.stats['misses']}
+    if shared_cache is not None:
+        counters['shared'] = {'hits': shared_cache.stats['hits'], 'misses': shared_cache.stats['misses']}
+    return counters
+
+def get_worker_stats() -> Dict[str, Any]:
+    """공유 캐시 계층으로 공유하는 이 워커의 통계 (캐시 카운터 + 지연 시간 지표 + 버려진 로그 수)"""
+    return {
+        'cache': get_local_cache_counters(),
+        'metrics': metrics.snapshot(),
+        'log_dropped': log_queue_handler.dropped if log_queue_handler is not None else 0
+    }
+
+def aggregate_cache_counters(worker_counters: Dict[str, Dict[str, Dict[str, int]]]) -> Dict[str, Dict[str, Any]]:
+    """워커별 캐시 카운터 합산 (조회가 있는 항목은 전체 적중률 포함)"""
+    totals: Dict[str, Dict[str, Any]] = {}
+    for counters in worker_counters.values():
+        for name, values in counters.items():
+            total = totals.setdefault(name, {})
+            for field, value in values.items():
+                total[field] = total.get(field, 0) + value
+
+    for total in totals.values():
+        if 'hits' in total:
+            lookups = total['hits'] + total['misses']
+            total['hit_rate'] = f"{(total['hits'] / lookups * 100) if lookups > 0 else 0:.2f}%"
+    return totals
+
+# 워커 지표 파일 디렉터리 (비어 있지 않으면 워커마다 지표 스냅샷 파일을 쓰고 /metrics가 모든 파일을 합산)
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_SECONDS = 5  # 워커 지표 파일 갱신 주기
+METRICS_GAUGE_FIELDS = ('items', 'bytes')  # 캐시 카운터 중 현재 값(게이지) 항목 (종료된 워커는 제외)
+
+_metrics_file: Optional[Tuple[int, str, str]] = None  # (PID, 디렉터리, 이 워커의 지표 파일 경로)
+
+def get_metrics_file_path(directory: str) -> str:
+    """이 워커의 지표 파일 경로 (PID가 재사용되어도 이전 워커 파일을 덮어쓰지 않도록 워커마다 고유 이름)"""
+    global _metrics_file
+    if _metrics_file is None or _metrics_file[:2] != (os.getpid(), directory):
+        name = f"worker-{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+        _metrics_file = (os.getpid(), directory, os.path.join(directory, name))
+    return _metrics_file[2]
+
+def write_worker_metrics(directory: str):
+    """이 워커의 통계를 지표 디렉터리에 기록 (임시 파일에 쓴 뒤 이름을 바꾸므로 읽는 쪽은 항상 완전한 파일을 봄)"""
+    path = get_metrics_file_path(directory)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'worker_id': get_worker_id(), 'pid': os.getpid(), 'stats': get_worker_stats()}, f)
+    os.replace(temp_path, path)
+
+def is_process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def read_worker_metrics(directory: str) -> Dict[str, Dict[str, Any]]:
+    """
+    지표 디렉터리의 모든 워커 통계 (워커 ID → get_worker_stats() 형식)
+
+    종료된 워커(max_requests 교체, 비정상 종료)의 파일도 남겨 두어 누적 카운터/히스토그램이 줄어들지 않게 하고,
+    캐시 항목 수/크기 같은 게이지만 제외합니다 (exited=True).
+    """
+    worker_stats: Dict[str, Dict[str, Any]] = {}
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("워커 지표 파일 읽기 실패 (%s): %s", name, e)
+            continue
+
+        stats = record['stats']
+        if record['pid'] != os.getpid() and not is_process_alive(record['pid']):
+            stats = {
+                **stats,
+                'cache': {
+                    cache: {field: value for field, value in values.items() if field not in METRICS_GAUGE_FIELDS}
+                    for cache, values in stats['cache'].items()
+                },
+                'exited': True
+            }
+        worker_stats[f"{record['worker_id']}/{name}"] = stats
+    return worker_stats
+
+def reset_metrics_dir(directory: str):
+    """지표 디렉터리를 만들고 이전 실행의 파일을 삭제 (gunicorn 마스터가 워커 fork 전에 호출)"""
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith(('.json', '.tmp')):
+            os.remove(os.path.join(directory, name))
+
+async def flush_worker_metrics_periodically():
+    """METRICS_FLUSH_SECONDS마다 이 워커의 지표 파일 갱신"""
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_SECONDS)
+        try:
+            await asyncio.to_thread(write_worker_metrics, METRICS_DIR)
+        except Exception as e:
+            logger.error("워커 지표 파일 기록 오류: %s", e)
+
+metrics_flush_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def start_metrics_flush():
+    """METRICS_DIR가 설정되어 있으면 워커 지표 파일 기록 시작"""
+    global metrics_flush_task
+    if not METRICS_DIR:
+        return
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    metrics_flush_task = asyncio.create_task(flush_worker_metrics_periodically())
+
+@app.on_event("shutdown")
+async def stop_metrics_flush():
+    """워커 지표 파일 기록 중지 (종료 직전 값을 마지막으로 기록)"""
+    if metrics_flush_task is None:
+        return
+    metrics_flush_task.cancel()
+    try:
+        write_worker_metrics(METRICS_DIR)
+    except Exception as e:
+        logger.error("워커 지표 파일 기록 오류: %s", e)
+
+shared_cache_task: Optional[asyncio.Task] = None
+shared_cache_generation = 0  # 이 워커가 마지막으로 반영한 공유 캐시 삭제 세대
+
+async def sync_shared_cache_periodically():
+    """워커 캐시 통계를 공유하고, 다른 워커가 캐시를 비웠으면 이 워커의 메모리 캐시도 비웁니다"""
+    global shared_cache_generation
+
+    while True:
+        await asyncio.sleep(CACHE_SHARED_SYNC_SECONDS)
+        try:
+            await shared_cache.publish_stats(get_worker_id(), get_worker_stats())
+
+            generation = await shared_cache.get_generation()
+            if generation != shared_cache_generation:
+                shared_cache_generation = generation
+                cleared = clear_local_caches()
+                logger.info("공유 캐시 삭제 반영: 메모리 캐시 %s개 항목 삭제", sum(cleared.values()))
+
+            await shared_cache.maintain()
+        except Exception as e:
+            logger.error("공유 캐시 동기화 오류: %s", e)
+
+@app.on_event("startup")
+async def connect_shared_cache():
+    """CACHE_BACKEND가 local이 아니면 공유 캐시 계층에 연결하고 동기화 작업을 시작합니다"""
+    global shared_cache, shared_cache_task, shared_cache_generation
+    try:
+        shared_cache = create_shared_cache()
+        if shared_cache is None:
+            return
+        shared_cache_generation = await shared_cache.get_generation()
+    except Exception as e:
+        logger.error("공유 캐시 연결 실패 (%s): %s. 워커별 메모리 캐시만 사용합니다.", CACHE_BACKEND, e)
+        shared_cache = None
+        return
+
+    shared_cache_task = asyncio.create_task(sync_shared_cache_periodically())
+    logger.info("✓ 공유 캐시 계층 연결: %s (워커 %s)", shared_cache.name, get_worker_id())
+
+@app.on_event("shutdown")
+async def close_shared_cache():
+    """공유 캐시 동기화 작업 중지 및 연결 종료"""
+    if shared_cache_task is not None:
+        shared_cache_task.cancel()
+    if shared_cache is not None:
+        await shared_cache.close()
+
 @app.get("/cache/stats")
 async def get_cache_stats_api():
     """캐시 통계 정보 조회 (메모리 사용량 포함)"""
-    hit_rate = (cache_stats['hits'] / cache_stats['total_requests'] * 100) if cache_stats['total_requests'] > 0 else 0
-    memory_mb = get_cache_memory_usage()
+    boundary_stats = boundary_cache.get_stats()
 
     return {
-        "total_requests": cache_stats['total_requests'],
-        "cache_hits": cache_stats['hits'],
-        "cache_misses": cache_stats['misses'],
-        "evictions": cache_stats['evictions'],
-        "hit_rate": f"{hit_rate:.2f}%",
-        "cached_items": len(boundary_cache),
-        "max_cache_size": MAX_CACHE_SIZE,
+        **boundary_stats,
         "cache_utilization": f"{len(boundary_cache) / MAX_CACHE_SIZE * 100:.1f}%",
-        "memory_usage_mb": f"{memory_mb:.2f}",
-        "max_memory_mb": MAX_CACHE_MEMORY_MB,
-        "memory_utilization": f"{memory_mb / MAX_CACHE_MEMORY_MB * 100:.1f}%",
-        "cache_keys": list(boundary_cache.keys())
+        "cache_keys": list(boundary_cache.keys()),
+        "census_cache": census_cache.get_stats(),
+        "analysis_cache": analysis_cache.get_stats(),
+        "hospital_detail_cache": hospital_detail_cache.get_stats(),
+        "hospital_tile_cache": hospital_tile_cache.get_stats(),
+        "single_flight": {flight.name: flight.get_stats() for flight in SINGLE_FLIGHTS},
+        "boundary_store": boundary_store.get_stats() if boundary_store is not None else None,
+        "shared_cache": await get_shared_cache_stats()
+    }
+
+async def get_shared_cache_stats() -> Optional[Dict[str, Any]]:
+    """공유 캐시 계층 통계 + 모든 워커의 캐시 카운터 합산 (CACHE_BACKEND=local이면 None)"""
+    if shared_cache is None:
+        return None
+
+    # 이 워커의 최신 카운터를 먼저 공유한 뒤 전체 워커 통계 수집
+    worker_id = get_worker_id()
+    await shared_cache.publish_stats(worker_id, get_worker_stats())
+    worker_stats = await shared_cache.collect_stats()
+
+    return {
+        **shared_cache.get_stats(),
+        "worker_id": worker_id,
+        "workers": sorted(worker_stats),
+        "totals": aggregate_cache_counters({worker: stats['cache'] for worker, stats in worker_stats.items()})
     }
 
+# /metrics 지표 설명 (Prometheus HELP)
+METRICS_HELP = {
+    'hrp_request_duration_seconds': 'HTTP 요청 처리 시간',
+    'hrp_stage_duration_seconds': '요청 처리 단계별 소요 시간 (region_lookup, census, boundary, analysis, serialization 등)',
+    'hrp_supabase_duration_seconds': 'Supabase 테이블/RPC 호출 시간 (세마포어 대기 제외)',
+    'hrp_cache_requests_total': '캐시 조회 수 (result=hit|miss)',
+    'hrp_cache_evictions_total': '캐시 용량 초과로 삭제된 항목 수',
+    'hrp_cache_items': '캐시 항목 수',
+    'hrp_cache_bytes': '캐시 항목 크기 합계',
+    'hrp_single_flight_executions_total': '합쳐진 조회 중 실제로 실행된 조회 수',
+    'hrp_single_flight_coalesced_total': '진행 중인 조회를 기다린 호출 수',
+    'hrp_log_records_dropped_total': '로그 큐가 가득 차서 버려진 로그 수',
+    'hrp_workers': '지표를 합산한 실행 중인 워커 수 (종료된 워커의 누적 카운터도 합산에는 포함)'
+}
+
+def format_metric_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Prometheus 레이블 문자열 ({name="value",...}, 값의 역슬래시/따옴표/줄바꿈은 이스케이프)"""
+    if not labels:
+        return ''
+    pairs = []
+    for name, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+def render_prometheus_metrics(worker_stats: Dict[str, Dict[str, Any]]) -> str:
+    """워커별 통계를 합산하여 Prometheus 텍스트 형식(0.0.4)으로 변환"""
+    lines: List[str] = []
+
+    def header(name: str, metric_type: str):
+        lines.append(f"# HELP {name} {METRICS_HELP[name]}")
+        lines.append(f"# TYPE {name} {metric_type}")
+
+    # 1. 지연 시간 히스토그램 (누적 버킷으로 변환)
+    histograms = LatencyMetrics.merge([stats['metrics'] for stats in worker_stats.values()])
+    for name in sorted({name for name, _ in histograms}):
+        header(name, 'histogram')
+        for (series_name, labels), series in sorted(histograms.items()):
+            if series_name != name:
+                continue
+            cumulative = 0
+            for bound, count in zip((*METRICS_LATENCY_BUCKETS, '+Inf'), series[:-1]):
+                cumulative += count
+                lines.append(f"{name}_bucket{format_metric_labels((*labels, ('le', str(bound))))} {cumulative}")
+            lines.append(f"{name}_sum{format_metric_labels(labels)} {series[-1]}")
+            lines.append(f"{name}_count{format_metric_labels(labels)} {cumulative}")
+
+    # 2. 캐시/single-flight 카운터와 게이지 (워커별 현재 값 합산)
+    totals = aggregate_cache_counters({worker: stats['cache'] for worker, stats in worker_stats.items()})
+    caches = {name: values for name, values in totals.items() if not name.startswith('single_flight.')}
+    flights = {name[len('single_flight.'):]: values for name, values in totals.items() if name.startswith('single_flight.')}
+
+    header('hrp_cache_requests_total', 'counter')
+    for cache, values in caches.items():
+        lines.append(f'hrp_cache_requests_total{{cache="{cache}",result="hit"}} {values["hits"]}')
+        lines.append(f'hrp_cache_requests_total{{cache="{cache}",result="miss"}} {values["misses"]}')
+    for name, field, metric_type in (
+        ('hrp_cache_evictions_total', 'evictions', 'counter'),
+        ('hrp_cache_items', 'items', 'gauge'),
+        ('hrp_cache_bytes', 'bytes', 'gauge')
+    ):
+        header(name, metric_type)
+        for cache, values in caches.items():
+            if field in values:
+                lines.append(f'{name}{{cache="{cache}"}} {values[field]}')
+
+    for name, field in (
+        ('hrp_single_flight_executions_total', 'executions'),
+        ('hrp_single_flight_coalesced_total', 'coalesced')
+    ):
+        header(name, 'counter')
+        for flight, values in flights.items():
+            lines.append(f'{name}{{key="{flight}"}} {values[field]}')
+
+    header('hrp_log_records_dropped_total', 'counter')
+    lines.append(f"hrp_log_records_dropped_total {sum(stats.get('log_dropped', 0) for stats in worker_stats.values())}")
+
+    header('hrp_workers', 'gauge')
+    lines.append(f"hrp_workers {sum(1 for stats in worker_stats.values() if not stats.get('exited'))}")
+
+    return '\n'.join(lines) + '\n'
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Prometheus 텍스트 형식 지표
+
+    METRICS_DIR가 설정되어 있으면(gunicorn 기본) 캐시 백엔드와 관계없이 지표 디렉터리의 모든 워커 파일을 합산합니다
+    (다른 워커 값은 최대 METRICS_FLUSH_SECONDS 전 값, 종료된 워커의 누적 카운터 포함).
+    설정되어 있지 않으면 공유 캐시 계층에 공유된 워커 지표를 합산하고, 그것도 없으면 요청을 받은 워커의 지표만 반환합니다.
+    """
+    worker_id = get_worker_id()
+    worker_stats = {worker_id: get_worker_stats()}
+
+    if METRICS_DIR:
+        try:
+            await asyncio.to_thread(write_worker_metrics, METRICS_DIR)
+            worker_stats = await asyncio.to_thread(read_worker_metrics, METRICS_DIR)
+        except Exception as e:
+            logger.error("워커 지표 파일 수집 오류: %s", e)
+    elif shared_cache is not None:
+        try:
+            await shared_cache.publish_stats(worker_id, worker_stats[worker_id])
+            worker_stats = {**await shared_cache.collect_stats(), **worker_stats}
+        except Exception as e:
+            logger.error("워커 지표 수집 오류: %s", e)
+
+    return Response(
+        content=render_prometheus_metrics(worker_stats),
+        media_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
 @app.delete("/cache/clear")
 async def clear_cache():
-    """캐시 전체 삭제"""
-    global boundary_cache, cache_stats
+    """캐시 전체 삭제 (공유 캐시 계층 포함, 다른 워커의 메모리 캐시는 CACHE_SHARED_SYNC_SECONDS 안에 반영)"""
+    global shared_cache_generation
+    cleared = clear_local_caches()
 
-    cleared_count = len(boundary_cache)
-    boundary_cache.clear()
+    shared_cleared_count = None
+    if shared_cache is not None:
+        try:
+            shared_cleared_count = await shared_cache.clear()
+            shared_cache_generation = await shared_cache.get_generation()
+        except Exception as e:
+            logger.error("공유 캐시 삭제 오류: %s", e)
+            raise HTTPException(status_code=500, detail=f"공유 캐시 삭제 중 오류 발생: {str(e)}")
 
     # 통계는 유지하되, 초기화 옵션 제공
     return {
         "status": "success",
-        "message": f"{cleared_count}개의 캐시 항목이 삭제되었습니다",
-        "cleared_count": cleared_count
+        "message": f"{cleared['cleared_count']}개의 캐시 항목이 삭제되었습니다",
+        **cleared,
+        "shared_cleared_count": shared_cleared_count
     }
 
+@app.post("/cache/census/refresh")
+async def refresh_census_cache(version: Optional[str] = None):
+    """
+    인구 통계 캐시 갱신
+
+    version을 지정하면 데이터 버전을 변경(기존 캐시 무효화)한 뒤 전체 지역을 다시 적재합니다.
+    """
+    try:
+        if version is not None:
+            census_cache.set_version(version)
+
+        loaded = await census_cache.preload(db)
+
+        return {
+            "status": "success",
+            "message": f"{loaded}개 지역의 인구 통계를 다시 적재했습니다",
+            "loaded_count": loaded,
+            "data_version": census_cache.version
+        }
+
+    except Exception as e:
+        logger.error("인구 통계 캐시 갱신 오류: %s", e)
+        raise HTTPException(status_code=500, detail=f"인구 통계 캐시 갱신 중 오류 발생: {str(e)}")
+
 @app.delete("/cache/reset-stats")
 async def reset_cache_stats():
     """캐시 통계 초기화"""
-    global cache_stats
-
-    cache_stats = {
-        'hits': 0,
-        'misses': 0,
-        'total_requests': 0
-    }
+    boundary_cache.reset_stats()
+    census_cache.reset_stats()
+    analysis_cache.reset_stats()
+    hospital_detail_cache.reset_stats()
+    hospital_tile_cache.reset_stats()
+    for flight in SINGLE_FLIGHTS:
+        flight.reset_stats()
+    if boundary_store is not None:
+        boundary_store.reset_stats()
+    if shared_cache is not None:
+        shared_cache.reset_stats()
 
     return {
         "status": "success",
@@ -712,53 +4046,718 @@ class HospitalBounds(BaseModel):
     ne_lng: float  # 북동쪽 경도
     department: Optional[str] = ""  # 진료과목 필터 (빈 문자열이면 전체)
     has_specialist: bool = False  # 전문의 필터
+    zoom: Optional[int] = None  # 지도 줌 (웹 메르카토르 기준, HOSPITAL_CLUSTER_MAX_ZOOM 이하면 클러스터로 응답)
+
+def lng_to_tile_x(lng: float, zoom: int) -> int:
+    """경도 → 타일 x 번호"""
+    n = 2 ** zoom
+    return min(n - 1, max(0, int((lng + 180.0) / 360.0 * n)))
+
+def lat_to_mercator_y(lat: float) -> float:
+    """위도 → 웹 메르카토르 y (0~1, 북쪽이 0)"""
+    lat_rad = math.radians(max(-85.0511, min(85.0511, lat)))
+    return (1.0 - math.log(math.tan(lat_rad) + 1.0 / math.cos(lat_rad)) / math.pi) / 2.0
+
+def lat_to_tile_y(lat: float, zoom: int) -> int:
+    """위도 → 타일 y 번호 (웹 메르카토르, 북쪽이 0)"""
+    n = 2 ** zoom
+    return min(n - 1, max(0, int(lat_to_mercator_y(lat) * n)))
+
+def tile_bounds(zoom: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """타일 영역 (sw_lng, sw_lat, ne_lng, ne_lat)"""
+    n = 2 ** zoom
+
+    def tile_lat(tile_y: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / n))))
+
+    return x / n * 360.0 - 180.0, tile_lat(y + 1), (x + 1) / n * 360.0 - 180.0, tile_lat(y)
+
+class HospitalIndex:
+    """
+    병원 메모리 인덱스 (열 단위 스냅샷)
+
+    병원 좌표와 ykiho/이름/종별/주소/전화번호 열, 진료과목·전문의 비트마스크를 UniformGridIndex 버킷 순서로 보관합니다.
+    영역 + 진료과목 + 전문의 조건 조회를 search_hospitals_spatial RPC 없이 메모리에서 처리하며,
+    진료과목 목록(/getDepartments)도 같은 스냅샷에서 만듭니다.
+
+    has_specialist는 진료과목 필터가 있으면 그 과목의 전문의, 없으면 아무 과목이든 전문의가 있는지를 뜻합니다.
+    """
+
+    COLUMNS = ('ykiho', 'yadmnm', 'clcdnm', 'addr', 'telno')
+
+    def __init__(self, basic_rows: List[Dict[str, Any]], department_rows: List[Dict[str, Any]]):
+        self.departments = sorted({row['dgsbjtcdnm'] for row in department_rows if row.get('dgsbjtcdnm')})
+        self.department_bits = {name: bit for bit, name in enumerate(self.departments)}
+
+        # 좌표가 없는 병원 제외, 같은 ykiho가 여러 번 있으면 처음 행만 사용 (검색 결과 중복 방지)
+        rows = []
+        positions: Dict[str, int] = {}
+        duplicates = 0
+        for row in basic_rows:
+            if row.get('xpos') is None or row.get('ypos') is None:
+                continue
+            if row['ykiho'] in positions:
+                duplicates += 1
+                continue
+            positions[row['ykiho']] = len(rows)
+            rows.append(row)
+        if duplicates:
+            logger.warning("병원 인덱스: hospital_basic에 중복 ykiho %d건 (처음 행만 사용)", duplicates)
+
+        # 진료과목별 비트 (64개씩 uint64 한 열)
+        department_masks = [0] * len(rows)
+        specialist_masks = [0] * len(rows)
+        for row in department_rows:
+            i = positions.get(row['ykiho'])
+            bit = self.department_bits.get(row.get('dgsbjtcdnm'))
+            if i is None or bit is None:
+                continue
+            department_masks[i] |= 1 << bit
+            if (row.get('dgsbjtprsdrcnt') or 0) > 0:
+                specialist_masks[i] |= 1 << bit
+
+        words = max(1, (len(self.departments) + 63) // 64)
+
+        def to_words(masks: List[int]) -> Any:
+            return np.array(
+                [[(mask >> (64 * word)) & 0xFFFFFFFFFFFFFFFF for word in range(words)] for mask in masks],
+                dtype=np.uint64
+            ).reshape(len(masks), words)
+
+        lng = np.array([float(row['xpos']) for row in rows], dtype=np.float64)
+        lat = np.array([float(row['ypos']) for row in rows], dtype=np.float64)
+        self.index = UniformGridIndex(lng, lat, HOSPITAL_INDEX_BUCKET_DEGREES)
+        order = self.index.order
+
+        self.lng = lng[order]
+        self.lat = lat[order]
+        self.department_mask = to_words(department_masks)[order]
+        self.specialist_mask = to_words(specialist_masks)[order]
+        self.any_specialist = (self.specialist_mask != 0).any(axis=1)
+        self.columns = {
+            name: np.array([row.get(name) or '' for row in rows], dtype=object)[order]
+            for name in self.COLUMNS
+        }
+        self.loaded_at = datetime.now()
+
+    def __len__(self) -> int:
+        return len(self.lng)
+
+    @classmethod
+    async def fetch(cls, database: SupabaseGateway, page_size: int = HOSPITAL_STREAM_PAGE_SIZE) -> 'HospitalIndex':
+        """
+        hospital_basic/hospital_departments 전체를 페이지 단위로 조회해 인덱스 생성
+
+        offset 페이지는 정렬 키에 같은 값이 있으면 페이지 경계에서 행이 빠지거나 중복될 수 있으므로
+        테이블마다 유일한 키 순서(hospital_basic: ykiho, hospital_departments: ykiho + 진료과목)로 정렬합니다.
+        """
+        async def fetch_all(table_name: str, columns: str, order_columns: Tuple[str, ...]) -> List[Dict[str, Any]]:
+            rows = []
+            offset = 0
+            while True:
+                query = database.table(table_name).select(columns)
+                for column in order_columns:
+                    query = query.order(column)
+                result = await database.execute(query.range(offset, offset + page_size - 1), table_name)
+                page = result.data or []
+                rows.extend(page)
+                if len(page) < page_size:
+                    return rows
+                offset += page_size
+
+        basic_rows, department_rows = await asyncio.gather(
+            fetch_all('hospital_basic', ', '.join(cls.COLUMNS + ('xpos', 'ypos')), ('ykiho',)),
+            fetch_all('hospital_departments', 'ykiho, dgsbjtcdnm, dgsbjtprsdrcnt', ('ykiho', 'dgsbjtcdnm'))
+        )
+        return await asyncio.to_thread(cls, basic_rows, department_rows)
+
+    def search(
+        self,
+        sw_lng: float,
+        sw_lat: float,
+        ne_lng: float,
+        ne_lat: float,
+        department: str = '',
+        has_specialist: bool = False
+    ) -> List[Dict[str, Any]]:
+        """영역 내 병원 목록 (search_hospitals_spatial RPC와 같은 행 형식)"""
+        positions = self.index.items(self.index.query(sw_lng, sw_lat, ne_lng, ne_lat))
+        lng = self.lng[positions]
+        lat = self.lat[positions]
+        keep = (lng >= sw_lng) & (lng <= ne_lng) & (lat >= sw_lat) & (lat <= ne_lat)
+
+        if department:
+            bit = self.department_bits.get(department)
+            if bit is None:
+                return []
+            word, flag = divmod(bit, 64)
+            flag = np.uint64(1 << flag)
+            keep &= (self.department_mask[positions, word] & flag) != 0
+            specialist = (self.specialist_mask[positions, word] & flag) != 0
+        else:
+            specialist = self.any_specialist[positions]
+
+        if has_specialist:
+            keep &= specialist
+
+        positions = positions[keep]
+        return [
+            {
+                'ykiho': ykiho,
+                'yadmnm': yadmnm,
+                'clcdnm': clcdnm,
+                'addr': addr,
+                'telno': telno,
+                'xpos': xpos,
+                'ypos': ypos,
+                'has_specialist': has_specialist
+            }
+            for ykiho, yadmnm, clcdnm, addr, telno, xpos, ypos, has_specialist in zip(
+                *(self.columns[name][positions].tolist() for name in self.COLUMNS),
+                self.lng[positions].tolist(),
+                self.lat[positions].tolist(),
+                specialist[keep].tolist()
+            )
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """인덱스 정보"""
+        return {
+            "hospitals": len(self),
+            "departments": len(self.departments),
+            "buckets": len(self.index),
+            "loaded_at": self.loaded_at.isoformat()
+        }
+
+# 전역 변수: 병원 메모리 인덱스 (HOSPITAL_INDEX_ENABLED=true이고 적재가 끝난 경우에만 사용)
+hospital_index: Optional[HospitalIndex] = None
+
+def load_hospital_index():
+    """
+    HOSPITAL_INDEX_ENABLED=true이면 병원 인덱스를 적재합니다 (fork 전 마스터에서 load_static_data()가 호출)
+
+    워커의 AsyncClient는 워커 이벤트 루프에서 만들어야 하므로 적재용 게이트웨이를 따로 열고 닫습니다.
+    적재에 실패하면 워커가 시작 후 각자 적재합니다 (refresh_hospital_index_periodically).
+    """
+    global hospital_index
+
+    if not HOSPITAL_INDEX_ENABLED or np is None or hospital_index is not None:
+        return
+
+    async def fetch() -> HospitalIndex:
+        database = SupabaseGateway(SUPABASE_URL, SUPABASE_KEY, SUPABASE_MAX_CONCURRENCY, SUPABASE_TIMEOUT_SECONDS)
+        await database.connect()
+        try:
+            return await HospitalIndex.fetch(database)
+        finally:
+            await database.close()
 
-# 병원 검색 엔드포인트
-@app.post("/getHospitals")
-async def get_hospitals(bounds: HospitalBounds):
-    """현재 지도 영역 내의 모든 병원을 조회합니다 (PostGIS 공간 쿼리 사용)"""
     try:
-        logger.info(f"병원 검색 요청 (PostGIS): sw({bounds.sw_lat}, {bounds.sw_lng}), "
-                   f"ne({bounds.ne_lat}, {bounds.ne_lng}), department={bounds.department}")
+        started = time.monotonic()
+        hospital_index = asyncio.run(fetch())
+        logger.info("✓ 병원 인덱스 적재 완료 (fork 전): 병원 %s개, 진료과목 %s개 (%.2f초)",
+                   len(hospital_index), len(hospital_index.departments), time.monotonic() - started)
+    except Exception as e:
+        logger.error("병원 인덱스 적재 실패 (fork 전): %s. 워커에서 다시 적재합니다.", e)
+
+async def refresh_hospital_index_periodically():
+    """
+    병원 인덱스를 적재하고 HOSPITAL_INDEX_REFRESH_SECONDS마다 다시 적재합니다 (적재 전에는 RPC로 검색)
+
+    fork 전에 적재된 인덱스가 있으면 첫 주기까지 그대로 공유합니다.
+    재적재는 워커마다 따로 실행되므로 이후 인덱스 메모리와 조회량은 워커 수에 비례합니다.
+    """
+    global hospital_index
+
+    if hospital_index is not None:
+        await asyncio.sleep(max(60, HOSPITAL_INDEX_REFRESH_SECONDS))
+
+    while True:
+        try:
+            started = time.monotonic()
+            hospital_index = await HospitalIndex.fetch(db)
+            # 인덱스 기준으로 다시 집계하도록 이전 데이터로 만든 타일/클러스터 캐시 비움
+            hospital_tile_cache.clear()
+            logger.info("병원 인덱스 적재 완료: 병원 %s개, 진료과목 %s개 (%.2f초)",
+                       len(hospital_index), len(hospital_index.departments), time.monotonic() - started)
+        except Exception as e:
+            logger.error("병원 인덱스 적재 실패: %s", e)
+        await asyncio.sleep(max(60, HOSPITAL_INDEX_REFRESH_SECONDS))
+
+hospital_index_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def start_hospital_index():
+    """HOSPITAL_INDEX_ENABLED=true이면 백그라운드에서 병원 인덱스를 적재합니다"""
+    global hospital_index_task
+    if not HOSPITAL_INDEX_ENABLED:
+        if HOSPITAL_CLUSTER_MAX_ZOOM >= HOSPITAL_CLUSTER_MIN_ZOOM:
+            logger.warning("병원 인덱스 없이 클러스터 응답 사용: 넓은 타일은 RPC %d페이지(%d개)까지만 집계합니다 "
+                           "(HOSPITAL_INDEX_ENABLED=true 권장)",
+                           HOSPITAL_CLUSTER_MAX_PAGES, HOSPITAL_CLUSTER_MAX_PAGES * HOSPITAL_STREAM_PAGE_SIZE)
+        return
+    if np is None:
+        logger.error("HOSPITAL_INDEX_ENABLED=true 설정에는 numpy가 필요합니다. RPC로 검색합니다.")
+        return
+    hospital_index_task = asyncio.create_task(refresh_hospital_index_periodically())
+
+@app.on_event("shutdown")
+async def stop_hospital_index():
+    """병원 인덱스 갱신 작업 중지"""
+    if hospital_index_task is not None:
+        hospital_index_task.cancel()
+
+class HospitalSearchService:
+    """
+    타일 기반 병원 검색 서비스
+
+    지도 영역을 고정된 타일로 나누고 (타일, 진료과목, 전문의 필터)별로 병원 목록을 캐시합니다.
+    지도를 조금 움직여도 같은 타일을 재사용하며, 같은 타일을 동시에 요청하면 한 번만 조회합니다.
+    병원 인덱스(hospital_index)가 적재되어 있으면 타일 없이 메모리에서 바로 검색합니다.
+    """
+
+    def __init__(self, database: SupabaseGateway, cache: LRUByteCache, flight: SingleFlight):
+        self.db = database
+        self.cache = cache
+        self.flight = flight  # 같은 타일 동시 조회 합치기
+
+    @staticmethod
+    def get_tile_zoom(bounds: 'HospitalBounds') -> Optional[int]:
+        """
+        영역 크기에 맞는 타일 줌 (가로/세로 중 긴 쪽이 타일 1~2개 길이 → 축마다 최대 3개, 전체 최대 9개)
+
+        Returns:
+            타일 줌 또는 None (HOSPITAL_TILE_MIN_ZOOM 타일로도 너무 넓은 영역)
+        """
+        # 가로/세로를 메르카토르 좌표(0~1) 길이로 비교 (세로로 긴 화면도 타일 수가 늘지 않도록)
+        width = (bounds.ne_lng - bounds.sw_lng) / 360.0
+        height = lat_to_mercator_y(bounds.sw_lat) - lat_to_mercator_y(bounds.ne_lat)
+        span = max(width, height, 1e-12)
+        zoom = int(math.floor(math.log2(1.0 / span))) + 1
+        if zoom < HOSPITAL_TILE_MIN_ZOOM:
+            return None
+        return min(zoom, HOSPITAL_TILE_MAX_ZOOM)
+
+    async def search(self, bounds: 'HospitalBounds') -> List[Dict[str, Any]]:
+        """영역 내 병원 목록 (타일 캐시에서 조립한 뒤 요청 영역으로 필터링)"""
+        department = bounds.department or ''
+        if hospital_index is not None:
+            return hospital_index.search(
+                bounds.sw_lng, bounds.sw_lat, bounds.ne_lng, bounds.ne_lat, department, bounds.has_specialist
+            )
+
+        zoom = self.get_tile_zoom(bounds)
+
+        if zoom is None:
+            # 넓은 영역은 타일 수가 많아지므로 요청 영역을 직접 조회
+            return await self._fetch_all(
+                bounds.sw_lng, bounds.sw_lat, bounds.ne_lng, bounds.ne_lat, department, bounds.has_specialist
+            )
+
+        x_range = range(lng_to_tile_x(bounds.sw_lng, zoom), lng_to_tile_x(bounds.ne_lng, zoom) + 1)
+        y_range = range(lat_to_tile_y(bounds.ne_lat, zoom), lat_to_tile_y(bounds.sw_lat, zoom) + 1)
+        tiles = await asyncio.gather(*(
+            self.get_tile(zoom, x, y, department, bounds.has_specialist)
+            for x in x_range for y in y_range
+        ))
+
+        hospitals = []
+        seen = set()
+        for tile in tiles:
+            hospitals.extend(self._filter_tile(tile, bounds, seen))
+
+        return hospitals
+
+    async def iter_search(self, bounds: 'HospitalBounds'):
+        """
+        영역 내 병원 목록을 조회되는 대로 나눠서 반환 (스트리밍 응답용 비동기 제너레이터)
+
+        넓은 영역은 RPC를 ykiho 순 페이지로 나눠 조회하고, 타일 영역은 먼저 끝난 타일부터 반환하므로
+        영역 크기와 관계없이 한 번에 한 페이지(또는 타일)만 메모리에 둡니다.
+        """
+        department = bounds.department or ''
+        zoom = self.get_tile_zoom(bounds)
+
+        if zoom is None or hospital_index is not None:
+            async for page in self._iter_area_pages(
+                bounds.sw_lng, bounds.sw_lat, bounds.ne_lng, bounds.ne_lat, department, bounds.has_specialist
+            ):
+                yield page
+            return
+
+        x_range = range(lng_to_tile_x(bounds.sw_lng, zoom), lng_to_tile_x(bounds.ne_lng, zoom) + 1)
+        y_range = range(lat_to_tile_y(bounds.ne_lat, zoom), lat_to_tile_y(bounds.sw_lat, zoom) + 1)
+        tasks = [
+            asyncio.ensure_future(self.get_tile(zoom, x, y, department, bounds.has_specialist))
+            for x in x_range for y in y_range
+        ]
+
+        seen = set()
+        try:
+            for next_tile in asyncio.as_completed(tasks):
+                hospitals = self._filter_tile(await next_tile, bounds, seen)
+                if hospitals:
+                    yield hospitals
+        finally:
+            # 클라이언트 연결이 끊기면 남은 대기 작업 정리 (타일 조회 자체는 shield로 계속 진행되어 캐시에 저장)
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _filter_tile(tile: List[Dict[str, Any]], bounds: 'HospitalBounds', seen: set) -> List[Dict[str, Any]]:
+        """타일 경계에 걸친 병원 중복 제거(seen에 ykiho 기록) + 요청 영역 밖 병원 제외"""
+        hospitals = []
+        for hospital in tile:
+            if (bounds.sw_lng <= hospital['xpos'] <= bounds.ne_lng and
+                    bounds.sw_lat <= hospital['ypos'] <= bounds.ne_lat and
+                    hospital['ykiho'] not in seen):
+                seen.add(hospital['ykiho'])
+                hospitals.append(hospital)
+        return hospitals
+
+    async def get_tile(self, zoom: int, x: int, y: int, department: str, has_specialist: bool) -> List[Dict[str, Any]]:
+        """타일 하나의 병원 목록 (캐시 → 조회 중인 작업 → 새 조회 순)"""
+        cache_key = f"{zoom}/{x}/{y}:{department}:{int(has_specialist)}"
+        return await self._get_or_load(
+            cache_key, lambda: self._load_tile(cache_key, zoom, x, y, department, has_specialist)
+        )
+
+    async def _get_or_load(self, cache_key: str, load):
+        """캐시 → 조회 중인 작업 → 공유 캐시 → 새 조회(load()) 순으로 값 반환"""
+        cached_value = self.cache.get(cache_key)
+        if cached_value is not None:
+            return cached_value
+
+        return await self.flight.do(cache_key, lambda: self._load_shared(cache_key, load))
+
+    async def _load_shared(self, cache_key: str, load):
+        """공유 캐시에 있으면 메모리 캐시에 채우고 반환, 없으면 load() 결과를 공유 캐시에도 저장"""
+        if shared_cache is None:
+            return await load()
+
+        shared_key = f"hospital_tile:{cache_key}"
+        shared_value = await shared_cache.get(shared_key)
+        if shared_value is not None:
+            value = json.loads(shared_value)
+            self.cache.set(cache_key, value, len(shared_value))
+            return value
+
+        value = await load()
+        await shared_cache.set(
+            shared_key, json.dumps(value, ensure_ascii=False).encode('utf-8'), HOSPITAL_TILE_CACHE_TTL_SECONDS
+        )
+        return value
+
+    @staticmethod
+    def get_cluster_zoom(bounds: 'HospitalBounds') -> Optional[int]:
+        """클러스터 모드 타일 줌 (zoom이 없거나 HOSPITAL_CLUSTER_MAX_ZOOM보다 크면 None → 개별 병원 응답)"""
+        if bounds.zoom is None or bounds.zoom > HOSPITAL_CLUSTER_MAX_ZOOM:
+            return None
+        return max(bounds.zoom, HOSPITAL_CLUSTER_MIN_ZOOM)
+
+    async def search_clusters(self, bounds: 'HospitalBounds', zoom: int) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        영역 내 병원을 격자 셀별로 집계
+
+        Returns:
+            {'clusters': [셀 집계...], 'hospitals': [작은 셀의 원본 병원 행...], 'truncated': 페이지 제한으로 일부만 집계한 타일 여부}
+            (셀 중심/병원 좌표가 요청 영역 안인 것만)
+        """
+        department = bounds.department or ''
+        x_range = range(lng_to_tile_x(bounds.sw_lng, zoom), lng_to_tile_x(bounds.ne_lng, zoom) + 1)
+        y_range = range(lat_to_tile_y(bounds.ne_lat, zoom), lat_to_tile_y(bounds.sw_lat, zoom) + 1)
+        tiles = await asyncio.gather(*(
+            self.get_cluster_tile(zoom, x, y, department, bounds.has_specialist)
+            for x in x_range for y in y_range
+        ))
+
+        def in_bounds(lng: float, lat: float) -> bool:
+            return bounds.sw_lng <= lng <= bounds.ne_lng and bounds.sw_lat <= lat <= bounds.ne_lat
+
+        return {
+            'clusters': [c for tile in tiles for c in tile['clusters'] if in_bounds(c['lng'], c['lat'])],
+            'hospitals': [h for tile in tiles for h in tile['hospitals'] if in_bounds(h['xpos'], h['ypos'])],
+            'truncated': any(tile.get('truncated') for tile in tiles)
+        }
+
+    async def get_cluster_tile(
+        self,
+        zoom: int,
+        x: int,
+        y: int,
+        department: str,
+        has_specialist: bool
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """타일 하나의 클러스터 집계 (캐시 → 조회 중인 작업 → 새 집계 순)"""
+        cache_key = f"cluster:{zoom}/{x}/{y}:{department}:{int(has_specialist)}"
+        return await self._get_or_load(
+            cache_key, lambda: self._load_cluster_tile(cache_key, zoom, x, y, department, has_specialist)
+        )
+
+    async def _load_cluster_tile(
+        self,
+        cache_key: str,
+        zoom: int,
+        x: int,
+        y: int,
+        department: str,
+        has_specialist: bool
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        타일 하나의 병원을 (zoom + HOSPITAL_CLUSTER_CELL_ZOOM_OFFSET) 타일 셀로 집계 후 캐시에 저장
+
+        타일 영역은 페이지 단위로 조회하며, 경계선 위 병원은 좌표가 속한 타일에서만 집계합니다.
+        병원 수가 HOSPITAL_CLUSTER_MIN_SIZE 이하인 셀은 집계 대신 원본 행을 보관합니다.
 
-        # PostGIS 공간 쿼리를 사용하는 RPC 함수 호출
-        result = supabase.rpc(
+        병원 인덱스가 없으면 HOSPITAL_CLUSTER_MAX_PAGES 페이지까지만 조회하고 (전국 z5~6 타일은 수십 페이지)
+        그 이상 남은 타일은 'truncated': True로 표시합니다 (표시된 채로 캐시하여 같은 조회를 반복하지 않음).
+        """
+        cell_zoom = zoom + HOSPITAL_CLUSTER_CELL_ZOOM_OFFSET
+        cells: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        pages = 0
+        truncated = False
+
+        async for page in self._iter_area_pages(*tile_bounds(zoom, x, y), department, has_specialist):
+            for hospital in page:
+                lng, lat = hospital['xpos'], hospital['ypos']
+                if lng is None or lat is None:
+                    continue
+                if lng_to_tile_x(lng, zoom) != x or lat_to_tile_y(lat, zoom) != y:
+                    continue
+
+                cell = cells.setdefault(
+                    (lng_to_tile_x(lng, cell_zoom), lat_to_tile_y(lat, cell_zoom)),
+                    {'count': 0, 'specialist_count': 0, 'lng_sum': 0.0, 'lat_sum': 0.0, 'types': {}, 'hospitals': []}
+                )
+                cell['count'] += 1
+                cell['specialist_count'] += 1 if hospital.get('has_specialist') else 0
+                cell['lng_sum'] += lng
+                cell['lat_sum'] += lat
+                hospital_type = hospital.get('clcdnm') or '기타'
+                cell['types'][hospital_type] = cell['types'].get(hospital_type, 0) + 1
+                if cell['count'] <= HOSPITAL_CLUSTER_MIN_SIZE:
+                    cell['hospitals'].append(hospital)
+                else:
+                    cell['hospitals'] = []
+
+            pages += 1
+            if hospital_index is None and pages >= HOSPITAL_CLUSTER_MAX_PAGES and len(page) >= HOSPITAL_STREAM_PAGE_SIZE:
+                # 마지막으로 허용된 페이지가 가득 찼으면 남은 병원이 있을 수 있음
+                truncated = True
+                break
+
+        tile = {'clusters': [], 'hospitals': []}
+        if truncated:
+            tile['truncated'] = True
+            logger.warning("병원 클러스터 타일 %s: RPC %d페이지 제한으로 일부 병원만 집계 (HOSPITAL_INDEX_ENABLED=true 권장)",
+                           cache_key, HOSPITAL_CLUSTER_MAX_PAGES)
+        for (cell_x, cell_y), cell in cells.items():
+            if cell['count'] <= HOSPITAL_CLUSTER_MIN_SIZE:
+                tile['hospitals'].extend(cell['hospitals'])
+                continue
+            tile['clusters'].append({
+                'cell': f"{cell_zoom}/{cell_x}/{cell_y}",
+                'lng': round(cell['lng_sum'] / cell['count'], 6),
+                'lat': round(cell['lat_sum'] / cell['count'], 6),
+                'count': cell['count'],
+                'specialist_count': cell['specialist_count'],
+                'types': cell['types']
+            })
+
+        self.cache.set(cache_key, tile, len(json.dumps(tile, ensure_ascii=False).encode('utf-8')))
+        return tile
+
+    async def _load_tile(
+        self,
+        cache_key: str,
+        zoom: int,
+        x: int,
+        y: int,
+        department: str,
+        has_specialist: bool
+    ) -> List[Dict[str, Any]]:
+        """타일 영역 조회 후 캐시에 저장 (페이지 단위로 모두 조회하므로 PostgREST 최대 행 수에서 잘리지 않음)"""
+        hospitals = await self._fetch_all(*tile_bounds(zoom, x, y), department, has_specialist)
+        self.cache.set(cache_key, hospitals, len(json.dumps(hospitals, ensure_ascii=False).encode('utf-8')))
+        return hospitals
+
+    async def _fetch_all(
+        self,
+        sw_lng: float,
+        sw_lat: float,
+        ne_lng: float,
+        ne_lat: float,
+        department: str,
+        has_specialist: bool
+    ) -> List[Dict[str, Any]]:
+        """영역 내 병원 전체 (_iter_area_pages의 페이지를 모두 모음)"""
+        hospitals = []
+        async for page in self._iter_area_pages(sw_lng, sw_lat, ne_lng, ne_lat, department, has_specialist):
+            hospitals.extend(page)
+        return hospitals
+
+    async def _iter_area_pages(
+        self,
+        sw_lng: float,
+        sw_lat: float,
+        ne_lng: float,
+        ne_lat: float,
+        department: str,
+        has_specialist: bool
+    ):
+        """영역 내 병원을 페이지 단위로 반환 (인덱스가 있으면 한 번에, 없으면 RPC를 ykiho 순 페이지로 조회)"""
+        if hospital_index is not None:
+            yield hospital_index.search(sw_lng, sw_lat, ne_lng, ne_lat, department, has_specialist)
+            return
+
+        offset = 0
+        while True:
+            page = await self._fetch_area(
+                sw_lng, sw_lat, ne_lng, ne_lat, department, has_specialist,
+                offset=offset, limit=HOSPITAL_STREAM_PAGE_SIZE
+            )
+            if page:
+                yield page
+            if len(page) < HOSPITAL_STREAM_PAGE_SIZE:
+                return
+            offset += HOSPITAL_STREAM_PAGE_SIZE
+
+    async def _fetch_area(
+        self,
+        sw_lng: float,
+        sw_lat: float,
+        ne_lng: float,
+        ne_lat: float,
+        department: str,
+        has_specialist: bool,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        PostGIS 공간 쿼리 RPC로 영역 내 병원 조회 (offset/limit을 주면 ykiho 순 한 페이지만)
+
+        limit 없이 조회하면 PostgREST 최대 행 수(max-rows)에서 잘릴 수 있으므로 전체 목록은 _fetch_all로 조회합니다.
+        """
+        query = self.db.client.rpc(
             'search_hospitals_spatial',
             {
-                'p_sw_lng': bounds.sw_lng,
-                'p_sw_lat': bounds.sw_lat,
-                'p_ne_lng': bounds.ne_lng,
-                'p_ne_lat': bounds.ne_lat,
-                'p_department': bounds.department or '',
-                'p_has_specialist': bounds.has_specialist
+                'p_sw_lng': sw_lng,
+                'p_sw_lat': sw_lat,
+                'p_ne_lng': ne_lng,
+                'p_ne_lat': ne_lat,
+                'p_department': department,
+                'p_has_specialist': has_specialist
             }
-        ).execute()
+        )
+        if limit is not None:
+            query = query.order('ykiho').range(offset or 0, (offset or 0) + limit - 1)
+
+        result = await self.db.execute(query, 'search_hospitals_spatial')
+        return result.data if result.data else []
+
+# 전역 변수: 병원 검색 서비스
+hospital_search_service = HospitalSearchService(db, hospital_tile_cache, hospital_tile_flight)
+
+async def stream_hospitals(bounds: HospitalBounds):
+    """
+    병원 검색 결과를 NDJSON으로 생성 (한 줄에 병원 하나)
+
+    마지막 줄은 {"type": "summary", "success": true, "count": ..., "specialist_count": ...} 요약 레코드이며,
+    도중에 오류가 나면 {"type": "summary", "success": false, "error": ...}로 끝납니다.
+    """
+    count = 0
+    specialist_count = 0
+    try:
+        async for hospitals in hospital_search_service.iter_search(bounds):
+            count += len(hospitals)
+            specialist_count += sum(1 for h in hospitals if h.get('has_specialist'))
+            yield b''.join(json.dumps(h, ensure_ascii=False).encode('utf-8') + b'\n' for h in hospitals)
 
-        hospitals = result.data if result.data else []
+        logger.info("병원 검색 결과 (스트리밍): 총 %d개 병원 (전문의 있는 병원: %d개)", count, specialist_count)
+        summary = {"type": "summary", "success": True, "count": count, "specialist_count": specialist_count}
+    except Exception as e:
+        logger.error("병원 검색 스트리밍 오류: %s", e)
+        summary = {"type": "summary", "success": False, "count": count, "error": f"병원 검색 중 오류 발생: {str(e)}"}
+
+    yield json.dumps(summary, ensure_ascii=False).encode('utf-8') + b'\n'
+
+# 병원 검색 엔드포인트
+@app.post("/getHospitals")
+async def get_hospitals(bounds: HospitalBounds, request: Request):
+    """
+    현재 지도 영역 내의 모든 병원을 조회합니다 (PostGIS 공간 쿼리 + 타일 캐시)
+
+    zoom이 HOSPITAL_CLUSTER_MAX_ZOOM 이하면 격자 셀별 집계(clusters)와 작은 셀의 병원(hospitals)을 반환하고,
+    ?stream=ndjson 또는 Accept: application/x-ndjson이면 결과를 NDJSON으로 스트리밍합니다 (stream_hospitals 참고).
+    """
+    cluster_zoom = hospital_search_service.get_cluster_zoom(bounds)
+    if cluster_zoom is not None:
+        try:
+            with metrics.measure('hospital_search'):
+                result = await hospital_search_service.search_clusters(bounds, cluster_zoom)
+            count = sum(c['count'] for c in result['clusters']) + len(result['hospitals'])
+            specialist_count = (sum(c['specialist_count'] for c in result['clusters']) +
+                                sum(1 for h in result['hospitals'] if h.get('has_specialist')))
+
+            logger.info("병원 클러스터 결과: zoom=%s, 총 %d개 병원 (클러스터 %d개, 개별 병원 %d개%s)",
+                        bounds.zoom, count, len(result['clusters']), len(result['hospitals']),
+                        ", 일부 타일 페이지 제한" if result['truncated'] else "")
+
+            return render_json_response({
+                "success": True,
+                "mode": "cluster",
+                "count": count,
+                "specialist_count": specialist_count,
+                "truncated": result['truncated'],
+                "clusters": result['clusters'],
+                "hospitals": result['hospitals']
+            })
+        except Exception as e:
+            logger.error("병원 클러스터 조회 오류: %s", e)
+            raise HTTPException(status_code=500, detail=f"병원 검색 중 오류 발생: {str(e)}")
+
+    if (request.query_params.get('stream') == 'ndjson' or
+            HOSPITAL_NDJSON_MEDIA_TYPE in request.headers.get('accept', '')):
+        logger.info("병원 검색 요청 (스트리밍): sw(%s, %s), ne(%s, %s), department=%s",
+                    bounds.sw_lat, bounds.sw_lng, bounds.ne_lat, bounds.ne_lng, bounds.department)
+        return StreamingResponse(stream_hospitals(bounds), media_type=HOSPITAL_NDJSON_MEDIA_TYPE)
+
+    try:
+        logger.info("병원 검색 요청 (PostGIS): sw(%s, %s), ne(%s, %s), department=%s",
+                    bounds.sw_lat, bounds.sw_lng, bounds.ne_lat, bounds.ne_lng, bounds.department)
+
+        with metrics.measure('hospital_search'):
+            hospitals = await hospital_search_service.search(bounds)
 
         # 전문의가 있는 병원 수 계산
         specialist_count = sum(1 for h in hospitals if h.get('has_specialist'))
 
-        logger.info(f"병원 검색 결과 (PostGIS): 총 {len(hospitals)}개 병원 "
-                   f"(전문의 있는 병원: {specialist_count}개)")
+        logger.info("병원 검색 결과 (PostGIS): 총 %d개 병원 (전문의 있는 병원: %d개)", len(hospitals), specialist_count)
 
-        return {
+        return render_json_response({
             "success": True,
             "count": len(hospitals),
             "hospitals": hospitals
-        }
+        })
 
     except Exception as e:
-        logger.error(f"병원 검색 오류 (PostGIS): {str(e)}")
+        logger.error("병원 검색 오류 (PostGIS): %s", e)
         raise HTTPException(status_code=500, detail=f"병원 검색 중 오류 발생: {str(e)}")
 
 # 진료과목 목록 조회 엔드포인트
 @app.get("/getDepartments")
 async def get_departments():
-    """진료과목 목록을 반환합니다 (하드코딩)"""
+    """진료과목 목록을 반환합니다 (병원 인덱스가 있으면 인덱스의 진료과목, 없으면 하드코딩 목록)"""
     try:
         logger.info("진료과목 목록 조회 요청")
 
+        if hospital_index is not None:
+            return {
+                "success": True,
+                "count": len(hospital_index.departments),
+                "departments": hospital_index.departments
+            }
+
         # 하드코딩된 진료과목 목록 (데이터베이스에서 추출한 유니크 값)
         departments = [
             '가정의학과', '결핵과', '구강내과', '구강병리과', '구강악안면외과',
@@ -773,7 +4772,7 @@ async def get_departments():
             '한방응급', '한방재활의학과', '핵의학과'
         ]
 
-        logger.info(f"진료과목 목록 조회 결과: {len(departments)}개 진료과목")
+        logger.info("진료과목 목록 조회 결과: %d개 진료과목", len(departments))
 
         return {
             "success": True,
@@ -782,105 +4781,216 @@ async def get_departments():
         }
 
     except Exception as e:
-        logger.error(f"진료과목 목록 조회 오류: {str(e)}")
+        logger.error("진료과목 목록 조회 오류: %s", e)
         raise HTTPException(status_code=500, detail=f"진료과목 목록 조회 중 오류 발생: {str(e)}")
 
-@app.get("/getHospitalDetail/{ykiho}")
-async def get_hospital_detail(ykiho: str):
-    """특정 병원의 상세 정보를 조회합니다"""
-    try:
-        result_data = {}
-
-        # 1. hospital_basic에서 기본 정보 조회
-        basic_result = supabase.table('hospital_basic').select('*').eq('ykiho', ykiho).execute()
-        if basic_result.data and len(basic_result.data) > 0:
-            basic_info = basic_result.data[0]
-            result_data['basic'] = {
-                'yadmnm': basic_info.get('yadmnm', ''),
-                'clcdnm': basic_info.get('clcdnm', ''),
-                'addr': basic_info.get('addr', ''),
-                'telno': basic_info.get('telno', ''),
-                'hospurl': basic_info.get('hospurl', ''),
-                'estbdd': basic_info.get('estbdd', '')
-            }
-        else:
-            result_data['basic'] = {}
+class HospitalDetailBatchRequest(BaseModel):
+    ykihos: List[str]  # 조회할 병원 ykiho 목록
 
-        # 2. hospital_departments에서 진료과목 및 전문의 수 조회 (전문의 수 1이상만)
-        departments = []
-        offset = 0
-        page_size = 1000
+class HospitalDetailService:
+    """
+    병원 상세 정보 조회 서비스
 
-        while True:
-            dept_result = supabase.table('hospital_departments').select('dgsbjtcdnm, dgsbjtprsdrcnt')\
-                .eq('ykiho', ykiho)\
-                .range(offset, offset + page_size - 1)\
-                .execute()
-
-            if dept_result.data:
-                departments.extend(dept_result.data)
-                if len(dept_result.data) < page_size:
-                    break
-                offset += page_size
-            else:
-                break
+    상세 정보 4개 테이블(기본/진료과목/보유장비/진료시간)을 동시에 조회하고,
+    여러 병원은 ykiho in 쿼리로 한 번에 가져옵니다. 조립된 상세 정보는 ykiho별로 TTL 캐시에 저장합니다.
+    """
+
+    def __init__(self, database: SupabaseGateway, cache: LRUByteCache, flight: SingleFlight):
+        self.db = database
+        self.cache = cache
+        self.flight = flight  # 같은 병원 동시 조회 합치기
+
+    async def get_detail(self, ykiho: str) -> bytes:
+        """단일 병원 상세 정보 (JSON 바이트)"""
+        return (await self.get_details([ykiho]))[ykiho]
+
+    async def get_details(self, ykihos: List[str]) -> Dict[str, bytes]:
+        """
+        여러 병원 상세 정보 조회 (캐시 우선)
+
+        Returns:
+            ykiho → 상세 정보 JSON 바이트 (요청 순서 유지, 중복 제거)
+        """
+        details: Dict[str, Optional[bytes]] = {ykiho: self.cache.get(ykiho) for ykiho in dict.fromkeys(ykihos)}
+        missing = [ykiho for ykiho, detail in details.items() if detail is None]
+
+        if missing:
+            logger.info("병원 상세 정보 조회 (캐시 미스): %d건", len(missing))
+            chunks = [
+                tuple(missing[i:i + HOSPITAL_DETAIL_QUERY_CHUNK])
+                for i in range(0, len(missing), HOSPITAL_DETAIL_QUERY_CHUNK)
+            ]
+            # 같은 병원(묶음)을 동시에 요청하면 조회는 한 번만 실행
+            for fetched in await asyncio.gather(*(
+                self.flight.do(chunk, lambda chunk=chunk: self._load_details(chunk)) for chunk in chunks
+            )):
+                details.update(fetched)
+
+        return details
+
+    async def _load_details(self, ykihos: Tuple[str, ...]) -> Dict[str, bytes]:
+        """ykiho 묶음 상세 정보 조회 후 JSON 바이트로 캐시에 저장 (공유 캐시 우선)"""
+        serialized_details = {}
+        if shared_cache is not None:
+            shared_values = await shared_cache.get_many([f"hospital_detail:{ykiho}" for ykiho in ykihos])
+            for ykiho in ykihos:
+                serialized = shared_values.get(f"hospital_detail:{ykiho}")
+                if serialized is not None:
+                    self.cache.set(ykiho, serialized, len(serialized))
+                    serialized_details[ykiho] = serialized
+
+        missing = [ykiho for ykiho in ykihos if ykiho not in serialized_details]
+        if not missing:
+            return serialized_details
+
+        fetched = {}
+        for ykiho, detail in (await self._fetch_details(missing)).items():
+            serialized = json.dumps(detail, ensure_ascii=False).encode('utf-8')
+            self.cache.set(ykiho, serialized, len(serialized))
+            fetched[ykiho] = serialized
+
+        if shared_cache is not None:
+            await shared_cache.set_many(
+                {f"hospital_detail:{ykiho}": serialized for ykiho, serialized in fetched.items()},
+                HOSPITAL_DETAIL_CACHE_TTL_SECONDS
+            )
+        serialized_details.update(fetched)
+        return serialized_details
+
+    async def _fetch_details(self, ykihos: List[str]) -> Dict[str, Dict[str, Any]]:
+        """ykiho 묶음의 상세 정보 4개 테이블을 동시에 조회하여 병원별로 조립"""
+        basic_rows, department_rows, equipment_rows, detail_rows = await asyncio.gather(
+            self._fetch_rows('hospital_basic', '*', ykihos, ('ykiho',)),
+            self._fetch_rows('hospital_departments', 'ykiho, dgsbjtcdnm, dgsbjtprsdrcnt', ykihos, ('ykiho', 'dgsbjtcdnm')),
+            self._fetch_rows('hospital_medical_equipment', 'ykiho, oftcdnm, oftcnt', ykihos, ('ykiho', 'oftcdnm')),
+            self._fetch_rows('hospital_detail', '*', ykihos, ('ykiho',))
+        )
+
+        basic_by_ykiho = {row['ykiho']: row for row in basic_rows}
+        detail_by_ykiho = {row['ykiho']: row for row in detail_rows}
+        departments: Dict[str, List[Dict[str, Any]]] = {ykiho: [] for ykiho in ykihos}
+        equipment: Dict[str, List[Dict[str, Any]]] = {ykiho: [] for ykiho in ykihos}
+
+        for row in department_rows:
+            departments[row['ykiho']].append({
+                'dgsbjtcdnm': row.get('dgsbjtcdnm'),
+                'dgsbjtprsdrcnt': row.get('dgsbjtprsdrcnt')
+            })
+        for row in equipment_rows:
+            equipment[row['ykiho']].append({
+                'oftcdnm': row.get('oftcdnm'),
+                'oftcnt': row.get('oftcnt')
+            })
+
+        return {
+            ykiho: {
+                'basic': self._format_basic(basic_by_ykiho.get(ykiho)),
+                'departments': departments[ykiho],
+                'equipment': equipment[ykiho],
+                'detail': self._format_detail(detail_by_ykiho.get(ykiho))
+            }
+            for ykiho in ykihos
+        }
 
-        result_data['departments'] = departments
+    async def _fetch_rows(
+        self, table_name: str, columns: str, ykihos: List[str], order_columns: Tuple[str, ...]
+    ) -> List[Dict[str, Any]]:
+        """
+        ykiho in 조건으로 테이블 전체 행 조회 (1000행 단위 페이지)
 
-        # 3. hospital_medical_equipment에서 보유장비 조회
-        equipment = []
+        order_columns는 테이블에서 유일한 키여야 합니다 (정렬 값이 같은 행은 페이지 경계에서 빠지거나 중복될 수 있음).
+        """
+        rows = []
         offset = 0
+        page_size = 1000
 
         while True:
-            equip_result = supabase.table('hospital_medical_equipment').select('oftcdnm, oftcnt')\
-                .eq('ykiho', ykiho)\
-                .range(offset, offset + page_size - 1)\
-                .execute()
-
-            if equip_result.data:
-                equipment.extend(equip_result.data)
-                if len(equip_result.data) < page_size:
+            query = self.db.table(table_name).select(columns)
+            query = query.eq('ykiho', ykihos[0]) if len(ykihos) == 1 else query.in_('ykiho', ykihos)
+            for column in order_columns:
+                query = query.order(column)
+            result = await self.db.execute(query.range(offset, offset + page_size - 1), table_name)
+
+            if result.data:
+                rows.extend(result.data)
+                if len(result.data) < page_size:
                     break
                 offset += page_size
             else:
                 break
 
-        result_data['equipment'] = equipment
-
-        # 4. hospital_detail에서 진료시간 및 주차 정보 조회
-        detail_result = supabase.table('hospital_detail').select('*').eq('ykiho', ykiho).execute()
-        if detail_result.data and len(detail_result.data) > 0:
-            detail_info = detail_result.data[0]
-            result_data['detail'] = {
-                'trmtMonStart': detail_info.get('trmtmonstart', ''),
-                'trmtMonEnd': detail_info.get('trmtmonend', ''),
-                'trmtTueStart': detail_info.get('trmttuestart', ''),
-                'trmtTueEnd': detail_info.get('trmttueend', ''),
-                'trmtWedStart': detail_info.get('trmtwedstart', ''),
-                'trmtWedEnd': detail_info.get('trmtwedend', ''),
-                'trmtThuStart': detail_info.get('trmtthustart', ''),
-                'trmtThuEnd': detail_info.get('trmtthuend', ''),
-                'trmtFriStart': detail_info.get('trmtfristart', ''),
-                'trmtFriEnd': detail_info.get('trmtfriend', ''),
-                'trmtSatStart': detail_info.get('trmtsatstart', ''),
-                'trmtSatEnd': detail_info.get('trmtsatend', ''),
-                'trmtSunStart': detail_info.get('trmtsunstart', ''),
-                'trmtSunEnd': detail_info.get('trmtsunend', ''),
-                'lunchWeek': detail_info.get('lunchweek', ''),
-                'lunchSat': detail_info.get('lunchsat', ''),
-                'parkXpnsYn': detail_info.get('parkxpnsyn', ''),
-                'parkQty': detail_info.get('parkqty', '')
-            }
-        else:
-            result_data['detail'] = {}
+        return rows
 
+    @staticmethod
+    def _format_basic(basic_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """hospital_basic 행 → 기본 정보"""
+        if not basic_info:
+            return {}
         return {
-            "success": True,
-            "data": result_data
+            'yadmnm': basic_info.get('yadmnm', ''),
+            'clcdnm': basic_info.get('clcdnm', ''),
+            'addr': basic_info.get('addr', ''),
+            'telno': basic_info.get('telno', ''),
+            'hospurl': basic_info.get('hospurl', ''),
+            'estbdd': basic_info.get('estbdd', '')
+        }
+
+    @staticmethod
+    def _format_detail(detail_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """hospital_detail 행 → 진료시간 및 주차 정보"""
+        if not detail_info:
+            return {}
+        return {
+            'trmtMonStart': detail_info.get('trmtmonstart', ''),
+            'trmtMonEnd': detail_info.get('trmtmonend', ''),
+            'trmtTueStart': detail_info.get('trmttuestart', ''),
+            'trmtTueEnd': detail_info.get('trmttueend', ''),
+            'trmtWedStart': detail_info.get('trmtwedstart', ''),
+            'trmtWedEnd': detail_info.get('trmtwedend', ''),
+            'trmtThuStart': detail_info.get('trmtthustart', ''),
+            'trmtThuEnd': detail_info.get('trmtthuend', ''),
+            'trmtFriStart': detail_info.get('trmtfristart', ''),
+            'trmtFriEnd': detail_info.get('trmtfriend', ''),
+            'trmtSatStart': detail_info.get('trmtsatstart', ''),
+            'trmtSatEnd': detail_info.get('trmtsatend', ''),
+            'trmtSunStart': detail_info.get('trmtsunstart', ''),
+            'trmtSunEnd': detail_info.get('trmtsunend', ''),
+            'lunchWeek': detail_info.get('lunchweek', ''),
+            'lunchSat': detail_info.get('lunchsat', ''),
+            'parkXpnsYn': detail_info.get('parkxpnsyn', ''),
+            'parkQty': detail_info.get('parkqty', '')
         }
 
+# 전역 변수: 병원 상세 정보 서비스
+hospital_detail_service = HospitalDetailService(db, hospital_detail_cache, hospital_detail_flight)
+
+@app.get("/getHospitalDetail/{ykiho}")
+async def get_hospital_detail(ykiho: str):
+    """특정 병원의 상세 정보를 조회합니다 (4개 테이블 동시 조회, ykiho별 캐시)"""
+    try:
+        detail = await hospital_detail_service.get_detail(ykiho)
+        return Response(content=b'{"success":true,"data":' + detail + b'}', media_type='application/json')
+
+    except Exception as e:
+        logger.error("병원 상세 정보 조회 오류 (ykiho: %s): %s", ykiho, e)
+        raise HTTPException(status_code=500, detail=f"병원 상세 정보 조회 중 오류 발생: {str(e)}")
+
+@app.post("/getHospitalDetails")
+async def get_hospital_details(request: HospitalDetailBatchRequest):
+    """여러 병원의 상세 정보를 한 번에 조회합니다 (목록 화면용)"""
+    if len(request.ykihos) > HOSPITAL_DETAIL_BATCH_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 조회할 수 있는 병원은 최대 {HOSPITAL_DETAIL_BATCH_MAX}개입니다"
+        )
+
+    try:
+        details = await hospital_detail_service.get_details(request.ykihos)
+        data = b','.join(json.dumps(ykiho).encode('utf-8') + b':' + detail for ykiho, detail in details.items())
+        return Response(content=b'{"success":true,"data":{' + data + b'}}', media_type='application/json')
+
     except Exception as e:
-        logger.error(f"병원 상세 정보 조회 오류 (ykiho: {ykiho}): {str(e)}")
+        logger.error("병원 상세 정보 일괄 조회 오류 (%s건): %s", len(request.ykihos), e)
         raise HTTPException(status_code=500, detail=f"병원 상세 정보 조회 중 오류 발생: {str(e)}")
 
 if __name__ == "__main__":
@@ -888,5 +4998,5 @@ if __name__ == "__main__":
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8000"))
 
-    logger.info(f"서버 시작 중... Host: {host}, Port: {port}")
+    logger.info("서버 시작 중... Host: %s, Port: %s", host, port)
     uvicorn.run(app, host=host, port=port)
\ No newline at end of file
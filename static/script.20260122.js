@@ -6,6 +6,9 @@ var options = {
 
 var map = new kakao.maps.Map(container, options);
 
+// 카카오맵 레벨 L → 웹 지도 줌 (줌 = 20 - L, server.py KAKAO_LEVEL_ZOOM_OFFSET과 같은 값)
+var KAKAO_LEVEL_ZOOM_OFFSET = 20;
+
 // 행정구역 경계를 표시하기 위한 전역 변수
 var regionBoundaryPolygons = [];  // 경계 폴리곤 배열 (MultiPolygon 지원)
 var regionCentroidMarker = null;   // 중심점 마커
@@ -24,6 +27,8 @@ var hospitalInfowindow = null;  // 병원 정보창
 var currentSelectedHospital = null;  // 현재 선택된 병원
 var wasDetailPanelOpenBeforeClose = false;  // 사이드바 닫기 전 상세창이 열려있었는지 기록
 var allHospitalsData = [];  // 서버에서 가져온 전체 병원 데이터 (전문의 정보 포함)
+var hospitalClusterData = [];  // 축소 화면에서 서버가 집계한 병원 클러스터 (mode: "cluster")
+var hospitalClusterOverlays = [];  // 클러스터 오버레이 배열
 
 // 사이드바 토글 기능
 function toggleSidebar() {
@@ -128,6 +133,11 @@ function clearHospitalMarkers() {
     }
     hospitalMarkers = [];
 
+    for (var j = 0; j < hospitalClusterOverlays.length; j++) {
+        hospitalClusterOverlays[j].setMap(null);
+    }
+    hospitalClusterOverlays = [];
+
     // 정보창도 닫기
     if (hospitalInfowindow) {
         hospitalInfowindow.close();
@@ -141,14 +151,8 @@ function clearHospitalMarkers() {
 async function searchHospitals() {
     var resultsContent = document.getElementById('hospitalResultsContent');
 
-    // 줌 레벨 체크 (7 초과 시 검색 제한)
+    // 줌 레벨 (7 초과로 축소된 화면은 서버에서 클러스터로 집계하여 응답)
     var zoomLevel = map.getLevel();
-    if (zoomLevel > 7) {
-        resultsContent.innerHTML = '<p style="color: #e74c3c;">지도를 더 확대해주세요.<br>(현재 줌 레벨: ' + zoomLevel + ', 필요: 7 이하)</p>';
-        clearHospitalMarkers();
-        allHospitalsData = [];
-        return;
-    }
 
     resultsContent.innerHTML = '<p style="color: #666;">병원 검색 중...</p>';
 
@@ -182,7 +186,8 @@ async function searchHospitals() {
                 ne_lat: ne.getLat(),
                 ne_lng: ne.getLng(),
                 department: department,
-                has_specialist: false  // 항상 false로 전송
+                has_specialist: false,  // 항상 false로 전송
+                zoom: kakaoLevelToZoom(zoomLevel)
             })
         });
 
@@ -197,7 +202,8 @@ async function searchHospitals() {
         clearHospitalMarkers();
 
         // 4. 전체 병원 데이터를 전역 변수에 저장 (전문의 정보 포함)
-        if (data.success && data.hospitals && data.hospitals.length > 0) {
+        hospitalClusterData = (data.success && data.mode === 'cluster') ? data.clusters : [];
+        if (data.success && data.hospitals && (data.hospitals.length > 0 || hospitalClusterData.length > 0)) {
             allHospitalsData = data.hospitals;
             console.log('전체 병원 데이터 저장 완료:', allHospitalsData.length + '개');
 
@@ -314,12 +320,59 @@ function filterAndDisplayHospitals() {
         // 사이드바에 병원 리스트 표시
         displayHospitalList(filteredHospitals);
 
-    } else {
+    } else if (hospitalClusterData.length === 0) {
         var resultsContent = document.getElementById('hospitalResultsContent');
         resultsContent.innerHTML = '<p style="color: #666;">필터 조건에 맞는 병원이 없습니다.</p>';
+    } else {
+        document.getElementById('hospitalResultsContent').innerHTML = '';
+    }
+
+    // 서버 클러스터 표시
+    if (hospitalClusterData.length > 0) {
+        drawHospitalClusters(onlySpecialist);
     }
 }
 
+// 서버에서 집계한 병원 클러스터 표시 (클릭하면 해당 위치로 확대)
+function drawHospitalClusters(onlySpecialist) {
+    var total = 0;
+
+    hospitalClusterData.forEach(function(cluster) {
+        var count = onlySpecialist ? cluster.specialist_count : cluster.count;
+        if (count === 0) return;
+        total += count;
+
+        var position = new kakao.maps.LatLng(cluster.lat, cluster.lng);
+        var size = count >= 1000 ? 56 : (count >= 100 ? 46 : 36);
+
+        var content = document.createElement('div');
+        content.className = 'hospital-cluster';
+        content.style.width = size + 'px';
+        content.style.height = size + 'px';
+        content.style.lineHeight = size + 'px';
+        content.textContent = count.toLocaleString();
+        content.addEventListener('click', function() {
+            map.setLevel(Math.max(map.getLevel() - 2, 1), {anchor: position});
+        });
+
+        var overlay = new kakao.maps.CustomOverlay({
+            position: position,
+            content: content,
+            yAnchor: 0.5,
+            xAnchor: 0.5
+        });
+        overlay.setMap(map);
+        hospitalClusterOverlays.push(overlay);
+    });
+
+    // 사이드바 상단에 집계 요약 표시
+    var summary = document.createElement('p');
+    summary.style.color = '#666';
+    summary.textContent = '지도에 묶음으로 표시된 병원 ' + total.toLocaleString() + '개 (지도를 확대하면 개별 병원이 표시됩니다)';
+    var resultsContent = document.getElementById('hospitalResultsContent');
+    resultsContent.insertBefore(summary, resultsContent.firstChild);
+}
+
 // 사이드바에 병원 리스트 표시
 function displayHospitalList(hospitals) {
     var resultsContent = document.getElementById('hospitalResultsContent');
@@ -691,7 +744,7 @@ document.addEventListener('DOMContentLoaded', function () {
             this.setAttribute('aria-checked', !isChecked);
 
             // 병원 데이터가 있을 때만 필터링 재실행
-            if (allHospitalsData && allHospitalsData.length > 0) {
+            if ((allHospitalsData && allHospitalsData.length > 0) || hospitalClusterData.length > 0) {
                 console.log('전문의 필터 변경됨:', !isChecked);
                 filterAndDisplayHospitals();
             }
@@ -1447,6 +1500,8 @@ async function queryRegion() {
     }
 
     regionData.level = level;
+    // 표시할 지도 레벨에 맞는 해상도의 경계 요청
+    regionData.zoom = kakaoLevelToZoom(getRegionMapLevel(level));
 
     // 캐시 키 생성
     const cacheKey = getBoundaryCacheKey(sido, sigungu, dong, level);
@@ -1461,7 +1516,7 @@ async function queryRegion() {
 
         if (cachedBoundary) {
             // 캐시된 경계 데이터 사용, 인구 데이터는 항상 새로 조회
-            const response = await fetch('/getRegionPop', {
+            const response = await fetch('/getRegionPop?boundary_encoding=delta', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -1481,7 +1536,7 @@ async function queryRegion() {
             console.log('✓ 캐시된 경계 데이터 사용');
         } else {
             // 캐시에 없으면 전체 데이터 조회
-            const response = await fetch('/getRegionPop', {
+            const response = await fetch('/getRegionPop?boundary_encoding=delta', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -1502,9 +1557,9 @@ async function queryRegion() {
             }
         }
 
-        // 경계 데이터가 있으면 지도에 표시
+        // 경계 데이터가 있으면 지도에 표시 (캐시에는 인코딩된 형태로 저장, 표시 직전에 복원)
         if (result.boundary) {
-            displayRegionBoundary(result.boundary, level);
+            displayRegionBoundary(decodeBoundary(result.boundary), level);
         }
 
         // 그리기 분석과 동일한 형식으로 결과 표시 (PopulationResult 형식)
@@ -1581,26 +1636,78 @@ function moveToCentroid(centroid, level) {
     const centerPosition = new kakao.maps.LatLng(centroid.lat, centroid.lng);
 
     // 레벨별 줌 레벨 설정
-    let zoomLevel;
+    const zoomLevel = getRegionMapLevel(level);
+
+    // 줌 레벨 설정
+    map.setLevel(zoomLevel);
+
+    // 부드러운 이동 (panTo)
+    map.panTo(centerPosition);
+}
+
+/**
+ * 정수 델타 인코딩된 경계를 GeoJSON 좌표 형식으로 복원
+ * 각 링은 [x0, y0, dx1, dy1, ...] 정수 배열이며 누적합 × scale이 좌표, 첫 점을 다시 붙여 링을 닫음
+ * @param {Object} boundary - 서버 경계 데이터 (encoding이 없으면 그대로 반환)
+ * @returns {Object} { type, coordinates, centroid } 형식의 경계 데이터
+ */
+function decodeBoundary(boundary) {
+    if (boundary.encoding !== 'delta') {
+        return boundary;
+    }
+
+    const scale = boundary.scale;
+    const decodeRing = (encoded) => {
+        const ring = [];
+        let x = 0;
+        let y = 0;
+        for (let i = 0; i < encoded.length; i += 2) {
+            x += encoded[i];
+            y += encoded[i + 1];
+            ring.push([x * scale, y * scale]);
+        }
+        if (ring.length > 0) {
+            ring.push(ring[0]);
+        }
+        return ring;
+    };
+    const decodePolygon = (polygon) => polygon.map(decodeRing);
+
+    return {
+        type: boundary.type,
+        coordinates: boundary.type.endsWith('MultiPolygon')
+            ? boundary.coordinates.map(decodePolygon)
+            : decodePolygon(boundary.coordinates),
+        centroid: boundary.centroid
+    };
+}
+
+/**
+ * 행정구역 레벨별 카카오맵 지도 레벨
+ * @param {String} level - 'sido', 'sigungu', 'dong' 중 하나
+ * @returns {Number} 카카오맵 지도 레벨
+ */
+function getRegionMapLevel(level) {
     switch(level) {
         case 'sido':
-            zoomLevel = 10;  // 시/도 레벨 - 넓은 범위
-            break;
+            return 10;  // 시/도 레벨 - 넓은 범위
         case 'sigungu':
-            zoomLevel = 7;   // 시/군/구 레벨 - 중간 범위
-            break;
+            return 7;   // 시/군/구 레벨 - 중간 범위
         case 'dong':
-            zoomLevel = 5;   // 행정동 레벨 - 좁은 범위
-            break;
+            return 5;   // 행정동 레벨 - 좁은 범위
         default:
-            zoomLevel = 8;   // 기본값
+            return 8;   // 기본값
     }
+}
 
-    // 줌 레벨 설정
-    map.setLevel(zoomLevel);
-
-    // 부드러운 이동 (panTo)
-    map.panTo(centerPosition);
+/**
+ * 카카오맵 지도 레벨 → 서버 요청용 웹 지도 줌 (256px 타일 기준)
+ * 카카오맵 레벨 1은 0.25m/px이고 레벨마다 2배이므로, 레벨 3(1m/px)이 위도 37도 부근의 줌 17에 해당합니다.
+ * @param {Number} level - 카카오맵 지도 레벨 (1~14)
+ * @returns {Number} 웹 지도 줌
+ */
+function kakaoLevelToZoom(level) {
+    return KAKAO_LEVEL_ZOOM_OFFSET - level;
 }
 
 /**
@@ -0,0 +1,76 @@
+"""
+server.py 단위 테스트 공통 설정
+
+server.py는 import 시점에 Supabase 환경 변수를 확인하므로 테스트용 값을 먼저 설정합니다
+(클라이언트는 앱 시작 이벤트에서 생성되므로 실제로 연결하지는 않습니다).
+DB 호출이 필요한 테스트는 fake_db 픽스처로 bench/fake_supabase.py 가상 서버에 연결합니다.
+"""
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+os.environ.setdefault("LOG_QUEUE_ENABLED", "false")
+
+# server.py는 static/ 등을 저장소 루트 기준 상대 경로로 사용
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+@pytest.fixture(scope='session')
+def fake_supabase():
+    """가상 Supabase 서버 (지연 없음, 병원 3,000개, 테스트 세션 동안 백그라운드 스레드에서 실행)"""
+    os.environ.update(FAKE_LATENCY_MS='0', FAKE_JITTER_MS='0', FAKE_SPATIAL_LATENCY_MS='0', FAKE_HOSPITAL_COUNT='3000')
+    sys.path.insert(0, os.path.join(ROOT_DIR, 'bench'))
+    import fake_supabase
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    fake_server = uvicorn.Server(uvicorn.Config(fake_supabase.app, host='127.0.0.1', port=port, log_level='warning', ws='none'))
+    thread = threading.Thread(target=fake_server.run, daemon=True)
+    thread.start()
+    while not fake_server.started:
+        assert thread.is_alive(), '가상 Supabase 서버 시작 실패'
+        time.sleep(0.01)
+
+    fake_supabase.url = f"http://127.0.0.1:{port}"
+    yield fake_supabase
+    fake_server.should_exit = True
+    thread.join(5)
+
+@pytest.fixture
+def fake_db(fake_supabase, monkeypatch):
+    """
+    server.db(모든 서비스가 공유하는 게이트웨이)를 가상 서버로 연결하고 호출 수를 초기화
+
+    run(scenario)는 이벤트 루프 안에서 클라이언트를 연결한 뒤 scenario(client)를 실행하고 연결을 닫습니다.
+    client는 server.app을 직접 호출하는 httpx 클라이언트입니다 (시작 이벤트는 실행하지 않음).
+    fake_supabase.call_counts로 테이블/RPC별 호출 수를 확인할 수 있습니다.
+    """
+    import httpx
+    import server
+
+    monkeypatch.setattr(server.db, 'url', fake_supabase.url)
+    monkeypatch.setattr(server.db, 'client', None)
+    fake_supabase.call_counts.clear()
+
+    def run(scenario):
+        async def main():
+            await server.db.connect()
+            try:
+                transport = httpx.ASGITransport(app=server.app)
+                async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                    return await scenario(client)
+            finally:
+                await server.db.close()
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,54 @@
+"""/analyze 캐시 키 정규화 테스트 (다각형 회전/방향, 좌표 잡음, 서로 다른 도형 구분)"""
+import pytest
+
+import server
+
+SQUARE = [[127.0, 37.5], [127.01, 37.5], [127.01, 37.51], [127.0, 37.51]]
+
+def cache_key(obj):
+    return server.SpatialAnalysisService()._make_cache_key(server.DrawingObject(**obj))
+
+def polygon(coordinates):
+    return {'type': 'polygon', 'data': {'coordinates': coordinates}}
+
+def circle(lng, lat, radius, segments=32):
+    return {'type': 'circle', 'data': {'center_lng': lng, 'center_lat': lat, 'radius': radius, 'segments': segments}}
+
+def noisy(coordinates, noise=3e-8):
+    """반올림 자릿수(소수점 6자리) 아래의 좌표 잡음"""
+    return [[lng + noise, lat - noise] for lng, lat in coordinates]
+
+@pytest.mark.parametrize('coordinates', [
+    SQUARE[1:] + SQUARE[:1],                  # 시작 꼭짓점 회전
+    SQUARE[2:] + SQUARE[:2],
+    SQUARE[::-1],                             # 시계 방향
+    (SQUARE[2:] + SQUARE[:2])[::-1],          # 회전 + 방향 반대
+    SQUARE + [SQUARE[0]],                     # 닫힌 고리 (첫 꼭짓점 반복)
+    SQUARE[:2] + [SQUARE[1]] + SQUARE[2:],    # 연속 중복 꼭짓점
+    noisy(SQUARE),                            # 부동소수점 잡음
+    noisy(SQUARE[::-1] + [SQUARE[-1]]),
+])
+def test_same_polygon_gives_same_key(coordinates):
+    assert cache_key(polygon(coordinates)) == cache_key(polygon(SQUARE))
+
+def test_same_circle_gives_same_key():
+    assert cache_key(circle(127.0 + 2e-8, 37.5 - 3e-8, 500.04)) == cache_key(circle(127.0, 37.5, 500.0))
+
+@pytest.mark.parametrize('other', [
+    polygon([[127.0, 37.5], [127.01, 37.5], [127.01, 37.52], [127.0, 37.51]]),  # 꼭짓점 하나 이동
+    polygon(SQUARE[:3]),                                                        # 꼭짓점 하나 제거
+    polygon([[lng + 0.001, lat] for lng, lat in SQUARE]),                       # 평행 이동
+    polygon([[127.0, 37.5], [127.01, 37.51], [127.01, 37.5], [127.0, 37.51]]),  # 같은 꼭짓점, 다른 연결 순서
+])
+def test_distinct_polygons_give_distinct_keys(other):
+    assert cache_key(other) != cache_key(polygon(SQUARE))
+
+def test_distinct_circles_give_distinct_keys():
+    keys = {
+        cache_key(circle(127.0, 37.5, 500)),
+        cache_key(circle(127.0, 37.5, 501)),        # 반지름
+        cache_key(circle(127.00001, 37.5, 500)),    # 중심 약 1m 이동
+        cache_key(circle(127.0, 37.5, 500, 64)),    # segments
+    }
+    assert len(keys) == 4
+    assert cache_key(circle(127.0, 37.5, 500)) != cache_key(polygon(SQUARE))
@@ -0,0 +1,72 @@
+"""/analyze/batch 배치 분석 테스트 (항목별 오류, 합집합/중복 인구 엔진 표시)"""
+import pytest
+
+import server
+
+from test_grid_engine import make_engine
+
+def circle(lng, lat, radius=400):
+    return {'type': 'circle', 'data': {'center_lng': lng, 'center_lat': lat, 'radius': radius}}
+
+# make_engine() 격자(EPSG:5179 (1000000, 2000000)부터 4km) 안쪽에서 일부 겹치는 두 원
+A = circle(127.5226, 38.0180)
+B = circle(127.5290, 38.0185)
+INVALID = [None, 'polygon', {'type': 'hexagon', 'data': {}}]
+
+@pytest.fixture(autouse=True)
+def isolated_caches(monkeypatch):
+    monkeypatch.setattr(server, 'analysis_cache', server.LRUByteCache('analysis', max_items=100, max_bytes=1 << 20))
+    monkeypatch.setattr(server, 'analysis_flight', server.SingleFlight('analysis'))
+    monkeypatch.setattr(server, 'shared_cache', None)
+    monkeypatch.setattr(server, 'SHADOW_SAMPLE_RATE', 0.0)
+
+def post_batch(fake_db, objects):
+    async def scenario(client):
+        response = await client.post('/analyze/batch', json={'objects': objects})
+        assert response.status_code == 200
+        return response.json()
+    return fake_db(scenario)
+
+def test_invalid_items_fail_individually(fake_db, fake_supabase, monkeypatch):
+    monkeypatch.setattr(server, 'ANALYSIS_ENGINE', 'rpc')
+    monkeypatch.setattr(server, 'grid_engine', None)
+    body = post_batch(fake_db, [A, *INVALID, A])
+
+    assert [bool(result['error']) for result in body['results']] == [False, True, True, True, False]
+    assert body['error_count'] == 3
+    assert body['results'][0] == body['results'][-1]
+    assert fake_supabase.call_counts == {'analyze_hospital_service_area': 1}
+
+    # 기본 rpc 모드: 스냅샷이 없으므로 합집합은 지원하지 않는다고 명시
+    assert body['results_engine'] == 'rpc'
+    assert body['union_status'] == 'unsupported'
+    assert 'GRID_SNAPSHOT_PATH' in body['union_message']
+    assert body['union'] is None and body['overlap'] is None and body['union_engine'] is None
+
+def test_shadow_mode_union_uses_grid_engine(fake_db, monkeypatch):
+    engine = make_engine(columns=40, rows=40)
+    monkeypatch.setattr(server, 'ANALYSIS_ENGINE', 'shadow')
+    monkeypatch.setattr(server, 'grid_engine', engine)
+    body = post_batch(fake_db, [A, B, A, None])
+
+    assert body['results_engine'] == 'rpc'
+    assert body['union_status'] == 'ok' and body['union_engine'] == 'grid'
+    assert body['union_message']
+
+    # overlap은 RPC 항목 결과가 아니라 같은 격자 엔진의 개별 결과 기준 (같은 도형은 한 번만)
+    individual = [engine.analyze(server.DrawingObject(**obj)) for obj in (A, B)]
+    union = engine.analyze_union([server.DrawingObject(**obj) for obj in (A, B)])
+    assert body['union'] == union
+    assert body['overlap']['total_population'] == sum(r.total_population for r in individual) - union['total_population']
+    assert 0 < body['overlap']['total_population'] < min(r.total_population for r in individual)
+
+def test_local_mode_overlap_uses_item_results(fake_db, fake_supabase, monkeypatch):
+    monkeypatch.setattr(server, 'ANALYSIS_ENGINE', 'local')
+    monkeypatch.setattr(server, 'grid_engine', make_engine(columns=40, rows=40))
+    body = post_batch(fake_db, [A, B])
+
+    assert body['results_engine'] == 'grid' and body['union_engine'] == 'grid'
+    assert body['union_message'] is None
+    item_total = sum(result['total_population'] for result in body['results'])
+    assert body['overlap']['total_population'] == item_total - body['union']['total_population']
+    assert fake_supabase.call_counts == {}
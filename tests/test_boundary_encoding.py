@@ -0,0 +1,126 @@
+"""경계 LOD 단순화와 정수 델타 인코딩/디코딩 테스트"""
+import json
+import math
+import pathlib
+import re
+import shutil
+import subprocess
+
+import pytest
+
+import server
+
+SCRIPT_PATH = next(pathlib.Path(__file__).resolve().parent.parent.glob('static/script.*.js'))
+
+def wavy_ring(center_lng, center_lat, radius, count=720):
+    """꼭짓점이 많은 닫힌 링 (실제 행정구역 경계처럼 자잘한 굴곡 포함)"""
+    ring = []
+    for i in range(count):
+        angle = 2 * math.pi * i / count
+        r = radius * (1 + 0.05 * math.sin(angle * 37) + 0.01 * math.sin(angle * 211))
+        ring.append([round(center_lng + r * math.cos(angle), 7), round(center_lat + r * math.sin(angle), 7)])
+    ring.append(ring[0])
+    return ring
+
+def make_boundary(boundary_type):
+    polygon = [wavy_ring(127.0, 37.5, 0.05), wavy_ring(127.0, 37.5, 0.01, 90)[::-1]]
+    coordinates = [polygon, [wavy_ring(127.3, 37.6, 0.002, 60)]] if boundary_type == 'MultiPolygon' else polygon
+    return server.BoundaryCoordinates(
+        type=boundary_type, coordinates=coordinates, centroid=server.Centroid(lng=127.0, lat=37.5)
+    )
+
+def decode_boundary(encoded):
+    """static/script.*.js decodeBoundary()와 같은 복원 (누적합 × scale, 첫 점으로 링 닫기)"""
+    def decode_ring(values):
+        ring, x, y = [], 0, 0
+        for i in range(0, len(values), 2):
+            x += values[i]
+            y += values[i + 1]
+            ring.append([x * encoded['scale'], y * encoded['scale']])
+        return ring + ring[:1]
+
+    def decode_polygon(polygon):
+        return [decode_ring(ring) for ring in polygon]
+
+    coordinates = encoded['coordinates']
+    return {
+        'type': encoded['type'],
+        'coordinates': [decode_polygon(p) for p in coordinates] if encoded['type'].endswith('MultiPolygon')
+        else decode_polygon(coordinates),
+        'centroid': encoded['centroid']
+    }
+
+def iter_rings(boundary_type, coordinates):
+    polygons = coordinates if boundary_type.endswith('MultiPolygon') else [coordinates]
+    for polygon in polygons:
+        yield from polygon
+
+def assert_same_rings(boundary_type, actual, expected, tolerance):
+    actual_rings = list(iter_rings(boundary_type, actual))
+    expected_rings = list(iter_rings(boundary_type, expected))
+    assert len(actual_rings) == len(expected_rings)
+    for actual_ring, expected_ring in zip(actual_rings, expected_rings):
+        assert len(actual_ring) == len(expected_ring)
+        for (ax, ay), (ex, ey) in zip(actual_ring, expected_ring):
+            assert abs(ax - ex) <= tolerance and abs(ay - ey) <= tolerance
+
+@pytest.mark.parametrize('boundary_type', ['Polygon', 'MultiPolygon'])
+def test_delta_round_trip_matches_every_lod(boundary_type):
+    payloads = server.build_boundary_payloads(make_boundary(boundary_type))
+    assert set(payloads) == {None, *server.BOUNDARY_LOD_ZOOMS}
+
+    for lod, payload in payloads.items():
+        plain = json.loads(payload.json)
+        encoded = json.loads(payload.delta.json)
+        decoded = decode_boundary(encoded)
+
+        assert encoded['encoding'] == 'delta'
+        assert all(isinstance(v, int) for ring in iter_rings(boundary_type, encoded['coordinates']) for v in ring)
+        assert decoded['type'] == plain['type']
+        assert decoded['centroid'] == plain['centroid']
+        # 원본은 양자화 단위 절반, LOD 좌표는 이미 격자 위에 있으므로 반올림(소수 7자리) 오차만
+        tolerance = server.BOUNDARY_DELTA_SCALE / 2 if lod is None else 1e-7
+        assert_same_rings(boundary_type, decoded['coordinates'], plain['coordinates'], tolerance + 1e-12)
+
+def test_lod_simplification_reduces_vertices_within_grid():
+    boundary = make_boundary('Polygon')
+    previous = sum(len(ring) for ring in boundary.coordinates)
+
+    for lod in server.BOUNDARY_LOD_ZOOMS[::-1]:
+        simplified = server.simplify_boundary('Polygon', boundary.coordinates, lod)
+        grid = server.get_boundary_grid(lod)
+        count = sum(len(ring) for ring in simplified)
+
+        assert count <= previous
+        previous = count
+        for ring in simplified:
+            assert ring[0] == ring[-1] and len(ring) >= 4
+            for x, y in ring:
+                # 격자 위의 점 (소수 7자리 반올림 오차 허용)
+                assert abs(x - round(x / grid) * grid) <= 5e-8 + 1e-12
+                assert abs(y - round(y / grid) * grid) <= 5e-8 + 1e-12
+
+def test_delta_encoding_drops_duplicates_and_closing_point():
+    ring = [[127.0, 37.0], [127.0, 37.0], [127.001, 37.0], [127.001, 37.001], [127.0, 37.0]]
+    assert server._encode_ring_delta(ring, 1e-6) == [127000000, 37000000, 1000, 0, 0, 1000]
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node 없음')
+def test_frontend_decoder_matches(tmp_path):
+    """프론트엔드 decodeBoundary()를 node로 실행하여 같은 좌표가 나오는지 확인"""
+    source = SCRIPT_PATH.read_text(encoding='utf-8')
+    match = re.search(r'^function decodeBoundary\(boundary\) \{.*?^\}', source, re.S | re.M)
+    assert match, 'decodeBoundary()를 찾을 수 없습니다'
+
+    payload = server.build_boundary_payloads(make_boundary('MultiPolygon'))[server.BOUNDARY_LOD_ZOOMS[-1]]
+    (tmp_path / 'boundary.json').write_bytes(payload.delta.json)
+    script = tmp_path / 'decode.js'
+    script.write_text(
+        match.group(0) + "\nconst fs = require('fs');\n"
+        "process.stdout.write(JSON.stringify(decodeBoundary(JSON.parse(fs.readFileSync(process.argv[2], 'utf8')))));\n",
+        encoding='utf-8'
+    )
+    decoded = json.loads(subprocess.run(
+        ['node', str(script), str(tmp_path / 'boundary.json')], check=True, capture_output=True
+    ).stdout)
+
+    assert decoded == decode_boundary(json.loads(payload.delta.json))
@@ -0,0 +1,78 @@
+"""경계 응답 사전 직렬화/사전 압축 (gzip 조각 이어 붙이기) 테스트"""
+import gzip
+import json
+import zlib
+
+import pytest
+
+import server
+
+BOUNDARY = {
+    'type': 'Polygon',
+    'coordinates': [[[126.9 + i * 1e-4, 37.5 + (i % 7) * 1e-4] for i in range(2000)]],
+    'centroid': {'lng': 126.95, 'lat': 37.5}
+}
+
+@pytest.fixture
+def precompress(monkeypatch):
+    monkeypatch.setattr(server, 'BOUNDARY_PRECOMPRESS', True)
+
+def make_payload(boundary=BOUNDARY):
+    return server.make_boundary_payload(json.dumps(boundary, separators=(',', ':')).encode('utf-8'))
+
+def make_result():
+    return server.PopulationResult(
+        total_population=12345,
+        total_households=6789,
+        age_distribution={'0-9세': 1000, '10-19세': 2000},
+        analysis_area_sqm=0.0,
+        shape_type='region'
+    )
+
+@pytest.mark.parametrize('prefix, suffix', [
+    (b'{"a":1,"boundary":', b'}'),
+    (b'', b''),
+    (b'{"text":"' + '한글 접두사'.encode('utf-8') * 100 + b'","boundary":', b',"tail":true}'),
+])
+def test_splice_gzip_round_trip(precompress, prefix, suffix):
+    payload = make_payload()
+    spliced = server.splice_gzip(prefix, payload, suffix)
+
+    expected = prefix + payload.json + suffix
+    # gzip.decompress는 트레일러의 CRC32/길이도 검증
+    assert gzip.decompress(spliced) == expected
+    assert spliced[:10] == server.GZIP_HEADER
+    assert int.from_bytes(spliced[-8:-4], 'little') == zlib.crc32(expected)
+    assert int.from_bytes(spliced[-4:], 'little') == len(expected)
+
+def test_splice_gzip_reuses_precompressed_fragment(precompress):
+    payload = make_payload()
+    spliced = server.splice_gzip(b'{"boundary":', payload, b'}')
+
+    assert payload.deflated.endswith(b'\x00\x00\xff\xff')  # Z_SYNC_FLUSH로 끝나는 조각
+    assert payload.deflated in spliced
+    assert len(spliced) < len(payload.json) / 2
+
+def test_make_boundary_payload_without_precompress(monkeypatch):
+    monkeypatch.setattr(server, 'BOUNDARY_PRECOMPRESS', False)
+    payload = make_payload()
+    assert payload.deflated is None
+    assert payload.size == len(payload.json)
+
+def test_render_population_response_gzip_matches_plain(precompress):
+    result, payload = make_result(), make_payload()
+
+    plain = server.render_population_response(result, payload)
+    compressed = server.render_population_response(result, payload, accept_encoding='gzip, deflate, br')
+
+    assert 'content-encoding' not in plain.headers
+    assert compressed.headers['content-encoding'] == 'gzip'
+    assert gzip.decompress(compressed.body) == plain.body
+
+    body = json.loads(plain.body)
+    assert body == {**result.model_dump(exclude={'boundary'}), 'boundary': BOUNDARY}
+
+def test_render_population_response_without_boundary():
+    response = server.render_population_response(make_result(), None, accept_encoding='gzip')
+    assert 'content-encoding' not in response.headers
+    assert json.loads(response.body)['boundary'] is None
@@ -0,0 +1,132 @@
+"""로컬 격자 인구 분석 엔진 (투영, 겹친 면적 적분, 격자 집계, shadow 비교) 테스트"""
+import asyncio
+
+import numpy as np
+import pytest
+
+import server
+
+# pyproj(PROJ) EPSG:4326 → EPSG:5179 변환 결과 (경도, 위도, x, y)
+EPSG5179_FIXTURES = [
+    ('원점', 127.5, 38.0, 1000000.0000, 2000000.0000),
+    ('서울시청', 126.978, 37.5665, 953901.1653, 1952032.0810),
+    ('부산시청', 129.0756, 35.1796, 1143467.3797, 1688281.9821),
+    ('제주시청', 126.5312, 33.4996, 910010.5457, 1501279.7889),
+    ('독도', 131.8647, 37.2411, 1387225.1767, 1924739.4985),
+]
+
+def square_ring(x0, y0, x1, y1):
+    """반시계 방향 닫힌 사각형 링"""
+    return np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]], dtype=np.float64)
+
+def overlap(boxes, ring):
+    boxes = np.asarray(boxes, dtype=np.float64)
+    return server.box_overlap_areas(boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3], ring)
+
+@pytest.mark.parametrize('name, lng, lat, expected_x, expected_y', EPSG5179_FIXTURES)
+def test_wgs84_to_epsg5179_matches_proj(name, lng, lat, expected_x, expected_y):
+    x, y = server.wgs84_to_epsg5179(np.array([lng]), np.array([lat]))
+    assert x[0] == pytest.approx(expected_x, abs=0.01)
+    assert y[0] == pytest.approx(expected_y, abs=0.01)
+
+def test_box_overlap_areas_with_square():
+    ring = square_ring(0, 0, 2, 2)
+    areas = overlap([
+        [0, 0, 1, 1],       # 완전히 안
+        [1, 1, 3, 3],       # 한 모서리만 겹침
+        [0.5, -1, 1.5, 0.5],  # 아래 변에 걸침
+        [5, 5, 6, 6],       # 밖
+        [-1, -1, 3, 3],     # 다각형을 포함
+    ], ring)
+    np.testing.assert_allclose(areas, [1.0, 1.0, 0.5, 0.0, 4.0], atol=1e-12)
+
+def test_box_overlap_areas_with_triangle():
+    ring = np.array([[0, 0], [2, 0], [0, 2], [0, 0]], dtype=np.float64)
+    areas = overlap([
+        [0, 0, 1, 1],          # 빗변 아래
+        [1, 0, 2, 1],          # 빗변이 대각선으로 지나감
+        [0.5, 0.5, 1.5, 1.5],  # 빗변이 중심을 지나감
+        [1, 1, 2, 2],          # 꼭짓점에서만 만남
+    ], ring)
+    np.testing.assert_allclose(areas, [1.0, 0.5, 0.5, 0.0], atol=1e-12)
+
+def test_box_overlap_areas_partition_sums_to_polygon_area():
+    # 오목한 별 모양 다각형을 덮는 격자의 겹친 면적 합 = 다각형 면적
+    angles = np.linspace(0, 2 * np.pi, 24, endpoint=False)
+    radius = np.where(np.arange(24) % 2 == 0, 950.0, 420.0)
+    ring = np.column_stack([radius * np.cos(angles), radius * np.sin(angles)])
+    ring = np.vstack([ring, ring[:1]])
+
+    xs, ys = np.meshgrid(np.arange(-1000, 1000, 100.0), np.arange(-1000, 1000, 100.0))
+    x0, y0 = xs.ravel(), ys.ravel()
+    areas = server.box_overlap_areas(x0, y0, x0 + 100, y0 + 100, ring)
+
+    assert areas.min() >= -1e-6
+    assert areas.max() <= 100 * 100 + 1e-6
+    assert areas.sum() == pytest.approx(server.GridPopulationEngine._signed_area(ring), rel=1e-9)
+
+def make_engine(columns=30, rows=30):
+    """(1000000, 2000000)부터 100m 격자 columns×rows개, 격자당 인구 10/가구 4, 1km 격자 2개"""
+    xs, ys = np.meshgrid(np.arange(columns) * 100.0, np.arange(rows) * 100.0)
+    cell_x = 1_000_000 + xs.ravel()
+    cell_y = 2_000_000 + ys.ravel()
+    return server.GridPopulationEngine(
+        cell_x=cell_x,
+        cell_y=cell_y,
+        cell_size=100.0,
+        population=np.full(len(cell_x), 10.0),
+        households=np.full(len(cell_x), 4.0),
+        parent_index=(cell_x >= 1_001_000).astype(np.int64),
+        age_labels=['young', 'old'],
+        age_ratios=np.array([[0.25, 0.75], [0.5, 0.5]])
+    )
+
+def summarize(engine, ring):
+    return engine._summarize(*engine._coverage(ring))
+
+def test_engine_partial_cells():
+    # 200m × 200m 정사각형이 격자 9개에 걸침 → 격자 4개 분량
+    population, households, ages = summarize(make_engine(), square_ring(1_000_050, 2_000_050, 1_000_250, 2_000_250))
+    assert population == pytest.approx(40.0)
+    assert households == pytest.approx(16.0)
+    np.testing.assert_allclose(ages, [10.0, 30.0])
+
+def test_engine_full_buckets_and_parent_ratios():
+    # 1km 버킷 하나를 완전히 덮고 다음 버킷(parent 1)의 격자 반 줄에 걸침
+    population, households, ages = summarize(make_engine(), square_ring(1_000_000, 2_000_000, 1_001_050, 2_001_000))
+    assert population == pytest.approx(100 * 10 + 5 * 10)
+    assert households == pytest.approx(100 * 4 + 5 * 4)
+    np.testing.assert_allclose(ages, [1000 * 0.25 + 50 * 0.5, 1000 * 0.75 + 50 * 0.5])
+
+def test_engine_polygon_outside_grid():
+    population, households, ages = summarize(make_engine(), square_ring(990_000, 1_990_000, 990_500, 1_990_500))
+    assert population == 0
+    assert households == 0
+    np.testing.assert_allclose(ages, [0.0, 0.0])
+
+def test_shadow_comparison_is_bounded(monkeypatch):
+    engine = make_engine()
+    started = []
+    monkeypatch.setattr(server, 'grid_engine', engine)
+    monkeypatch.setattr(server, 'SHADOW_MAX_CONCURRENCY', 2)
+    monkeypatch.setattr(server, 'SHADOW_SAMPLE_RATE', 1.0)
+    monkeypatch.setattr(engine, 'compare', lambda drawing_obj, rpc_result: started.append(drawing_obj))
+
+    async def schedule():
+        for i in range(5):
+            server.schedule_shadow_comparison(i, None)
+        await asyncio.gather(*server.shadow_comparison_tasks)
+
+    asyncio.run(schedule())
+    assert started == [0, 1]
+    assert engine.get_stats()['shadow_skipped'] == 3
+    assert not server.shadow_comparison_tasks
+
+def test_shadow_comparison_sampling(monkeypatch):
+    engine = make_engine()
+    monkeypatch.setattr(server, 'grid_engine', engine)
+    monkeypatch.setattr(server, 'SHADOW_SAMPLE_RATE', 0.0)
+
+    server.schedule_shadow_comparison(None, None)  # 이벤트 루프 없이도 작업을 만들지 않아야 함
+    assert not server.shadow_comparison_tasks
+    assert engine.get_stats()['shadow_skipped'] == 0
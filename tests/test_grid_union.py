@@ -0,0 +1,94 @@
+"""격자 공간 인덱스(UniformGridIndex)와 여러 도형 합집합 인구(analyze_union) 테스트"""
+import numpy as np
+import pytest
+
+import server
+
+from test_grid_engine import make_engine, square_ring
+
+@pytest.fixture
+def engine(monkeypatch):
+    # 도형 대신 EPSG:5179 링을 그대로 넘김
+    engine = make_engine(columns=40, rows=40)
+    monkeypatch.setattr(engine, '_project_shape', lambda ring: ring)
+    return engine
+
+def test_uniform_grid_index_query_matches_brute_force():
+    rng = np.random.default_rng(7)
+    x = rng.uniform(0, 5000, 3000)
+    y = rng.uniform(0, 4000, 3000)
+    index = server.UniformGridIndex(x, y, 1000)
+    ordered_x, ordered_y = x[index.order], y[index.order]
+
+    for x_min, y_min, x_max, y_max in [(0, 0, 5000, 4000), (1200, 800, 2600, 3100), (-500, -500, 10, 10), (6000, 0, 7000, 100)]:
+        found = index.items(index.query(x_min, y_min, x_max, y_max))
+        # 버킷 단위 조회이므로 범위 안의 점은 모두 포함되고, 나머지는 범위와 겹치는 버킷의 점
+        inside = (ordered_x >= x_min) & (ordered_x <= x_max) & (ordered_y >= y_min) & (ordered_y <= y_max)
+        assert set(np.nonzero(inside)[0]) <= set(found.tolist())
+        bucket_x = np.floor(ordered_x[found] / 1000) * 1000
+        bucket_y = np.floor(ordered_y[found] / 1000) * 1000
+        assert np.all((bucket_x <= x_max) & (bucket_x + 1000 >= x_min) & (bucket_y <= y_max) & (bucket_y + 1000 >= y_min))
+
+def test_union_of_disjoint_shapes_is_sum(engine):
+    a = square_ring(1_000_050, 2_000_050, 1_000_350, 2_000_350)
+    b = square_ring(1_002_050, 2_002_050, 1_002_250, 2_002_450)
+    union = engine.analyze_union([a, b])
+
+    assert union['total_population'] == round((9 + 8) * 10)
+    assert union['total_households'] == round((9 + 8) * 4)
+
+def test_union_of_identical_shapes_counts_once(engine):
+    ring = square_ring(1_000_130, 2_000_170, 1_001_470, 2_001_330)
+    population, households, _ = engine._summarize(*engine._coverage(ring))
+    union = engine.analyze_union([ring, ring])
+
+    assert union == engine.analyze_union([ring])
+    assert union['total_population'] == server.round_half_up(population)
+    assert union['total_households'] == server.round_half_up(households)
+
+def sampled_cell_counts(engine, monkeypatch):
+    """_sampled_union_fractions 호출마다 표본 추정한 격자 수 기록"""
+    counts = []
+    sample = engine._sampled_union_fractions
+
+    def spy(cells, rings):
+        counts.append(len(cells))
+        return sample(cells, rings)
+
+    monkeypatch.setattr(engine, '_sampled_union_fractions', spy)
+    return counts
+
+def test_union_sampling_on_shared_boundary_cell(engine, monkeypatch):
+    # 두 정사각형의 모서리가 같은 격자 [300, 400]² 안에 있음 (A 0.25, B 0.56, 겹침 0.06)
+    # 경계가 10m 단위이므로 10×10 표본점(격자 안 5, 15, ..., 95m)으로 정확히 나뉨
+    counts = sampled_cell_counts(engine, monkeypatch)
+    a = square_ring(1_000_050, 2_000_050, 1_000_350, 2_000_350)
+    b = square_ring(1_000_330, 2_000_320, 1_000_650, 2_000_650)
+    union = engine.analyze_union([a, b])
+
+    assert counts == [1]
+    union_area = 300 * 300 + 320 * 330 - 20 * 30
+    assert union['total_population'] == server.round_half_up(union_area / 10000 * 10)
+    assert union['total_households'] == server.round_half_up(union_area / 10000 * 4)
+
+def test_union_sampling_error_is_small_for_unaligned_shapes(engine, monkeypatch):
+    # 경계가 표본점 사이를 지나는 경우: 표본 추정 오차는 경계 격자당 표본 한 줄 이내
+    counts = sampled_cell_counts(engine, monkeypatch)
+    a = square_ring(1_000_033, 2_000_041, 1_001_237, 2_001_219)
+    b = square_ring(1_000_611, 2_000_587, 1_001_873, 2_001_791)
+    union = engine.analyze_union([a, b])
+    assert counts and counts[0] > 0
+
+    overlap_area = (1_001_237 - 1_000_611) * (2_001_219 - 2_000_587)
+    union_area = (1_001_237 - 1_000_033) * (2_001_219 - 2_000_041) + (1_001_873 - 1_000_611) * (2_001_791 - 2_000_587) - overlap_area
+    assert union['total_population'] == pytest.approx(union_area / 10000 * 10, rel=0.01)
+
+    # 합집합은 개별 합 이하, 가장 큰 도형 이상
+    individual = [engine._summarize(*engine._coverage(ring))[0] for ring in (a, b)]
+    assert max(individual) <= union['total_population'] <= sum(individual) + 0.5
+
+def test_union_age_distribution_sums_to_population(engine):
+    a = square_ring(1_000_433, 2_000_100, 1_001_567, 2_000_900)
+    b = square_ring(1_000_900, 2_000_500, 1_002_100, 2_001_700)
+    union = engine.analyze_union([a, b])
+    assert sum(union['age_distribution'].values()) == pytest.approx(union['total_population'], abs=len(union['age_distribution']))
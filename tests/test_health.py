@@ -0,0 +1,54 @@
+"""백그라운드 DB 상태 확인(HealthMonitor)과 /health, /readyz 준비 상태 테스트"""
+import asyncio
+import json
+
+import pytest
+
+import server
+
+@pytest.fixture
+def monitor(monkeypatch):
+    monitor = server.HealthMonitor(interval_seconds=15, timeout_seconds=1)
+    probes = []
+
+    async def test_connection():
+        probes.append(1)
+        server.db.recent_outcomes.record(True)  # 실제 RPC처럼 게이트웨이 호출 결과 기록
+        return {'status': 'success', 'data': {'x': 953898.0}}
+
+    monkeypatch.setattr(server.db, 'recent_outcomes', server.RecentOutcomeCounter(60))
+    monkeypatch.setattr(server.SpatialAnalysisService, 'test_connection', lambda self: test_connection())
+    monkeypatch.setattr(server, 'health_monitor', monitor)
+    monitor.probe_calls = probes
+    return monitor
+
+def test_probe_skipped_after_successful_traffic(monitor):
+    asyncio.run(monitor.check())
+    asyncio.run(monitor.check())  # 확인 쿼리 자신의 성공은 건너뛸 근거가 아님
+    assert len(monitor.probe_calls) == 2
+
+    server.db.recent_outcomes.record(True)  # 요청 처리 중 Supabase 호출 성공
+    asyncio.run(monitor.check())
+    assert len(monitor.probe_calls) == 2
+    assert monitor.get_stats()['source'] == 'traffic'
+    assert monitor.last_result['data'] == {'x': 953898.0}
+    assert (monitor.probes, monitor.skipped_probes) == (2, 1)
+
+    server.db.recent_outcomes.record(False)  # 실패한 호출만 있으면 다시 확인
+    asyncio.run(monitor.check())
+    assert len(monitor.probe_calls) == 3
+
+def test_health_status_follows_readiness(monitor, monkeypatch):
+    monkeypatch.setattr(server, 'region_index', object())
+
+    health = asyncio.run(server.health_check())
+    ready = asyncio.run(server.readiness_check())
+    assert health['status'] == 'unhealthy' and health['checks']['database'] is False
+    assert ready.status_code == 503
+
+    asyncio.run(monitor.check())
+    health = asyncio.run(server.health_check())
+    ready = asyncio.run(server.readiness_check())
+    assert health['status'] == 'healthy'
+    assert health['checks'] == json.loads(ready.body)['checks'] == {'region_index': True, 'database': True}
+    assert ready.status_code == 200
@@ -0,0 +1,189 @@
+"""병원 검색 타일 줌/타일 범위, 타일 페이지 조회, 클러스터 집계, NDJSON 스트리밍 테스트"""
+import json
+from collections import Counter
+
+import pytest
+
+import server
+
+def tile_count(bounds, zoom):
+    columns = server.lng_to_tile_x(bounds.ne_lng, zoom) - server.lng_to_tile_x(bounds.sw_lng, zoom) + 1
+    rows = server.lat_to_tile_y(bounds.sw_lat, zoom) - server.lat_to_tile_y(bounds.ne_lat, zoom) + 1
+    return columns, rows
+
+@pytest.mark.parametrize('sw_lng, sw_lat, ne_lng, ne_lat', [
+    (126.97, 37.55, 127.00, 37.58),   # 정사각형에 가까운 화면
+    (126.97, 37.40, 126.99, 37.70),   # 세로로 긴 화면 (모바일)
+    (126.80, 37.56, 127.20, 37.57),   # 가로로 긴 화면
+    (126.9780, 37.5665, 126.9781, 37.5666),  # 아주 좁은 영역 (최대 줌)
+])
+def test_tile_zoom_bounds_tile_count(sw_lng, sw_lat, ne_lng, ne_lat):
+    bounds = server.HospitalBounds(sw_lat=sw_lat, sw_lng=sw_lng, ne_lat=ne_lat, ne_lng=ne_lng)
+    zoom = server.HospitalSearchService.get_tile_zoom(bounds)
+
+    assert server.HOSPITAL_TILE_MIN_ZOOM <= zoom <= server.HOSPITAL_TILE_MAX_ZOOM
+    columns, rows = tile_count(bounds, zoom)
+    assert columns <= 3 and rows <= 3
+
+def test_tile_zoom_tall_viewport_uses_height():
+    # 가로(0.02도)만 보면 z14지만 세로가 0.3도(메르카토르 약 0.001)이므로 z10
+    bounds = server.HospitalBounds(sw_lat=37.40, sw_lng=126.97, ne_lat=37.70, ne_lng=126.99)
+    assert server.HospitalSearchService.get_tile_zoom(bounds) == 10
+
+def test_tile_zoom_wide_area_uses_direct_query():
+    bounds = server.HospitalBounds(sw_lat=34.0, sw_lng=126.0, ne_lat=38.0, ne_lng=129.5)
+    assert server.HospitalSearchService.get_tile_zoom(bounds) is None
+
+    tall = server.HospitalBounds(sw_lat=34.0, sw_lng=127.0, ne_lat=38.0, ne_lng=127.01)
+    assert server.HospitalSearchService.get_tile_zoom(tall) is None
+
+def test_tile_bounds_contains_point():
+    lng, lat = 126.978, 37.5665
+    for zoom in (10, 12, 14):
+        x, y = server.lng_to_tile_x(lng, zoom), server.lat_to_tile_y(lat, zoom)
+        sw_lng, sw_lat, ne_lng, ne_lat = server.tile_bounds(zoom, x, y)
+        assert sw_lng <= lng < ne_lng
+        assert sw_lat < lat <= ne_lat
+
+@pytest.fixture
+def tile_service(monkeypatch):
+    monkeypatch.setattr(server, 'hospital_index', None)
+    return server.HospitalSearchService(
+        server.db, server.LRUByteCache('hospital_tile', max_items=100, max_bytes=1 << 24), server.SingleFlight('hospital_tile')
+    )
+
+def test_dense_tile_is_filled_page_by_page(fake_db, fake_supabase, tile_service, monkeypatch):
+    # PostgREST max-rows(100)보다 병원이 많은 타일도 잘리지 않고 모두 캐시
+    monkeypatch.setattr(fake_supabase, 'FAKE_MAX_ROWS', 100)
+    monkeypatch.setattr(server, 'HOSPITAL_STREAM_PAGE_SIZE', 100)
+    zoom = 10
+    x, y = server.lng_to_tile_x(126.98, zoom), server.lat_to_tile_y(37.55, zoom)
+    sw_lng, sw_lat, ne_lng, ne_lat = server.tile_bounds(zoom, x, y)
+    expected = fake_supabase.search_hospitals({'p_sw_lng': sw_lng, 'p_sw_lat': sw_lat, 'p_ne_lng': ne_lng, 'p_ne_lat': ne_lat})
+    assert len(expected) > 200
+
+    async def scenario(client):
+        return await tile_service.get_tile(zoom, x, y, '', False)
+
+    tile = fake_db(scenario)
+    assert sorted(h['ykiho'] for h in tile) == sorted(h['ykiho'] for h in expected)
+    assert fake_supabase.call_counts['search_hospitals_spatial'] == len(expected) // 100 + 1
+
+def tile_hospitals(fake_supabase, zoom, x, y):
+    """가상 서버의 병원 중 좌표가 타일 (zoom, x, y)에 속하는 병원 (클러스터 집계 기준)"""
+    sw_lng, sw_lat, ne_lng, ne_lat = server.tile_bounds(zoom, x, y)
+    rows = fake_supabase.search_hospitals({'p_sw_lng': sw_lng, 'p_sw_lat': sw_lat, 'p_ne_lng': ne_lng, 'p_ne_lat': ne_lat})
+    return [h for h in rows if server.lng_to_tile_x(h['xpos'], zoom) == x and server.lat_to_tile_y(h['ypos'], zoom) == y]
+
+def post_cluster(fake_db, tile_service, monkeypatch, zoom, x, y, repeat=1):
+    """타일 (zoom, x, y) 안쪽 영역으로 클러스터 요청 (이웃 타일 셀은 중심이 영역 밖이라 제외됨)"""
+    monkeypatch.setattr(server, 'hospital_search_service', tile_service)
+    sw_lng, sw_lat, ne_lng, ne_lat = server.tile_bounds(zoom, x, y)
+    body = {'sw_lng': sw_lng + 1e-9, 'sw_lat': sw_lat + 1e-9, 'ne_lng': ne_lng - 1e-9, 'ne_lat': ne_lat - 1e-9, 'zoom': zoom}
+
+    async def scenario(client):
+        responses = [await client.post('/getHospitals', json=body) for _ in range(repeat)]
+        assert all(response.status_code == 200 for response in responses)
+        return responses[-1].json()
+    return fake_db(scenario)
+
+SEOUL_Z9 = (9, server.lng_to_tile_x(126.98, 9), server.lat_to_tile_y(37.55, 9))
+DAEJEON_Z10 = (10, server.lng_to_tile_x(127.38, 10), server.lat_to_tile_y(36.35, 10))  # 집계 셀과 작은 셀이 섞인 타일
+
+def test_cluster_tile_aggregates_cells(fake_db, fake_supabase, tile_service, monkeypatch):
+    monkeypatch.setattr(server, 'HOSPITAL_STREAM_PAGE_SIZE', 50)
+    zoom, x, y = DAEJEON_Z10
+    expected = tile_hospitals(fake_supabase, zoom, x, y)
+    cell_zoom = zoom + server.HOSPITAL_CLUSTER_CELL_ZOOM_OFFSET
+    cells = Counter(
+        f"{cell_zoom}/{server.lng_to_tile_x(h['xpos'], cell_zoom)}/{server.lat_to_tile_y(h['ypos'], cell_zoom)}"
+        for h in expected
+    )
+
+    body = post_cluster(fake_db, tile_service, monkeypatch, zoom, x, y)
+
+    assert body['mode'] == 'cluster' and body['truncated'] is False
+    assert body['count'] == len(expected)
+    assert body['specialist_count'] == sum(1 for h in expected if h['has_specialist'])
+    # 병원이 HOSPITAL_CLUSTER_MIN_SIZE보다 많은 셀은 집계, 나머지 셀은 개별 병원
+    assert {c['cell']: c['count'] for c in body['clusters']} == {
+        cell: count for cell, count in cells.items() if count > server.HOSPITAL_CLUSTER_MIN_SIZE
+    }
+    assert sum(1 for count in cells.values() if count <= server.HOSPITAL_CLUSTER_MIN_SIZE) > 0
+    assert len(body['hospitals']) == sum(count for count in cells.values() if count <= server.HOSPITAL_CLUSTER_MIN_SIZE)
+    for cluster in body['clusters']:
+        assert sum(cluster['types'].values()) == cluster['count']
+    assert fake_supabase.call_counts['search_hospitals_spatial'] > 1
+
+def test_cluster_tile_without_index_caps_pages(fake_db, fake_supabase, tile_service, monkeypatch):
+    # 인덱스 없이 넓은 타일은 HOSPITAL_CLUSTER_MAX_PAGES 페이지까지만 조회하고 truncated로 표시
+    monkeypatch.setattr(server, 'HOSPITAL_STREAM_PAGE_SIZE', 100)
+    monkeypatch.setattr(server, 'HOSPITAL_CLUSTER_MAX_PAGES', 2)
+    zoom, x, y = SEOUL_Z9
+    assert len(tile_hospitals(fake_supabase, zoom, x, y)) > 200
+
+    body = post_cluster(fake_db, tile_service, monkeypatch, zoom, x, y, repeat=2)
+
+    assert body['truncated'] is True
+    assert 0 < body['count'] <= 200
+    # 제한된 결과도 캐시되어 두 번째 요청은 RPC를 다시 호출하지 않음
+    assert fake_supabase.call_counts['search_hospitals_spatial'] == 2
+
+KOREA = {'sw_lng': 124.0, 'sw_lat': 33.0, 'ne_lng': 132.0, 'ne_lat': 39.0}
+
+def stream(fake_db, tile_service, monkeypatch, body, **request):
+    monkeypatch.setattr(server, 'hospital_search_service', tile_service)
+
+    async def scenario(client):
+        response = await client.post('/getHospitals', json=body, **request)
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith(server.HOSPITAL_NDJSON_MEDIA_TYPE)
+        return response.text
+    text = fake_db(scenario)
+
+    assert text.endswith('\n')
+    records = [json.loads(line) for line in text.split('\n')[:-1]]
+    assert all(isinstance(record, dict) for record in records)
+    return records[:-1], records[-1]
+
+def test_ndjson_stream_pages_wide_area(fake_db, fake_supabase, tile_service, monkeypatch):
+    # 병원 3,000개를 700개 페이지로 조회: 가득 찬 4페이지 + 짧은 마지막 페이지(200개)에서 종료
+    monkeypatch.setattr(server, 'HOSPITAL_STREAM_PAGE_SIZE', 700)
+    expected = fake_supabase.search_hospitals({f"p_{key}": value for key, value in KOREA.items()})
+    assert len(expected) % 700 > 0
+
+    hospitals, summary = stream(fake_db, tile_service, monkeypatch, KOREA,
+                                headers={'Accept': server.HOSPITAL_NDJSON_MEDIA_TYPE})
+
+    assert [h['ykiho'] for h in hospitals] == sorted(h['ykiho'] for h in expected)
+    assert summary == {
+        'type': 'summary', 'success': True, 'count': len(expected),
+        'specialist_count': sum(1 for h in expected if h['has_specialist'])
+    }
+    assert fake_supabase.call_counts == {'search_hospitals_spatial': len(expected) // 700 + 1}
+
+def test_ndjson_stream_tile_area_matches_json_response(fake_db, fake_supabase, tile_service, monkeypatch):
+    seoul = {'sw_lng': 126.95, 'sw_lat': 37.52, 'ne_lng': 127.02, 'ne_lat': 37.58}
+    hospitals, summary = stream(fake_db, tile_service, monkeypatch, seoul, params={'stream': 'ndjson'})
+
+    async def scenario(client):
+        return (await client.post('/getHospitals', json=seoul)).json()
+    body = fake_db(scenario)
+
+    assert summary['success'] and summary['count'] == len(hospitals) == body['count'] > 0
+    assert sorted(h['ykiho'] for h in hospitals) == sorted(h['ykiho'] for h in body['hospitals'])
+
+def test_ndjson_stream_error_ends_with_failed_summary(fake_db, fake_supabase, tile_service, monkeypatch):
+    monkeypatch.setattr(server, 'HOSPITAL_STREAM_PAGE_SIZE', 1000)
+    fetch_area = tile_service._fetch_area
+
+    async def fail_after_first_page(*args, offset=None, limit=None):
+        if offset:
+            raise RuntimeError('db down')
+        return await fetch_area(*args, offset=offset, limit=limit)
+
+    monkeypatch.setattr(tile_service, '_fetch_area', fail_after_first_page)
+    hospitals, summary = stream(fake_db, tile_service, monkeypatch, KOREA, params={'stream': 'ndjson'})
+
+    assert len(hospitals) == 1000
+    assert summary['success'] is False and summary['count'] == 1000 and 'db down' in summary['error']
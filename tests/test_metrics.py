@@ -0,0 +1,92 @@
+"""/metrics 워커 지표 합산 테스트 (워커별 지표 파일, 종료된 워커의 누적 카운터 유지)"""
+import multiprocessing
+import re
+
+import pytest
+
+import server
+
+fork = multiprocessing.get_context('fork')
+
+def record_worker_metrics(directory, ready, done):
+    """다른 워커: 요청 3건과 캐시 적중 2건을 기록하고 지표 파일을 쓴 뒤 done까지 실행 상태 유지"""
+    server.metrics.reset()
+    server.analysis_cache.reset_stats()
+    for _ in range(3):
+        server.metrics.observe('hrp_request_duration_seconds', 0.02, endpoint='/analyze', method='POST', status='200')
+    server.analysis_cache.set('circle', b'{}', 2)
+    server.analysis_cache.get('circle')
+    server.analysis_cache.get('circle')
+    server.write_worker_metrics(directory)
+    ready.set()
+    done.wait(10)
+
+def sample(text, name, **labels):
+    """Prometheus 텍스트에서 레이블이 일치하는 시리즈 값 (없으면 None)"""
+    for line in text.splitlines():
+        match = re.match(r'^(\w+)(?:\{(.*)\})? (\S+)$', line)
+        if not match or match.group(1) != name:
+            continue
+        series_labels = dict(re.findall(r'(\w+)="([^"]*)"', match.group(2) or ''))
+        if all(series_labels.get(key) == value for key, value in labels.items()):
+            return float(match.group(3))
+    return None
+
+@pytest.fixture
+def metrics_dir(tmp_path, monkeypatch):
+    directory = str(tmp_path / 'metrics')
+    server.reset_metrics_dir(directory)
+    monkeypatch.setattr(server, 'METRICS_DIR', directory)
+    monkeypatch.setattr(server, 'shared_cache', None)
+    monkeypatch.setattr(server, 'metrics', server.LatencyMetrics(server.METRICS_LATENCY_BUCKETS))
+    monkeypatch.setattr(server, 'analysis_cache', server.LRUByteCache('analysis', max_items=100, max_bytes=1 << 20))
+    return directory
+
+def render(worker_stats):
+    return server.render_prometheus_metrics(worker_stats)
+
+def test_metrics_sum_live_and_exited_workers(metrics_dir):
+    # 이 프로세스(워커 1): 요청 1건, 캐시 미스 1건
+    server.metrics.observe('hrp_request_duration_seconds', 0.2, endpoint='/analyze', method='POST', status='200')
+    server.analysis_cache.get('polygon')
+
+    ready, done = fork.Event(), fork.Event()
+    worker = fork.Process(target=record_worker_metrics, args=(metrics_dir, ready, done))
+    worker.start()
+    try:
+        assert ready.wait(10)
+        server.write_worker_metrics(metrics_dir)
+        text = render(server.read_worker_metrics(metrics_dir))
+    finally:
+        done.set()
+        worker.join(10)
+
+    labels = {'endpoint': '/analyze', 'method': 'POST', 'status': '200'}
+    assert sample(text, 'hrp_request_duration_seconds_count', **labels) == 4
+    assert sample(text, 'hrp_request_duration_seconds_sum', **labels) == pytest.approx(0.26)
+    assert sample(text, 'hrp_request_duration_seconds_bucket', le='0.025', **labels) == 3
+    assert sample(text, 'hrp_cache_requests_total', cache='analysis', result='hit') == 2
+    assert sample(text, 'hrp_cache_requests_total', cache='analysis', result='miss') == 1
+    assert sample(text, 'hrp_cache_items', cache='analysis') == 1
+    assert sample(text, 'hrp_workers') == 2
+
+    # 워커가 종료(교체)되어도 누적 카운터는 유지하고, 게이지와 워커 수에서만 제외
+    text = render(server.read_worker_metrics(metrics_dir))
+    assert sample(text, 'hrp_request_duration_seconds_count', **labels) == 4
+    assert sample(text, 'hrp_cache_requests_total', cache='analysis', result='hit') == 2
+    assert sample(text, 'hrp_cache_items', cache='analysis') == 0
+    assert sample(text, 'hrp_workers') == 1
+
+def test_worker_metrics_file_is_rewritten_in_place(metrics_dir):
+    server.write_worker_metrics(metrics_dir)
+    server.metrics.observe('hrp_request_duration_seconds', 0.01, endpoint='/health', method='GET', status='200')
+    server.write_worker_metrics(metrics_dir)
+
+    worker_stats = server.read_worker_metrics(metrics_dir)
+    assert len(worker_stats) == 1
+    assert sample(render(worker_stats), 'hrp_request_duration_seconds_count', endpoint='/health') == 1
+
+def test_reset_metrics_dir_removes_previous_run(metrics_dir):
+    server.write_worker_metrics(metrics_dir)
+    server.reset_metrics_dir(metrics_dir)
+    assert server.read_worker_metrics(metrics_dir) == {}
@@ -0,0 +1,62 @@
+"""/getRegionPop/batch 지역 일괄 조회 테스트 (가상 Supabase 서버 사용)"""
+import pytest
+
+import server
+
+@pytest.fixture(autouse=True)
+def region_index(monkeypatch):
+    server.load_region_index()
+    monkeypatch.setattr(server, 'census_cache', server.CensusCache(server.CENSUS_CACHE_TTL_SECONDS))
+    monkeypatch.setattr(server, 'census_flight', server.SingleFlight('census'))
+    monkeypatch.setattr(server, 'shared_cache', None)
+
+BATCH = {
+    'regions': [
+        {'sido': '서울특별시', 'sigungu': '강남구', 'level': 'sigungu'},
+        {'sido': '없는도', 'level': 'sido'},
+        {'sido': '부산광역시', 'level': 'sido'}
+    ],
+    'expand_children': True
+}
+
+def expected_codes():
+    lookup = server.get_region_lookup_service()
+    return (
+        [child.cd for child in lookup.get_children('11230')]
+        + [None]
+        + [child.cd for child in lookup.get_children('21')]
+    )
+
+def test_expand_children_uses_one_query_and_keeps_input_order(fake_db, fake_supabase):
+    async def scenario(client):
+        return (await client.post('/getRegionPop/batch', json=BATCH)).json()
+
+    body = fake_db(scenario)
+    codes = [region['region_code'] for region in body['regions']]
+
+    assert codes == expected_codes()
+    assert fake_supabase.call_counts == {'census_region': 1}
+    assert body['count'] == len(codes) and body['error_count'] == 1
+
+    census_rows = {row['region_cd']: row for row in fake_supabase.CENSUS_ROWS}
+    for region in body['regions']:
+        if region['region_code'] is None:
+            assert region['error'] and '시/도를 찾을 수 없습니다' in region['message']
+            continue
+        assert not region['error']
+        assert region['total_population'] == census_rows[region['region_code']]['pop']
+
+def test_numeric_region_codes_are_cached(fake_db, fake_supabase, monkeypatch):
+    # census_region.region_cd가 숫자 열로 반환되어도 문자열 코드로 캐시
+    monkeypatch.setattr(fake_supabase, 'CENSUS_ROWS',
+                        [{**row, 'region_cd': int(row['region_cd'])} for row in fake_supabase.CENSUS_ROWS])
+
+    async def scenario(client):
+        first = (await client.post('/getRegionPop/batch', json=BATCH)).json()
+        second = (await client.post('/getRegionPop/batch', json=BATCH)).json()
+        return first, second
+
+    first, second = fake_db(scenario)
+    assert first['error_count'] == second['error_count'] == 1
+    assert first == second
+    assert fake_supabase.call_counts == {'census_region': 1}
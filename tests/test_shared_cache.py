@@ -0,0 +1,160 @@
+"""워커 간 공유 캐시 계층(SQLite)과 디스크 경계 저장소 테스트"""
+import asyncio
+import time
+
+import pytest
+
+import server
+
+from test_boundary_encoding import make_boundary
+
+@pytest.fixture
+def shared_caches(tmp_path):
+    """같은 파일을 여는 두 워커의 공유 캐시"""
+    path = str(tmp_path / 'shared.sqlite3')
+    caches = [server.SQLiteSharedCache(path, 16 * 1024 * 1024) for _ in range(2)]
+    yield caches
+    for cache in caches:
+        asyncio.run(cache.close())
+
+def test_shared_cache_values_visible_across_workers(shared_caches):
+    first, second = shared_caches
+
+    async def scenario():
+        await first.set_many({'a': b'1', 'b': b'2'}, 60)
+        await first.set('expired', b'x', -1)
+        return await second.get_many(['a', 'b', 'c', 'expired'])
+
+    assert asyncio.run(scenario()) == {'a': b'1', 'b': b'2'}
+    assert second.get_stats()['cache_hits'] == 2
+    assert second.get_stats()['cache_misses'] == 2
+    assert first.get_stats()['writes'] == 3
+
+def test_shared_cache_clear_increments_generation(shared_caches):
+    first, second = shared_caches
+
+    async def scenario():
+        before = await second.get_generation()
+        await first.set('a', b'1', 60)
+        cleared = await first.clear()
+        return before, cleared, await second.get_generation(), await second.get('a')
+
+    before, cleared, after, value = asyncio.run(scenario())
+    assert (before, cleared, after, value) == (0, 1, 1, None)
+
+def test_shared_cache_errors_are_misses(shared_caches):
+    class BrokenCache(server.SQLiteSharedCache):
+        async def _get_many(self, keys):
+            raise RuntimeError('연결 끊김')
+
+    cache = BrokenCache(shared_caches[0].path, 1024 * 1024)
+    try:
+        assert asyncio.run(cache.get('a')) is None
+        assert cache.get_stats()['errors'] == 1
+    finally:
+        asyncio.run(cache.close())
+
+def test_worker_stats_merge(shared_caches):
+    first, second = shared_caches
+    worker_stats = {
+        'w1': {'cache': {'boundary': {'hits': 3, 'misses': 1, 'items': 10}, 'single_flight.boundary': {'executions': 2}}},
+        'w2': {'cache': {'boundary': {'hits': 1, 'misses': 3, 'items': 5}}},
+        'stale': {'cache': {'boundary': {'hits': 100, 'misses': 0, 'items': 1}}}
+    }
+
+    async def scenario():
+        for worker_id, stats in worker_stats.items():
+            await (first if worker_id != 'w2' else second).publish_stats(worker_id, stats)
+        # 통계 공유가 끊긴 워커(3주기 이상)는 제외
+        first._conn.execute('UPDATE cache_workers SET updated_at = ? WHERE worker_id = ?',
+                            (time.time() - server.CACHE_SHARED_SYNC_SECONDS * 4, 'stale'))
+        return await second.collect_stats()
+
+    collected = asyncio.run(scenario())
+    assert sorted(collected) == ['w1', 'w2']
+
+    totals = server.aggregate_cache_counters({worker: stats['cache'] for worker, stats in collected.items()})
+    assert totals['boundary'] == {'hits': 4, 'misses': 4, 'items': 15, 'hit_rate': '50.00%'}
+    assert totals['single_flight.boundary'] == {'executions': 2}
+
+def test_generation_change_clears_local_caches(shared_caches, monkeypatch):
+    first, second = shared_caches
+    monkeypatch.setattr(server, 'shared_cache', second)
+    monkeypatch.setattr(server, 'shared_cache_generation', 0)
+    monkeypatch.setattr(server, 'CACHE_SHARED_SYNC_SECONDS', 0.01)
+    server.boundary_cache.clear()
+    server.boundary_cache.set('sido:11', b'{}', 2)
+
+    async def scenario():
+        await first.clear()  # 다른 워커의 /cache/clear
+        task = asyncio.create_task(server.sync_shared_cache_periodically())
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if server.shared_cache_generation == 1:
+                break
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert server.shared_cache_generation == 1
+    assert len(server.boundary_cache) == 0
+
+def boundary_record():
+    return server.pack_boundary_payloads(server.build_boundary_payloads(make_boundary('MultiPolygon')))
+
+def test_boundary_store_round_trip_and_reopen(tmp_path):
+    path = str(tmp_path / 'boundaries.bin')
+    record = boundary_record()
+
+    store = server.BoundaryStore(path, 'v1')
+    assert store.put('sido:11', record)
+    assert not store.put('sido:11', record)  # 이미 있으면 추가하지 않음
+    store.close()
+
+    reopened = server.BoundaryStore(path, 'v1')
+    try:
+        payloads = server.unpack_boundary_payloads(reopened.get('sido:11'))
+        expected = server.build_boundary_payloads(make_boundary('MultiPolygon'))
+        assert {lod: (p.json, p.delta.json) for lod, p in payloads.items()} == \
+            {lod: (p.json, p.delta.json) for lod, p in expected.items()}
+        assert reopened.get('sido:26') is None
+    finally:
+        reopened.close()
+
+def test_boundary_store_sees_other_writer_and_skips_torn_record(tmp_path):
+    path = str(tmp_path / 'boundaries.bin')
+    reader = server.BoundaryStore(path, 'v1')
+    writer = server.BoundaryStore(path, 'v1')
+    try:
+        writer.put('sigungu:11110', b'first')
+        assert reader.get('sigungu:11110') == b'first'  # 미스 시 다시 색인
+
+        # 비정상 종료로 잘린 레코드: 무시되고 다음 쓰기가 덮어씀
+        with open(path, 'ab') as f:
+            f.write(server.BoundaryStore.RECORD_HEADER.pack(100, 0, 5) + b'trunc')
+        assert reader.get('trunc') is None
+        writer.put('sigungu:11140', b'second')
+        assert reader.get('sigungu:11140') == b'second'
+        assert len(reader) == 2
+    finally:
+        reader.close()
+        writer.close()
+
+def test_boundary_store_rejects_other_version_and_corruption(tmp_path):
+    path = str(tmp_path / 'boundaries.bin')
+    store = server.BoundaryStore(path, 'v1')
+    store.put('dong:1111051500', b'payload')
+    store.close()
+
+    with pytest.raises(ValueError):
+        server.BoundaryStore(path, 'v2')
+
+    # 본문 한 바이트 손상 → crc 불일치로 None
+    with open(path, 'r+b') as f:
+        f.seek(-1, 2)
+        f.write(b'X')
+    store = server.BoundaryStore(path, 'v1')
+    try:
+        assert store.get('dong:1111051500') is None
+        assert store.get_stats()['errors'] == 1
+    finally:
+        store.close()
@@ -0,0 +1,103 @@
+"""SingleFlight 동시 조회 합치기 테스트 (실행 공유, 예외 전달, 취소된 호출과 공유 조회 분리)"""
+import asyncio
+
+import pytest
+
+import server
+
+class SlowFetch:
+    """release가 설정될 때까지 끝나지 않는 조회 (실행 횟수 기록)"""
+
+    def __init__(self, result='value', error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        self.started.set()
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+def test_concurrent_callers_share_one_execution():
+    async def main():
+        flight = server.SingleFlight('test')
+        fetch = SlowFetch()
+        callers = [asyncio.ensure_future(flight.do('key', fetch)) for _ in range(5)]
+        await fetch.started.wait()
+        assert len(flight) == 1
+
+        fetch.release.set()
+        results = await asyncio.gather(*callers)
+        return flight, fetch, results
+
+    flight, fetch, results = asyncio.run(main())
+    assert results == ['value'] * 5
+    assert fetch.calls == 1
+    assert len(flight) == 0
+    stats = flight.get_stats()
+    assert (stats['calls'], stats['executions'], stats['coalesced']) == (5, 1, 4)
+
+def test_error_is_shared_and_next_call_retries():
+    async def main():
+        flight = server.SingleFlight('test')
+        failing = SlowFetch(error=RuntimeError('db down'))
+        callers = [asyncio.ensure_future(flight.do('key', failing)) for _ in range(3)]
+        await failing.started.wait()
+        failing.release.set()
+        errors = await asyncio.gather(*callers, return_exceptions=True)
+
+        # 실패한 결과는 보관하지 않으므로 다음 호출은 새로 조회
+        retry = SlowFetch(result='recovered')
+        retry.release.set()
+        return flight, failing, errors, await flight.do('key', retry)
+
+    flight, failing, errors, retried = asyncio.run(main())
+    assert failing.calls == 1
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert retried == 'recovered'
+    assert flight.get_stats()['errors'] == 1
+
+def test_cancelled_caller_does_not_cancel_shared_fetch():
+    async def main():
+        flight = server.SingleFlight('test')
+        fetch = SlowFetch()
+        first = asyncio.ensure_future(flight.do('key', fetch))
+        second = asyncio.ensure_future(flight.do('key', fetch))
+        await fetch.started.wait()
+
+        # 먼저 조회를 시작한 호출이 취소되어도 (클라이언트 연결 끊김) 공유 조회는 계속 진행
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert len(flight) == 1
+
+        fetch.release.set()
+        return fetch, await second
+
+    fetch, result = asyncio.run(main())
+    assert result == 'value'
+    assert fetch.calls == 1
+
+def test_fetch_completes_after_all_callers_cancelled():
+    async def main():
+        flight = server.SingleFlight('test')
+        fetch = SlowFetch()
+        caller = asyncio.ensure_future(flight.do('key', fetch))
+        await fetch.started.wait()
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        # 기다리는 호출이 없어도 조회는 끝까지 실행되고 (캐시 채우기) 완료 후 키가 정리됨
+        task = flight._inflight['key']
+        fetch.release.set()
+        return flight, await task
+
+    flight, result = asyncio.run(main())
+    assert result == 'value'
+    assert len(flight) == 0
@@ -0,0 +1,181 @@
+"""
+격자 인구 스냅샷 생성 스크립트
+
+grid_100m(100m 격자 인구/가구)과 grid_1km_age_ratio(1km 격자 연령별 비율)를 읽어
+서버의 로컬 격자 분석 엔진(ANALYSIS_ENGINE=local/shadow)이 사용하는 .npz 파일로 저장합니다.
+
+사용법:
+    python tools/build_grid_snapshot.py --output data/grid_snapshot.npz
+
+격자 geom은 EPSG:5179 좌표의 GeoJSON(PostGIS 3 기본 JSON 변환)으로 받아 왼쪽 아래 꼭짓점만 저장합니다.
+컬럼 이름이 다르면 옵션으로 지정하세요.
+"""
+import argparse
+import json
+import logging
+import os
+from datetime import datetime
+
+import numpy as np
+from dotenv import load_dotenv
+from supabase import create_client
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 1000
+
+def fetch_all_rows(client, table_name: str, columns: str, order_column: str):
+    """테이블 전체 행을 페이지 단위로 조회"""
+    rows = []
+    offset = 0
+
+    while True:
+        result = (
+            client.table(table_name)
+            .select(columns)
+            .order(order_column)
+            .range(offset, offset + PAGE_SIZE - 1)
+            .execute()
+        )
+        if not result.data:
+            break
+
+        rows.extend(result.data)
+        if len(result.data) < PAGE_SIZE:
+            break
+        offset += PAGE_SIZE
+
+        if offset % 100_000 == 0:
+            logger.info("%s: %s행 조회", table_name, offset)
+
+    logger.info("%s: 총 %s행 조회 완료", table_name, len(rows))
+    return rows
+
+def geometry_bounds(geometry):
+    """GeoJSON 도형의 (min_x, min_y, max_x, max_y)"""
+    if isinstance(geometry, str):
+        geometry = json.loads(geometry)
+
+    xs, ys = [], []
+
+    def collect(coordinates):
+        if coordinates and isinstance(coordinates[0], (int, float)):
+            xs.append(coordinates[0])
+            ys.append(coordinates[1])
+        else:
+            for item in coordinates:
+                collect(item)
+
+    collect(geometry['coordinates'])
+    return min(xs), min(ys), max(xs), max(ys)
+
+def build_snapshot(args) -> dict:
+    load_dotenv()
+    client = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+
+    # 1. 1km 격자 연령별 비율
+    ratio_rows = fetch_all_rows(
+        client,
+        args.ratio_table,
+        f"{args.ratio_key_column}, {args.ratio_column}",
+        args.ratio_key_column
+    )
+
+    parent_codes = []
+    ratio_dicts = []
+    age_labels = []
+    for row in ratio_rows:
+        ratios = row[args.ratio_column] or {}
+        if isinstance(ratios, str):
+            ratios = json.loads(ratios)
+        parent_codes.append(str(row[args.ratio_key_column]))
+        ratio_dicts.append(ratios)
+        for label in ratios:
+            if label not in age_labels:
+                age_labels.append(label)
+
+    parent_lookup = {code: index for index, code in enumerate(parent_codes)}
+
+    # 2. 100m 격자 인구/가구
+    grid_rows = fetch_all_rows(
+        client,
+        args.grid_table,
+        f"{args.grid_key_column}, {args.parent_column}, {args.population_column}, "
+        f"{args.households_column}, {args.geometry_column}",
+        args.grid_key_column
+    )
+
+    cell_x = np.empty(len(grid_rows), dtype=np.float64)
+    cell_y = np.empty(len(grid_rows), dtype=np.float64)
+    population = np.empty(len(grid_rows), dtype=np.float64)
+    households = np.empty(len(grid_rows), dtype=np.float64)
+    parent_index = np.empty(len(grid_rows), dtype=np.int32)
+    cell_size = None
+
+    for i, row in enumerate(grid_rows):
+        min_x, min_y, max_x, max_y = geometry_bounds(row[args.geometry_column])
+        cell_x[i] = min_x
+        cell_y[i] = min_y
+        cell_size = cell_size or round(max_x - min_x, 6)
+
+        population[i] = row[args.population_column] or 0
+        households[i] = row[args.households_column] or 0
+
+        # 비율 정보가 없는 1km 격자는 비율 0으로 추가 (총 인구/가구에는 포함, 연령별 분배에서는 제외)
+        parent_code = str(row[args.parent_column])
+        if parent_code not in parent_lookup:
+            parent_lookup[parent_code] = len(parent_codes)
+            parent_codes.append(parent_code)
+            ratio_dicts.append({})
+        parent_index[i] = parent_lookup[parent_code]
+
+    age_ratios = np.array(
+        [[float(ratios.get(label) or 0) for label in age_labels] for ratios in ratio_dicts],
+        dtype=np.float64
+    ).reshape(len(parent_codes), len(age_labels))
+
+    return {
+        'cell_x': cell_x,
+        'cell_y': cell_y,
+        'cell_size': np.float64(cell_size or 100.0),
+        'population': population,
+        'households': households,
+        'parent_index': parent_index,
+        'parent_codes': np.array(parent_codes),
+        'age_labels': np.array(age_labels),
+        'age_ratios': age_ratios,
+        'version': np.array(args.version or datetime.now().strftime('%Y%m%d%H%M%S'))
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="격자 인구 스냅샷(.npz) 생성")
+    parser.add_argument('--output', default='data/grid_snapshot.npz', help='저장할 파일 경로')
+    parser.add_argument('--version', default=None, help='스냅샷 버전 (기본값: 생성 시각)')
+    parser.add_argument('--grid-table', default='grid_100m')
+    parser.add_argument('--grid-key-column', default='grid_cd')
+    parser.add_argument('--parent-column', default='parent_cd')
+    parser.add_argument('--population-column', default='pop')
+    parser.add_argument('--households-column', default='households')
+    parser.add_argument('--geometry-column', default='geom')
+    parser.add_argument('--ratio-table', default='grid_1km_age_ratio')
+    parser.add_argument('--ratio-key-column', default='parent_cd')
+    parser.add_argument('--ratio-column', default='age_ratios')
+    args = parser.parse_args()
+
+    snapshot = build_snapshot(args)
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    # 같은 경로를 읽는 서버가 쓰는 도중의 파일을 보지 않도록 임시 파일에 저장 후 교체
+    temp_path = args.output + '.tmp.npz'
+    np.savez(temp_path, **snapshot)
+    os.replace(temp_path, args.output)
+
+    logger.info("✓ 스냅샷 저장 완료: %s (격자 %s개, 1km 격자 %s개, 연령 구간 %s개)",
+                args.output, len(snapshot['cell_x']), len(snapshot['parent_codes']), len(snapshot['age_labels']))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+경계 저장소 일괄 생성 스크립트
+
+static/korea_admin_codes.json의 모든 행정구역(시도/시군구/읍면동 약 3.8천 개) 경계를 get_region_boundary_wgs84 RPC로 조회해
+원본 + 모든 LOD 단계를 계산하고, 서버의 디스크 경계 저장소(BOUNDARY_STORE_ENABLED=true) 파일에 저장합니다.
+
+사용법:
+    python tools/export_boundary_store.py --version 2025Q2
+
+이미 저장된 지역은 건너뛰므로 중단 후 다시 실행하면 이어서 저장합니다.
+서버가 같은 파일을 사용 중이어도 됩니다 (파일 잠금으로 추가 쓰기를 직렬화).
+새 데이터 릴리스는 새 --version으로 생성한 뒤 서버의 BOUNDARY_DATA_VERSION을 같은 값으로 바꿔 배포하세요.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from dotenv import load_dotenv
+from supabase import create_client
+
+# LOD 계산/저장 형식은 서버와 같은 코드를 사용 (저장소 헤더의 LOD 단계가 서버 설정과 일치해야 함)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from server import (  # noqa: E402
+    BOUNDARY_DATA_VERSION,
+    BOUNDARY_STORE_DIR,
+    BoundaryStore,
+    build_boundary_payloads,
+    get_boundary_cache_key,
+    get_boundary_store_path,
+    pack_boundary_payloads,
+    parse_region_boundary
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def export_region(client, store: BoundaryStore, region_code: str, level: str) -> str:
+    """지역 하나의 경계를 조회해 저장 (결과: saved/skipped/missing)"""
+    store_key = get_boundary_cache_key(region_code, level)
+    if store.get(store_key) is not None:
+        return 'skipped'
+
+    result = client.rpc('get_region_boundary_wgs84', {
+        'p_region_code': region_code,
+        'p_level': level
+    }).execute()
+
+    boundary_data = parse_region_boundary(result.data)
+    if boundary_data is None:
+        return 'missing'
+
+    store.put(store_key, pack_boundary_payloads(build_boundary_payloads(boundary_data)))
+    return 'saved'
+
+def main():
+    parser = argparse.ArgumentParser(description="디스크 경계 저장소 일괄 생성")
+    parser.add_argument('--dir', default=BOUNDARY_STORE_DIR, help='저장소 디렉터리 (기본값: BOUNDARY_STORE_DIR)')
+    parser.add_argument('--version', default=BOUNDARY_DATA_VERSION, help='경계 데이터 버전 (기본값: BOUNDARY_DATA_VERSION)')
+    parser.add_argument('--levels', default='sido,sigungu,dong', help='저장할 행정구역 단계 (쉼표 구분)')
+    parser.add_argument('--codes-path', default=os.path.join('static', 'korea_admin_codes.json'))
+    parser.add_argument('--concurrency', type=int, default=8, help='동시 RPC 호출 수')
+    args = parser.parse_args()
+
+    load_dotenv()
+    client = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+
+    with open(args.codes_path, 'r', encoding='utf-8') as f:
+        codes = json.load(f)
+    regions = [(item['cd'], level) for level in args.levels.split(',') for item in codes.get(level, [])]
+
+    path = get_boundary_store_path(args.dir, args.version)
+    store = BoundaryStore(path, args.version)
+    logger.info("경계 저장소: %s (기존 %s개, 대상 %s개)", path, len(store), len(regions))
+
+    counts = {'saved': 0, 'skipped': 0, 'missing': 0, 'failed': 0}
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = {
+            executor.submit(export_region, client, store, region_code, level): (region_code, level)
+            for region_code, level in regions
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            region_code, level = futures[future]
+            try:
+                counts[future.result()] += 1
+            except Exception as e:
+                counts['failed'] += 1
+                logger.error("경계 저장 실패 (%s:%s): %s", level, region_code, e)
+
+            if done % 500 == 0:
+                logger.info("%s/%s개 처리", done, len(regions))
+
+    stats = store.get_stats()
+    store.close()
+
+    logger.info("✓ 경계 저장소 생성 완료: %s (%sMB, 경계 %s개) - 저장 %s, 기존 %s, 경계 없음 %s, 실패 %s",
+                path, stats['file_size_mb'], stats['stored_regions'], counts['saved'], counts['skipped'], counts['missing'], counts['failed'])
+
+if __name__ == "__main__":
+    main()